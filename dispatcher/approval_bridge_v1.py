@@ -7,45 +7,93 @@ FlowMind Cashflow — Approval Bridge v1
 If PROJECT_STATE.phase == APPROVED
 → move to READY_FOR_UPLOAD
 
+Two-tier render: when the approved final.mp4 is the preview tier
+(ASSEMBLY_FROM_AUDIO.json "render_tier" == "preview"), the full-resolution
+assembly runs here first:
+  assembly (motion_assembly_v1 if the preview was fused, else
+  assembly_from_audio_v1) --tier full -> final_qa_v1 -> DELIVERY_PACK refresh
+Any failure -> HALT (halt_reason FULL_RENDER_FAILED / FULL_RENDER_QA_FAILED);
+recover returns the project to APPROVED and the next tick retries.
+
 This keeps architecture deterministic.
 No auto-upload here.
-Only phase transition.
 """
 
 import json
 from pathlib import Path
-from datetime import datetime, timezone
 
 
-def _utc_now_iso():
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+def _render_full(project_id: str):
+    """Returns None on success, else the HALT reason."""
+    from engine import assembly_from_audio_v1, delivery_pack_v1, final_qa_v1, motion_assembly_v1, render_tiers_v1
+
+    if render_tiers_v1.rendered_tier(project_id) == render_tiers_v1.FULL:
+        return None
+
+    # same station that rendered the preview (fused single pass or two-step)
+    marker = Path("projects") / project_id / "ASSEMBLY_FROM_AUDIO.json"
+    fused = bool(json.loads(marker.read_text()).get("fused"))
+    station = motion_assembly_v1 if fused else assembly_from_audio_v1
+
+    print(f"[BRIDGE] Preview approved -> full render (fused={fused})")
+    try:
+        rc = int(station.main([station.__name__, project_id, "--tier", "full"]))
+    except Exception as e:
+        print(f"[BRIDGE] full render crashed: {e}")
+        rc = 99
+    if rc != 0:
+        return "FULL_RENDER_FAILED"
+
+    try:
+        rc = int(final_qa_v1.main(["engine.final_qa_v1", project_id]))
+    except Exception as e:
+        print(f"[BRIDGE] full render QA crashed: {e}")
+        rc = 99
+    if rc != 0:
+        return "FULL_RENDER_QA_FAILED"
+
+    try:
+        delivery_pack_v1.refresh_artifacts(project_id)
+    except Exception as e:
+        print(f"[BRIDGE] DELIVERY_PACK refresh failed: {e}")
+        return "FULL_RENDER_FAILED"
+    return None
 
 
 def run(project_id: str):
+    from engine import state_store_v1
 
-    state_path = Path("projects") / project_id / "PROJECT_STATE.json"
-    if not state_path.exists():
+    if not state_store_v1.exists(project_id):
         print("[BRIDGE] No PROJECT_STATE")
         return
 
-    state = json.loads(state_path.read_text())
-
-    if state.get("phase") != "APPROVED":
+    if state_store_v1.phase(project_id) != "APPROVED":
         print("[BRIDGE] Not in APPROVED state")
         return
 
-    now = _utc_now_iso()
+    reason = _render_full(project_id)
 
-    state["phase"] = "READY_FOR_UPLOAD"
-    state["updated_at"] = now
+    # the full render can take minutes; transition the current state, not a pre-render copy
+    moved = []
 
-    hist = state.get("phase_history", [])
-    hist.append({"at": now, "phase": "READY_FOR_UPLOAD"})
-    state["phase_history"] = hist[-50:]
+    def apply(state):
+        if state.get("phase") != "APPROVED":
+            return False
+        if reason:
+            state_store_v1.halt(state, reason)
+        else:
+            state_store_v1.transition(state, "READY_FOR_UPLOAD")
+        moved.append(state["phase"])
+        return True
 
-    state_path.write_text(json.dumps(state, indent=2))
+    state = state_store_v1.update(project_id, apply)
 
-    print("[BRIDGE] Moved to READY_FOR_UPLOAD")
+    if not moved:
+        print(f"[BRIDGE] Phase changed during render ({state.get('phase')}); not moved")
+    elif reason:
+        print(f"[BRIDGE] {reason} -> HALT")
+    else:
+        print("[BRIDGE] Moved to READY_FOR_UPLOAD")
 
 
 if __name__ == "__main__":
@@ -54,4 +102,6 @@ if __name__ == "__main__":
         print("Usage: python -m dispatcher.approval_bridge_v1 <PROJECT_ID>")
         sys.exit(1)
 
-    run(sys.argv[1])
+    # standalone run: take the project lock (fm.py / batch ticks already hold it)
+    from engine import lock_manager_v1
+    sys.exit(lock_manager_v1.run_locked("approval_bridge_v1", lambda argv: run(argv[1]) or 0, sys.argv))
@@ -17,26 +17,92 @@ Phases:
 
 Rule:
 - Phase changes only on successful module execution.
+
+Lock: the project's engine.lock_manager_v1 lock is held for the whole
+dispatch (same lock as fm.py, the batch runner and the step runners).
+
+Run modes:
+- inprocess (default): each station is imported once and its main(argv)
+  is called directly. Same PASS/FAIL semantics and exit codes.
+- subprocess: each station runs in its own `python -m` interpreter
+  (isolation). Select with --subprocess or FLOWMIND_RUN_MODE=subprocess.
 """
 
+import importlib
+import os
 import sys
 import subprocess
+import traceback
+from engine import lock_manager_v1
 from engine.state_manager import get_phase, set_phase
 
 
+RUN_MODES = ("inprocess", "subprocess")
+
+
+def run_mode() -> str:
+    mode = os.getenv("FLOWMIND_RUN_MODE", "inprocess").strip().lower()
+    return mode if mode in RUN_MODES else "inprocess"
+
+
+def _exit_code(code) -> int:
+    # Same mapping the interpreter applies to SystemExit / main() results
+    if code is None:
+        return 0
+    if isinstance(code, bool):
+        return int(code)
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_module_inprocess(module_path: str, project_id: str) -> int:
+    argv = [module_path, project_id]
+    try:
+        module = importlib.import_module(module_path)
+        rc = module.main(argv)
+    except SystemExit as e:
+        rc = e.code
+    except Exception:
+        # A crashing station behaves like a crashing interpreter: traceback + rc=1
+        traceback.print_exc()
+        rc = 1
+    return _exit_code(rc)
+
+
 def run_module(module_path: str, project_id: str):
-    print(f"[DISPATCHER] Running {module_path} module...")
-    subprocess.run(["python", "-m", module_path, project_id], check=True)
+    mode = run_mode()
+    print(f"[DISPATCHER] Running {module_path} module ({mode})...")
+    if mode == "subprocess":
+        subprocess.run(["python", "-m", module_path, project_id], check=True)
+        return
+
+    rc = run_module_inprocess(module_path, project_id)
+    if rc != 0:
+        raise subprocess.CalledProcessError(rc, [module_path, project_id])
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python -m dispatcher.engine <PROJECT_ID> <PHASE>")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if "--subprocess" in sys.argv[1:]:
+        os.environ["FLOWMIND_RUN_MODE"] = "subprocess"
+
+    if len(args) < 2:
+        print("Usage: python -m dispatcher.engine <PROJECT_ID> <PHASE> [--subprocess]")
         sys.exit(1)
 
-    project_id = sys.argv[1]
-    target_phase = sys.argv[2].strip().upper()
+    project_id = args[0]
+    target_phase = args[1].strip().upper()
+
+    with lock_manager_v1.hold(project_id, "dispatcher.engine") as lock:
+        if lock is None:
+            print(f"[DISPATCHER] {project_id} busy: {lock_manager_v1.describe(lock_manager_v1.holder(project_id))}")
+            sys.exit(lock_manager_v1.LOCKED_RC)
+        dispatch(project_id, target_phase)
+
 
+def dispatch(project_id: str, target_phase: str):
     current_phase = get_phase(project_id)
     print(f"[DISPATCHER] Current phase: {current_phase}")
 
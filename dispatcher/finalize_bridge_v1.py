@@ -11,25 +11,27 @@ No transition allowed from ARCHIVED.
 Deterministic.
 """
 
-import json
-from pathlib import Path
-from datetime import datetime, timezone
-
-
-def _utc_now():
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+from engine import state_store_v1
 
 
 def run(project_id: str):
 
-    state_path = Path("projects") / project_id / "PROJECT_STATE.json"
-
-    if not state_path.exists():
+    if not state_store_v1.exists(project_id):
         print("[FINALIZE] PROJECT_STATE missing")
         return
 
-    state = json.loads(state_path.read_text())
-    phase = state.get("phase")
+    outcome = []
+
+    def apply(state):
+        phase = state.get("phase")
+        outcome.append(phase)
+        if phase != "READY_FOR_UPLOAD":
+            return False
+        state_store_v1.transition(state, "ARCHIVED")
+        return True
+
+    state_store_v1.update(project_id, apply)
+    phase = outcome[0] if outcome else None
 
     if phase == "ARCHIVED":
         print("[FINALIZE] Already ARCHIVED")
@@ -39,21 +41,6 @@ def run(project_id: str):
         print("[FINALIZE] Not in READY_FOR_UPLOAD")
         return
 
-    now = _utc_now()
-
-    state["phase"] = "ARCHIVED"
-    state["updated_at"] = now
-
-    hist = state.get("phase_history", [])
-    hist.append({
-        "at": now,
-        "phase": "ARCHIVED"
-    })
-
-    state["phase_history"] = hist[-100:]
-
-    state_path.write_text(json.dumps(state, indent=2))
-
     print("[FINALIZE] ARCHIVED")
 
 
@@ -63,4 +50,6 @@ if __name__ == "__main__":
         print("Usage: python -m dispatcher.finalize_bridge_v1 <PROJECT_ID>")
         sys.exit(1)
 
-    run(sys.argv[1])
+    # standalone run: take the project lock (fm.py / batch ticks already hold it)
+    from engine import lock_manager_v1
+    sys.exit(lock_manager_v1.run_locked("finalize_bridge_v1", lambda argv: run(argv[1]) or 0, sys.argv))
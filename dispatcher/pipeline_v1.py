@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+FlowMind Cashflow — Pipeline Runner v1 (declarative stage graph)
+
+TOPIC -> ... -> RENDER_DUMMY -> AUDIO_PLAN -> ... -> AWAITING_APPROVAL -> ARCHIVED
+
+Each stage declares the artifacts it reads and writes.
+One pass:
+- runs every stage whose inputs exist and whose outputs are missing or stale
+- skips stages whose outputs are current (newer than all inputs)
+- stops at the first FAIL / missing input / approval wait
+- records per-stage timings into PROJECT_STATE.json["stage_timings"]
+
+Gate stages (listener, approval, finalize) are phase-driven, not artifact-driven.
+Once approved, artifact stages are frozen: the approval bridge owns the
+post-approval full render (final.mp4, FINAL_QA.json, DELIVERY_PACK.json).
+
+Usage:
+  python -m dispatcher.pipeline_v1 <PROJECT_ID> [--until STAGE] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from engine import lock_manager_v1, state_store_v1
+
+
+# Stage status values
+RAN = "RAN"
+SKIPPED = "SKIPPED"          # outputs current / gate phase not active
+READY = "READY"              # would run (dry-run)
+BLOCKED = "BLOCKED"          # required input missing
+WAITING = "WAITING"          # gate stage ran but phase did not move (e.g. no approval yet)
+FAILED = "FAILED"
+
+TERMINAL_PHASES = ("ARCHIVED",)
+APPROVED_PHASES = ("APPROVED", "READY_FOR_UPLOAD")   # artifact stages frozen (approval bridge re-renders)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def current_phase(project_id: str) -> Optional[str]:
+    return state_store_v1.phase(project_id)
+
+
+# -----------------------
+# Stage runners
+# -----------------------
+def _dispatch(module_path: str, phase: str) -> Callable[[str], int]:
+    """Station driven by dispatcher.engine semantics: run module, then set phase."""
+
+    def run(project_id: str) -> int:
+        from dispatcher.engine import run_module
+        from engine.state_manager import set_phase
+
+        try:
+            run_module(module_path, project_id)
+        except subprocess.CalledProcessError as e:
+            return int(e.returncode or 1)
+        set_phase(project_id, phase)
+        return 0
+
+    return run
+
+
+def _step(module_path: str, *flags: str) -> Callable[[str], int]:
+    """tools/step_* runner: owns its own PROJECT_STATE transition."""
+
+    def run(project_id: str) -> int:
+        import importlib
+
+        mod = importlib.import_module(module_path)
+        return int(mod.main([module_path, project_id, *flags]) or 0)
+
+    return run
+
+
+def _station(module_path: str) -> Callable[[str], int]:
+    """Plain engine station without a phase of its own."""
+    return _step(module_path)
+
+
+def _listen(project_id: str) -> int:
+    from engine.telegram_poller_v1 import listen_once
+
+    listen_once(project_id)
+    return 0
+
+
+def _bridge(module_path: str) -> Callable[[str], int]:
+    def run(project_id: str) -> int:
+        import importlib
+
+        importlib.import_module(module_path).run(project_id)
+        return 0
+
+    return run
+
+
+# -----------------------
+# Verifiers (output exists but must also say PASS)
+# -----------------------
+def _json_flag(rel: str, key: str) -> Callable[[str], bool]:
+    def check(project_id: str) -> bool:
+        try:
+            data = _read_json(_expand(rel, project_id))
+        except Exception:
+            return False
+        return bool(data.get(key))
+
+    return check
+
+
+def _stock_complete(project_id: str) -> bool:
+    try:
+        man = _read_json(_expand("{project}/ASSET_MANIFEST.json", project_id))
+    except Exception:
+        return False
+    items = man.get("items") or []
+    return bool(man.get("mock_mode")) and all(it.get("status") != "PENDING" for it in items)
+
+
+# -----------------------
+# Stage graph
+# -----------------------
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: Callable[[str], int]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    optional_inputs: Tuple[str, ...] = ()
+    verify: Optional[Callable[[str], bool]] = None
+    when_phase: Tuple[str, ...] = ()   # gate stage: runs only while project sits in one of these phases
+    heavy: bool = False                # ffmpeg-bound station
+
+
+STAGES: Tuple[Stage, ...] = (
+    Stage("SCRIPT", _dispatch("engine.script_generator", "SCRIPT"),
+          outputs=("{project}/SCRIPT.json", "{project}/SCRIPT.txt"),
+          optional_inputs=("{project}/CONTENT.json",)),
+    Stage("SCENES", _dispatch("engine.scene_planner_v1", "SCENES"),
+          inputs=("{project}/SCRIPT.txt",),
+          outputs=("{project}/SCENE_PLAN.json",)),
+    Stage("SCENES_QA", _dispatch("engine.scene_plan_qa", "SCENES_QA"),
+          inputs=("{project}/SCENE_PLAN.json",),
+          outputs=("{project}/SCENE_PLAN_QA.json",),
+          verify=_json_flag("{project}/SCENE_PLAN_QA.json", "pass")),
+    Stage("ASSETS", _dispatch("engine.asset_requests_v1", "ASSETS"),
+          inputs=("{project}/SCENE_PLAN.json", "{project}/SCENE_PLAN_QA.json"),
+          outputs=("{project}/ASSET_REQUESTS.json",)),
+    Stage("ASSET_MANIFEST", _dispatch("engine.asset_manifest_v1", "ASSET_MANIFEST"),
+          inputs=("{project}/ASSET_REQUESTS.json",),
+          outputs=("{project}/ASSET_MANIFEST.json",)),
+    Stage("STOCK_MOCK", _dispatch("engine.stock_fetcher_mock_v1", "STOCK_MOCK"),
+          inputs=("{project}/ASSET_MANIFEST.json",),
+          outputs=("{project}/ASSET_MANIFEST.json",),
+          verify=_stock_complete),
+    Stage("ASSEMBLY_PLAN", _dispatch("engine.assembly_plan_v1", "ASSEMBLY_PLAN"),
+          inputs=("{project}/SCENE_PLAN.json", "{project}/ASSET_MANIFEST.json"),
+          outputs=("{project}/ASSEMBLY_PLAN.json",)),
+    Stage("RENDER_DUMMY", _dispatch("engine.ffmpeg_dummy_renderer_v1", "RENDER_DUMMY"),
+          inputs=("{project}/ASSEMBLY_PLAN.json",),
+          outputs=("{out}/final.mp4", "{out}/ffprobe.json"),
+          heavy=True),
+    Stage("AUDIO_PLAN", _step("tools.step_audio_plan"),
+          inputs=("{project}/ASSEMBLY_PLAN.json", "{project}/SCRIPT.json"),
+          outputs=("{project}/AUDIO_PLAN.json",)),
+    Stage("AUDIO_RENDER", _step("tools.step_audio_render"),
+          inputs=("{project}/AUDIO_PLAN.json",),
+          outputs=("{project}/AUDIO_RENDER.json",)),
+    # Fused: motion background + master.wav mux in one ffmpeg pass (engine.motion_assembly_v1).
+    # VIDEO_MOTION (motion_bg.mp4) stays available as a standalone station for the two-step path.
+    Stage("ASSEMBLY_FROM_AUDIO", _step("tools.step_assembly_from_audio", "--fused"),
+          inputs=("{project}/AUDIO_RENDER.json",),
+          outputs=("{project}/ASSEMBLY_FROM_AUDIO.json", "{out}/final.mp4"),
+          heavy=True),
+    Stage("FINAL_QA", _step("tools.step_final_qa"),
+          inputs=("{project}/ASSEMBLY_FROM_AUDIO.json",),
+          outputs=("{project}/FINAL_QA.json",),
+          verify=_json_flag("{project}/FINAL_QA.json", "pass")),
+    Stage("DELIVERY_PACK", _step("tools.step_delivery_pack"),
+          inputs=("{project}/FINAL_QA.json",),
+          outputs=("{project}/DELIVERY_PACK.json",)),
+    Stage("TELEGRAM_GATE", _step("tools.step_telegram_gate"),
+          inputs=("{project}/DELIVERY_PACK.json",),
+          outputs=("{project}/TELEGRAM_GATE.json",)),
+    Stage("APPROVAL_LISTEN", _listen, when_phase=("AWAITING_APPROVAL",)),
+    # APPROVED -> full-tier re-render (approval_bridge_v1._render_full): ffmpeg-bound
+    Stage("APPROVAL", _bridge("dispatcher.approval_bridge_v1"), when_phase=("APPROVED",),
+          heavy=True),
+    Stage("FINALIZE", _bridge("dispatcher.finalize_bridge_v1"), when_phase=("READY_FOR_UPLOAD",)),
+)
+
+STAGE_BY_NAME: Dict[str, Stage] = {s.name: s for s in STAGES}
+
+
+def _expand(template: str, project_id: str) -> Path:
+    return Path(template.format(
+        project=os.path.join("projects", project_id),
+        out=os.path.join("out", project_id),
+        cache=os.path.join("assets", "cache", project_id),
+    ))
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def stage_status(stage: Stage, project_id: str) -> str:
+    """Classify a stage without running it: SKIPPED, READY or BLOCKED."""
+    phase = current_phase(project_id)
+    if stage.when_phase:
+        return READY if phase in stage.when_phase else SKIPPED
+    if phase in APPROVED_PHASES:
+        return SKIPPED
+
+    input_times: List[float] = []
+    for rel in stage.inputs:
+        t = _mtime(_expand(rel, project_id))
+        if t is None:
+            return BLOCKED
+        input_times.append(t)
+    for rel in stage.optional_inputs:
+        t = _mtime(_expand(rel, project_id))
+        if t is not None:
+            input_times.append(t)
+
+    output_times = [_mtime(_expand(rel, project_id)) for rel in stage.outputs]
+    if not output_times or any(t is None for t in output_times):
+        return READY
+    if input_times and max(input_times) > min(output_times):  # type: ignore[type-var]
+        return READY
+    if stage.verify is not None and not stage.verify(project_id):
+        return READY
+    return SKIPPED
+
+
+def _record_timing(project_id: str, stage: str, status: str, seconds: float, rc: Optional[int]) -> None:
+    def apply(state: Dict[str, Any]) -> None:
+        timings = state.get("stage_timings")
+        if not isinstance(timings, dict):
+            timings = {}
+        timings[stage] = {
+            "at": _utc_now_iso(),
+            "status": status,
+            "seconds": round(seconds, 3),
+            "rc": rc,
+        }
+        state["stage_timings"] = timings
+
+    state_store_v1.update(project_id, apply)
+
+
+def run_stage(stage: Stage, project_id: str) -> str:
+    """Run one stage and return RAN / WAITING / FAILED."""
+    print(f"[PIPELINE] {project_id} -> {stage.name}")
+    t0 = time.monotonic()
+    try:
+        rc = int(stage.run(project_id) or 0)
+    except Exception as e:
+        print(f"[PIPELINE] {stage.name} crashed: {e}", file=sys.stderr)
+        rc = 99
+    seconds = time.monotonic() - t0
+
+    if rc != 0:
+        status = FAILED
+    elif stage.when_phase:
+        status = WAITING if current_phase(project_id) in stage.when_phase else RAN
+    elif stage_status(stage, project_id) != SKIPPED:
+        print(f"[PIPELINE] {stage.name} returned rc=0 but outputs are not current", file=sys.stderr)
+        status = FAILED
+    else:
+        status = RAN
+
+    _record_timing(project_id, stage.name, status, seconds, rc)
+    print(f"[PIPELINE] {stage.name} {status} in {seconds:.2f}s")
+    return status
+
+
+def next_stage(project_id: str) -> Tuple[Optional[Stage], str]:
+    """
+    First stage that needs work, with its status (READY or BLOCKED).
+    (None, SKIPPED) when the project has nothing left to do in this pass.
+    """
+    phase = current_phase(project_id)
+    if phase == "HALT":
+        return None, BLOCKED
+    if phase in TERMINAL_PHASES:
+        return None, SKIPPED
+
+    for stage in STAGES:
+        st = stage_status(stage, project_id)
+        if st == SKIPPED:
+            continue
+        return stage, st
+    return None, SKIPPED
+
+
+def run_pipeline(project_id: str, until: Optional[str] = None, dry_run: bool = False) -> int:
+    if dry_run:
+        return _run_pipeline(project_id, until, dry_run)
+    # reentrant: callers that already hold the project lock (fm.py, batch) pass straight through
+    with lock_manager_v1.hold(project_id, "pipeline_v1") as lock:
+        if lock is None:
+            print(f"[PIPELINE] {project_id} busy: {lock_manager_v1.describe(lock_manager_v1.holder(project_id))}",
+                  file=sys.stderr)
+            return lock_manager_v1.LOCKED_RC
+        return _run_pipeline(project_id, until, dry_run)
+
+
+def _run_pipeline(project_id: str, until: Optional[str], dry_run: bool) -> int:
+    phase = current_phase(project_id)
+    if phase is None:
+        from engine.state_manager import set_phase
+        set_phase(project_id, "TOPIC")
+        phase = "TOPIC"
+
+    print(f"[PIPELINE] project={project_id} phase={phase}")
+    if phase == "HALT":
+        print("[PIPELINE] HALTED — use recover first")
+        return 1
+    if phase in TERMINAL_PHASES:
+        print(f"[PIPELINE] {phase} — nothing to do")
+        return 0
+
+    t0 = time.monotonic()
+    result = 0
+    for stage in STAGES:
+        st = stage_status(stage, project_id)
+
+        if dry_run:
+            print(f"[PIPELINE] {stage.name:<20} {st}")
+        elif st == BLOCKED:
+            missing = [rel for rel in stage.inputs if not _expand(rel, project_id).exists()]
+            print(f"[PIPELINE] {stage.name} BLOCKED — missing: {', '.join(missing)}")
+            result = 1
+            break
+        elif st == READY:
+            st = run_stage(stage, project_id)
+            if st == FAILED:
+                result = 1
+                break
+            if st == WAITING:
+                print(f"[PIPELINE] waiting at {stage.name}")
+                break
+
+        if until and stage.name == until.upper():
+            break
+
+    print(f"[PIPELINE] pass done in {time.monotonic() - t0:.2f}s phase={current_phase(project_id)}")
+    return result
+
+
+def main(argv: List[str]) -> int:
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    if len(args) < 1:
+        print("Usage: python -m dispatcher.pipeline_v1 <PROJECT_ID> [--until STAGE] [--dry-run]", file=sys.stderr)
+        return 2
+
+    until = None
+    if "--until" in argv:
+        i = argv.index("--until")
+        if i + 1 >= len(argv):
+            print("[PIPELINE] --until requires a stage name", file=sys.stderr)
+            return 2
+        until = argv[i + 1]
+        args = [a for a in args if a != until]
+        if until.upper() not in STAGE_BY_NAME:
+            print(f"[PIPELINE] unknown stage: {until}. Known: {', '.join(STAGE_BY_NAME)}", file=sys.stderr)
+            return 2
+
+    return run_pipeline(args[0], until=until, dry_run="--dry-run" in argv)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -7,10 +7,11 @@ Rule:
 - Otherwise HALT immediately
 """
 
-import json
 import sys
 from pathlib import Path
 
+from engine import state_store_v1
+
 
 class ProjectIDMismatch(Exception):
     pass
@@ -22,8 +23,7 @@ def validate_project_identity(project_path: Path):
     if not state_file.exists():
         raise FileNotFoundError("PROJECT_STATE.json not found")
 
-    with open(state_file, "r") as f:
-        state = json.load(f)
+    state = state_store_v1.read_json(state_file)
 
     folder_name = project_path.name
     manifest_id = state.get("project_id")
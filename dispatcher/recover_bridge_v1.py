@@ -5,58 +5,59 @@
 FlowMind Cashflow — Recover Bridge v1
 
 HALT -> Resume previous safe phase
-"""
-
-import json
-from pathlib import Path
-from datetime import datetime, timezone
+(last non-HALT entry of projects/<ID>/PHASE_JOURNAL.bin)
 
+Station outputs are resolved first (engine.station_txn_v1): a transaction
+that reached COMMITTING is rolled forward, anything earlier is rolled back,
+so the resumed station sees a consistent out/<ID>/. One that can do neither
+(staged output lost mid-publish) HALTs the project, and the resume below runs
+its station again.
+"""
 
-def _utc_now():
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+from engine import phase_journal_v1, state_store_v1, station_txn_v1
 
 
 def run(project_id: str):
 
-    state_path = Path("projects") / project_id / "PROJECT_STATE.json"
-
-    if not state_path.exists():
+    if not state_store_v1.exists(project_id):
         print("[RECOVER] PROJECT_STATE missing")
         return
 
-    state = json.loads(state_path.read_text())
+    for txn in station_txn_v1.recover(project_id):
+        print(f"[RECOVER] {txn['station']} txn {txn['txid']}: {txn['state']} -> {txn['action']}")
 
-    if state.get("phase") != "HALT":
-        print("[RECOVER] Not in HALT state")
-        return
+    outcome = []
 
-    history = state.get("phase_history", [])
+    def apply(state):
+        if state.get("phase") != "HALT":
+            outcome.append("NOT_HALTED")
+            return False
 
-    if len(history) < 2:
-        print("[RECOVER] No previous phase found")
-        return
-
-    # Last entry is HALT, so take previous
-    previous_phase = history[-2].get("phase")
+        # backwards scan of the phase journal: the phase the HALT interrupted
+        previous_phase = phase_journal_v1.last_safe_phase(project_id)
 
-    now = _utc_now()
+        if not previous_phase:
+            outcome.append("NO_PREVIOUS")
+            return False
 
-    state["phase"] = previous_phase
-    state["halted"] = False
-    state.pop("halt_reason", None)
-    state["updated_at"] = now
+        state["halted"] = False
+        state.pop("halt_reason", None)
+        state_store_v1.transition(state, previous_phase, recovered=True)
+        outcome.append(previous_phase)
+        return True
 
-    history.append({
-        "at": now,
-        "phase": previous_phase,
-        "recovered": True
-    })
+    state_store_v1.update(project_id, apply)
+    result = outcome[0] if outcome else "NOT_HALTED"
 
-    state["phase_history"] = history[-100:]
+    if result == "NOT_HALTED":
+        print("[RECOVER] Not in HALT state")
+        return
 
-    state_path.write_text(json.dumps(state, indent=2))
+    if result == "NO_PREVIOUS":
+        print("[RECOVER] No previous phase found")
+        return
 
-    print(f"[RECOVER] Resumed to {previous_phase}")
+    print(f"[RECOVER] Resumed to {result}")
 
 
 if __name__ == "__main__":
@@ -65,4 +66,6 @@ if __name__ == "__main__":
         print("Usage: python -m dispatcher.recover_bridge_v1 <PROJECT_ID>")
         sys.exit(1)
 
-    run(sys.argv[1])
+    # standalone run: take the project lock (fm.py / batch ticks already hold it)
+    from engine import lock_manager_v1
+    sys.exit(lock_manager_v1.run_locked("recover_bridge_v1", lambda argv: run(argv[1]) or 0, sys.argv))
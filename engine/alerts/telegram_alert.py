@@ -4,6 +4,8 @@ import urllib.parse
 import json
 from dotenv import load_dotenv
 
+from engine import telegram_api_v1
+
 load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
@@ -22,7 +24,7 @@ def send_telegram_message(text: str):
     except ValueError:
         return {"sent": False, "error": "TELEGRAM_CHAT_ID must be integer"}
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    url = telegram_api_v1.bot_url(TELEGRAM_BOT_TOKEN, "sendMessage")
 
     payload = {
         "chat_id": chat_id,
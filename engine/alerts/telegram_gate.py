@@ -1,13 +1,34 @@
 import os
 import time
 import json
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
 from typing import List, Dict, Optional, Tuple
 
+from engine import state_store_v1, telegram_api_v1
+
 BOT_TOKEN = (os.getenv("TELEGRAM_BOT_TOKEN") or "").strip()
 CHAT_ID = (os.getenv("TELEGRAM_CHAT_ID") or "").strip()
 
-API_BASE = "https://api.telegram.org/bot{token}".format(token=BOT_TOKEN)
+API_BASE = telegram_api_v1.bot_url(BOT_TOKEN)   # TELEGRAM_API_BASE overrides the host
+
+ROOT = Path(__file__).resolve().parents[2]
+METRICS_FILE = "telegram_uploads.json"   # out/<PROJECT_ID>/telegram_uploads.json
+
+# Bot API: no resumable/chunked upload; multipart POST is all-or-nothing, 50 MB cap for bots
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+MAX_ATTEMPTS = 5
+MAX_BACKOFF_SEC = 30.0
+CONNECT_TIMEOUT = 10
+BASE_READ_TIMEOUT = 30
+MIN_UPLOAD_BPS = 256 * 1024              # read timeout budget grows with the payload size
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
 
 
 def _require_env():
@@ -17,15 +38,124 @@ def _require_env():
         raise RuntimeError("TELEGRAM_CHAT_ID missing")
 
 
-def _api(method: str, data: Optional[dict] = None, files: Optional[dict] = None) -> dict:
+def _session() -> requests.Session:
+    """One keep-alive connection pool for every call in the process."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            s = requests.Session()
+            s.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+            s.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+            _SESSION = s
+        return _SESSION
+
+
+def _upload_bytes(files: Optional[dict]) -> int:
+    total = 0
+    for f in (files or {}).values():
+        try:
+            total += os.fstat(f.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            pass
+    return total
+
+
+def _not_sent(e: requests.RequestException) -> bool:
+    """True if the request never reached Telegram (connect failed), so a retry cannot duplicate it."""
+    if isinstance(e, requests.ConnectTimeout):
+        return True
+    if isinstance(e, requests.Timeout) or not isinstance(e, requests.ConnectionError):
+        return False  # read timeout: the message may already be posted
+    cause = e.args[0] if e.args else None
+    return isinstance(getattr(cause, "reason", cause), ConnectTimeoutError)  # NewConnectionError, DNS
+
+
+def _retry_after(r: requests.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying, None if the failure is permanent."""
+    if r.status_code == 429:
+        try:
+            return float(r.json().get("parameters", {}).get("retry_after") or 1)
+        except ValueError:
+            return 1.0
+    if r.status_code >= 500:
+        return min(MAX_BACKOFF_SEC, 2.0 ** attempt)
+    return None
+
+
+def _api(method: str, data: Optional[dict] = None, files: Optional[dict] = None,
+         project_id: Optional[str] = None) -> dict:
+    """
+    POST a Bot API method on the shared session.
+    Retries failed connects / 429 (retry_after) / 5xx with backoff; file objects
+    are rewound for every attempt. send* is not idempotent: a read timeout or a
+    connection dropped after the request went out is raised, never retried (a
+    retry would post the video/message twice). Uploads are recorded per project.
+    """
     _require_env()
     url = f"{API_BASE}/{method}"
-    r = requests.post(url, data=data or {}, files=files, timeout=60)
-    r.raise_for_status()
-    payload = r.json()
-    if not payload.get("ok"):
-        raise RuntimeError(f"Telegram API error: {payload}")
-    return payload
+    size = _upload_bytes(files)
+    if size > MAX_UPLOAD_BYTES:
+        raise RuntimeError(f"{method}: {size} bytes exceeds the Bot API upload limit ({MAX_UPLOAD_BYTES})")
+    timeout = (CONNECT_TIMEOUT, BASE_READ_TIMEOUT + size / MIN_UPLOAD_BPS)
+
+    t0 = time.monotonic()
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        for f in (files or {}).values():
+            if hasattr(f, "seek"):
+                f.seek(0)
+        t_attempt = time.monotonic()
+        try:
+            r = _session().post(url, data=data or {}, files=files, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == MAX_ATTEMPTS or not _not_sent(e):
+                raise
+            wait = min(MAX_BACKOFF_SEC, 2.0 ** attempt)
+            print(f"[TG] {method} {type(e).__name__}, retry {attempt}/{MAX_ATTEMPTS - 1} in {wait:.0f}s")
+            time.sleep(wait)
+            continue
+
+        wait = _retry_after(r, attempt)
+        if wait is not None and attempt < MAX_ATTEMPTS:
+            print(f"[TG] {method} HTTP {r.status_code}, retry {attempt}/{MAX_ATTEMPTS - 1} in {wait:.0f}s")
+            time.sleep(wait)
+            continue
+        r.raise_for_status()
+        payload = r.json()
+        if not payload.get("ok"):
+            raise RuntimeError(f"Telegram API error: {payload}")
+        if project_id and files:
+            now = time.monotonic()
+            _record_upload(project_id, method, size, now - t_attempt, now - t0, attempt)
+        return payload
+    raise RuntimeError(f"{method}: retries exhausted")
+
+
+def _record_upload(project_id: str, method: str, size: int, seconds: float, wall_seconds: float,
+                   attempts: int) -> None:
+    """Append one upload to out/<PROJECT_ID>/telegram_uploads.json (throughput per project)."""
+    path = ROOT / "out" / project_id / METRICS_FILE
+    entry = {
+        "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "method": method,
+        "bytes": size,
+        "seconds": round(seconds, 3),              # successful attempt (throughput)
+        "wall_seconds": round(wall_seconds, 3),    # incl. failed attempts + backoff
+        "mbit_per_sec": round(size * 8 / seconds / 1e6, 3) if seconds > 0 else None,
+        "attempts": attempts,
+    }
+    def apply(data: Dict) -> None:
+        data["uploads"] = (data.get("uploads") or [])[-199:] + [entry]
+        total_bytes = sum(u["bytes"] for u in data["uploads"])
+        total_sec = sum(u["seconds"] for u in data["uploads"])
+        data["totals"] = {
+            "uploads": len(data["uploads"]),
+            "bytes": total_bytes,
+            "seconds": round(total_sec, 3),
+            "mbit_per_sec": round(total_bytes * 8 / total_sec / 1e6, 3) if total_sec > 0 else None,
+        }
+
+    # locked read-modify-write, atomic 0644 replace (parallel uploads, other processes)
+    state_store_v1.update_json(path, apply, {"project_id": project_id, "uploads": []})
 
 
 def _build_topic_keyboard(topics: List[Dict]) -> dict:
@@ -81,7 +211,7 @@ def wait_for_topic_choice(message_id: int, timeout_sec: int = 300) -> Optional[i
         if offset is not None:
             params["offset"] = offset
 
-        r = requests.get(f"{API_BASE}/getUpdates", params=params, timeout=30)
+        r = _session().get(f"{API_BASE}/getUpdates", params=params, timeout=30)
         r.raise_for_status()
         payload = r.json()
         if not payload.get("ok"):
@@ -132,8 +262,9 @@ def send_video(project_id: str, video_path: str, caption: str) -> int:
     with open(video_path, "rb") as f:
         payload = _api(
             "sendVideo",
-            data={"chat_id": CHAT_ID, "caption": caption},
+            data={"chat_id": CHAT_ID, "caption": caption, "supports_streaming": "true"},
             files={"video": f},
+            project_id=project_id,
         )
     return int(payload["result"]["message_id"])
 
@@ -144,10 +275,33 @@ def send_photo(project_id: str, photo_path: str, caption: str = "") -> int:
             "sendPhoto",
             data={"chat_id": CHAT_ID, "caption": caption},
             files={"photo": f},
+            project_id=project_id,
         )
     return int(payload["result"]["message_id"])
 
 
+def send_media_group(project_id: str, photo_paths: List[str], captions: List[str]) -> List[int]:
+    """All photos as one album: one request instead of one per photo (Bot API: 2..10 items)."""
+    if len(photo_paths) < 2:
+        return [send_photo(project_id, p, c) for p, c in zip(photo_paths, captions)]
+    handles = [open(p, "rb") for p in photo_paths]
+    try:
+        media = [
+            {"type": "photo", "media": f"attach://photo{i}", "caption": c}
+            for i, c in enumerate(captions)
+        ]
+        payload = _api(
+            "sendMediaGroup",
+            data={"chat_id": CHAT_ID, "media": json.dumps(media)},
+            files={f"photo{i}": f for i, f in enumerate(handles)},
+            project_id=project_id,
+        )
+    finally:
+        for f in handles:
+            f.close()
+    return [int(m["message_id"]) for m in payload["result"]]
+
+
 def send_final_package(project_id: str, title: str, video_path: str, thumbs: List[str]) -> int:
     """
     Sends:
@@ -156,15 +310,19 @@ def send_final_package(project_id: str, title: str, video_path: str, thumbs: Lis
     - final approval message with buttons
     Returns approval message_id (the one with buttons).
     """
-    # Thumbs first (so user sees options immediately)
-    for i, p in enumerate(thumbs, start=1):
-        send_photo(project_id, p, caption=f"🖼 Thumbnail {i}/3 — {title}")
-
-    vid_mid = send_video(
-        project_id,
-        video_path,
-        caption=f"🎬 Video Preview — {title}\nPROJECT_ID: {project_id}",
-    )
+    # Thumbs album + video upload in parallel on the pooled session;
+    # the approval buttons go out only once both have landed.
+    captions = [f"🖼 Thumbnail {i}/{len(thumbs)} — {title}" for i in range(1, len(thumbs) + 1)]
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="tg-upload") as pool:
+        album = pool.submit(send_media_group, project_id, thumbs, captions)
+        video = pool.submit(
+            send_video,
+            project_id,
+            video_path,
+            f"🎬 Video Preview — {title}\nPROJECT_ID: {project_id}",
+        )
+        album.result()
+        video.result()
 
     kb = _final_keyboard(project_id)
     approval_msg = _api(
@@ -191,7 +349,7 @@ def wait_for_final_action(project_id: str, message_id: int, timeout_sec: int = 6
         if offset is not None:
             params["offset"] = offset
 
-        r = requests.get(f"{API_BASE}/getUpdates", params=params, timeout=30)
+        r = _session().get(f"{API_BASE}/getUpdates", params=params, timeout=30)
         r.raise_for_status()
         payload = r.json()
         if not payload.get("ok"):
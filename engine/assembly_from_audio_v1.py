@@ -8,8 +8,20 @@ Video source priority:
   1) assets/cache/<PROJECT_ID>/video/motion_bg.mp4  (generated by video_motion_dummy_v1)
   2) test_video.mp4 (repo root)
 
+Render tier (engine.render_tiers_v1):
+  preview  640x360 low bitrate — default, what the approval gate sees
+  full     1920x1080           — rendered by approval_bridge_v1 after APPROVE
+  --tier overrides the project tier; the marker records "render_tier".
+
+Build cache:
+  master.wav + video source + ffmpeg argv unchanged and final.mp4/ffprobe.json untouched
+  -> outputs reused, no re-encode (engine.build_cache_v1)
+
+Outputs are staged and committed together (engine.station_txn_v1): a crash
+leaves either the previous final.mp4/ffprobe.json/marker or the new ones.
+
 Usage:
-  python -m engine.assembly_from_audio_v1 FM_TEST
+  python -m engine.assembly_from_audio_v1 FM_TEST [--tier preview|full]
 """
 
 from __future__ import annotations
@@ -21,6 +33,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
+from engine import build_cache_v1, ffmpeg_caps_v1, probe_cache_v1, render_tiers_v1, station_txn_v1, wav_io_v1
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -37,26 +51,27 @@ def _run(cmd: list[str]) -> Tuple[int, str]:
 
 
 def _require_tools() -> None:
-    rc, _ = _run(["ffmpeg", "-version"])
-    if rc != 0:
-        raise RuntimeError("ffmpeg not found in PATH")
-    rc, _ = _run(["ffprobe", "-version"])
-    if rc != 0:
-        raise RuntimeError("ffprobe not found in PATH")
+    # PATH lookup + cached capability record (engine.ffmpeg_caps_v1), no -version spawns
+    ffmpeg_caps_v1.require(("ffmpeg", "ffprobe"), encoders=("libx264", "aac"))
 
 
 def _probe_duration_sec(media: Path) -> float:
-    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", str(media)]
-    rc, out = _run(cmd)
-    if rc != 0:
-        raise RuntimeError(f"ffprobe failed rc={rc}\n{out}")
-    data = json.loads(out)
-    return float(data["format"]["duration"])
+    # master.wav is PCM: header read, ffprobe only for other inputs
+    return wav_io_v1.duration_sec(media)
 
 
 def main(argv: list[str]) -> int:
+    tier = None
+    if "--tier" in argv:
+        i = argv.index("--tier")
+        tier = argv[i + 1] if i + 1 < len(argv) else ""
+        argv = argv[:i] + argv[i + 2:]
+        if tier not in render_tiers_v1.TIERS:
+            print(f"[FAIL] --tier must be one of: {', '.join(render_tiers_v1.TIERS)}", file=sys.stderr)
+            return 2
+
     if len(argv) < 2:
-        print("Usage: python -m engine.assembly_from_audio_v1 <PROJECT_ID>", file=sys.stderr)
+        print("Usage: python -m engine.assembly_from_audio_v1 <PROJECT_ID> [--tier preview|full]", file=sys.stderr)
         return 2
 
     project_id = argv[1]
@@ -99,6 +114,8 @@ def main(argv: list[str]) -> int:
     out_dir.mkdir(parents=True, exist_ok=True)
     final_mp4 = out_dir / "final.mp4"
     ffprobe_json = out_dir / "ffprobe.json"
+    tier = tier or render_tiers_v1.for_project(project_id)
+    profile = render_tiers_v1.profile_for(tier, project_id)
 
     cmd = [
         "ffmpeg",
@@ -114,15 +131,13 @@ def main(argv: list[str]) -> int:
         "-r",
         "30",
         "-vf",
-        "scale=1920:1080:force_original_aspect_ratio=decrease,"
-        "pad=1920:1080:(ow-iw)/2:(oh-ih)/2,"
-        "setsar=1,format=yuv420p",
-        "-c:v",
-        "libx264",
+        render_tiers_v1.scale_filter(tier) + ",setsar=1,format=yuv420p",
+        *render_tiers_v1.video_args(tier, profile),
         "-pix_fmt",
         "yuv420p",
         "-c:a",
         "aac",
+        *render_tiers_v1.audio_args(tier),
         "-ar",
         "48000",
         "-ac",
@@ -131,31 +146,49 @@ def main(argv: list[str]) -> int:
         "+faststart",
         str(final_mp4),
     ]
-    rc, out = _run(cmd)
-    if rc != 0:
-        print(f"[FAIL] ffmpeg assembly rc={rc}\n{out}", file=sys.stderr)
-        return 8
-
-    cmdp = ["ffprobe", "-v", "error", "-show_streams", "-show_format", "-of", "json", str(final_mp4)]
-    rc2, out2 = _run(cmdp)
-    if rc2 != 0:
-        print(f"[FAIL] ffprobe final rc={rc2}\n{out2}", file=sys.stderr)
-        return 9
-    ffprobe_json.write_text(out2 + "\n", encoding="utf-8")
+    fp = build_cache_v1.fingerprint("ASSEMBLY_FROM_AUDIO", [master_wav, video_src], cmd)
+    cache_hit = build_cache_v1.lookup(project_dir, "ASSEMBLY_FROM_AUDIO", fp)
 
     marker = project_dir / "ASSEMBLY_FROM_AUDIO.json"
-    marker_data = {
-        "project_id": project_id,
-        "generated_at": _utc_now_iso(),
-        "inputs": {"master_wav": str(master_wav), "video_src": str(video_src), "video_src_kind": video_src_kind},
-        "duration_sec": float(dur),
-        "outputs": {"final_mp4": str(final_mp4), "ffprobe_json": str(ffprobe_json)},
-        "note": "Assembly uses master audio clock. Video loops until audio ends.",
-    }
-    marker.write_text(json.dumps(marker_data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-
+    with station_txn_v1.transaction(project_id, "ASSEMBLY_FROM_AUDIO") as txn:
+        if not cache_hit:
+            # encode into the staging dir; the fingerprint keeps the published argv
+            staged_mp4 = txn.stage(final_mp4)
+            rc, out = _run(txn.staged_cmd(cmd))
+            if rc != 0:
+                print(f"[FAIL] ffmpeg assembly rc={rc}\n{out}", file=sys.stderr)
+                return 8
+
+            try:
+                probe = probe_cache_v1.probe_file(staged_mp4)
+            except Exception as e:
+                print(f"[FAIL] ffprobe final: {e}", file=sys.stderr)
+                return 9
+            probe.setdefault("format", {})["filename"] = str(final_mp4)
+            txn.write_text(ffprobe_json, json.dumps(probe, ensure_ascii=False, indent=4) + "\n")
+
+        marker_data = {
+            "project_id": project_id,
+            "generated_at": _utc_now_iso(),
+            "inputs": {"master_wav": str(master_wav), "video_src": str(video_src), "video_src_kind": video_src_kind},
+            "duration_sec": float(dur),
+            "render_tier": tier,
+            "encode_profile": profile,
+            "outputs": {"final_mp4": str(final_mp4), "ffprobe_json": str(ffprobe_json)},
+            "build_cache": {"fingerprint": fp, "hit": cache_hit},
+            "note": "Assembly uses master audio clock. Video loops until audio ends.",
+        }
+        txn.write_text(marker, json.dumps(marker_data, ensure_ascii=False, indent=2) + "\n")
+        txn.commit()  # final.mp4, ffprobe.json, marker: all new or all old
+
+    if not cache_hit:
+        probe_cache_v1.remember(final_mp4, probe)  # FINAL_QA reuses this record
+        build_cache_v1.store(project_dir, "ASSEMBLY_FROM_AUDIO", fp, [final_mp4, ffprobe_json])
+
+    if cache_hit:
+        print(f"[ASSEMBLY_FROM_AUDIO PASS] cache hit fingerprint={fp[:12]} (no re-encode)")
     print(f"[ASSEMBLY_FROM_AUDIO PASS] video_src_kind={video_src_kind} src={video_src}")
-    print(f"[ASSEMBLY_FROM_AUDIO PASS] final={final_mp4}")
+    print(f"[ASSEMBLY_FROM_AUDIO PASS] final={final_mp4} tier={tier} profile={profile}")
     print(f"[ASSEMBLY_FROM_AUDIO PASS] ffprobe={ffprobe_json}")
     return 0
 
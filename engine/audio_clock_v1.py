@@ -3,50 +3,55 @@
 FlowMind — Audio Clock v1 (Cashflow Mode)
 
 Audio = Master Clock.
-Extracts exact duration from WAV using ffprobe.
+Extracts exact duration from the WAV header (engine.wav_io_v1);
+ffprobe (shared probe cache) only for non-PCM input.
 Outputs AUDIO_CLOCK.json next to source file.
 """
 
 from __future__ import annotations
 import json
-import subprocess
 import sys
 import os
 from typing import Dict
 
+from engine import wav_io_v1
+
 
 def get_audio_duration_seconds(path: str) -> float:
     if not os.path.isfile(path):
         raise FileNotFoundError(f"Audio file not found: {path}")
 
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        path,
-    ]
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        raise RuntimeError("ffprobe failed to read audio duration")
-
     try:
-        return float(result.stdout.strip())
-    except ValueError:
+        return wav_io_v1.duration_sec(path)
+    except RuntimeError:
+        raise RuntimeError("ffprobe failed to read audio duration")
+    except (KeyError, TypeError, ValueError):
         raise RuntimeError("Invalid duration format from ffprobe")
 
 
 def build_audio_clock(path: str) -> Dict:
     duration_seconds = get_audio_duration_seconds(path)
 
-    return {
+    clock = {
         "audio_path": path,
         "duration_seconds": round(duration_seconds, 3),
         "duration_ms": int(duration_seconds * 1000)
     }
 
+    # Frame-accurate clock for PCM masters
+    try:
+        info = wav_io_v1.read_wav_info(path)
+    except (OSError, ValueError):
+        info = None
+    if info is not None and info.is_pcm:
+        clock.update({
+            "duration_us": info.duration_us,
+            "frames": info.frames,
+            "sample_rate": info.sample_rate,
+            "channels": info.channels,
+        })
+    return clock
+
 
 def main(argv: list[str]) -> int:
     if len(argv) != 2:
@@ -3,6 +3,12 @@
 """
 FlowMind Cashflow — Audio Render Silent v1
 Creates a real master WAV based on AUDIO_PLAN.json "master_clock.total_duration_sec".
+Native writer (engine.wav_io_v1.write_silence): no ffmpeg, sample-exact
+frames = round(total_duration_sec * sample_rate), byte-identical reruns.
+
+Segments with an "audio_path" are placed at their sample-exact offsets by
+engine.audio_segments_v1 (mode SEGMENTS); only changed segments are rewritten
+on later runs. A plan without sources yields pure silence (mode SILENT).
 
 Usage:
   python -m engine.audio_render_silent_v1 FM_TEST
@@ -11,12 +17,12 @@ Usage:
 from __future__ import annotations
 
 import json
-import os
 import sys
-import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict
+
+from engine import audio_segments_v1
 
 
 def _utc_now_iso() -> str:
@@ -28,48 +34,6 @@ def _read_json(path: Path) -> Dict[str, Any]:
         return json.load(f)
 
 
-def _ensure_parent(p: Path) -> None:
-    p.parent.mkdir(parents=True, exist_ok=True)
-
-
-def _run(cmd: list[str]) -> Tuple[int, str]:
-    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-    return proc.returncode, proc.stdout
-
-
-def _ffmpeg_exists() -> bool:
-    try:
-        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        return True
-    except Exception:
-        return False
-
-
-def _render_silence(out_wav: Path, duration_sec: float, sr: int = 48000, ch: int = 2) -> None:
-    # deterministic PCM WAV
-    _ensure_parent(out_wav)
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-f",
-        "lavfi",
-        "-i",
-        f"anullsrc=r={sr}:cl={'stereo' if ch == 2 else 'mono'}",
-        "-t",
-        f"{duration_sec:.3f}",
-        "-ac",
-        str(ch),
-        "-ar",
-        str(sr),
-        "-c:a",
-        "pcm_s16le",
-        str(out_wav),
-    ]
-    rc, out = _run(cmd)
-    if rc != 0:
-        raise RuntimeError(f"ffmpeg failed rc={rc}\n{out}")
-
-
 def main(argv: list[str]) -> int:
     if len(argv) < 2:
         print("Usage: python -m engine.audio_render_silent_v1 <PROJECT_ID>", file=sys.stderr)
@@ -95,10 +59,6 @@ def main(argv: list[str]) -> int:
         print(f"[FAIL] invalid total_duration_sec={total}", file=sys.stderr)
         return 4
 
-    if not _ffmpeg_exists():
-        print("[FAIL] ffmpeg not found in PATH", file=sys.stderr)
-        return 5
-
     # Output path: prefer AUDIO_PLAN.outputs.master_wav_placeholder
     outputs = plan.get("outputs") or {}
     out_wav_str = outputs.get("master_wav_placeholder")
@@ -108,7 +68,7 @@ def main(argv: list[str]) -> int:
         out_wav = Path(out_wav_str).expanduser().resolve()
 
     try:
-        _render_silence(out_wav, total, sr=sr, ch=ch)
+        report = audio_segments_v1.assemble_master(plan, out_wav)
     except Exception as e:
         print(f"[FAIL] render: {e}", file=sys.stderr)
         return 6
@@ -118,15 +78,23 @@ def main(argv: list[str]) -> int:
     marker_data = {
         "project_id": project_id,
         "generated_at": _utc_now_iso(),
-        "mode": "SILENT",
+        "mode": report["mode"],
         "outputs": {"master_wav": str(out_wav)},
         "duration_sec": total,
+        "frames": report["frames"],
+        "segments": {
+            "placed": report["placed"],
+            "written": report["written"],
+            "rebuild": report["rebuild"],
+            "manifest": report["manifest"],
+        },
         "audio_spec": {"sample_rate": sr, "channels": ch, "format": "wav"},
     }
     marker.parent.mkdir(parents=True, exist_ok=True)
     marker.write_text(json.dumps(marker_data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
-    print(f"[AUDIO_RENDER PASS] master_wav={out_wav} duration_sec={total:.3f}")
+    print(f"[AUDIO_RENDER PASS] master_wav={out_wav} duration_sec={total:.3f} mode={report['mode']} "
+          f"rebuild={report['rebuild']} written={len(report['written'])}")
     print(f"[AUDIO_RENDER PASS] marker={marker}")
     return 0
 
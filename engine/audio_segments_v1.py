@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Audio Segments v1 (master.wav segment assembler)
+
+Places AUDIO_PLAN.json segments into master.wav at sample-exact offsets:
+- segment window = [frames_for(start_sec), frames_for(end_sec))
+- segments with "audio_path" (PCM WAV, same rate/channels/bit depth as the
+  master) are copied in; longer sources are cut at the window end, shorter
+  ones leave the remainder silent
+- everything else is silence (sparse zeros from wav_io_v1.write_silence)
+
+Copies are kernel-side (os.copy_file_range) where available, otherwise slices
+of a memory-mapped source written with os.pwrite — no decode, no ffmpeg.
+
+Incremental:
+  master.segments.json (next to master.wav) records the header, the master's
+  size/mtime and every placed segment's source signature. On the next run, if
+  the master is untouched and the layout is the same, only segments whose
+  source changed are rewritten in place (removed sources are zeroed).
+  Anything else -> full rebuild into a temp file + atomic replace.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from engine import wav_io_v1
+
+MANIFEST_SUFFIX = ".segments.json"
+ZERO_CHUNK = 1 << 20
+
+
+def manifest_path(master_wav: Path) -> Path:
+    return master_wav.with_suffix(MANIFEST_SUFFIX)
+
+
+def _file_sig(path: Path) -> Dict[str, Any]:
+    st = path.stat()
+    return {"path": str(path), "bytes": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def plan_layout(plan: Dict[str, Any], total_frames: int, sr: int) -> List[Dict[str, Any]]:
+    """Segment windows in frames, with the resolved source (or None = silence)."""
+    layout: List[Dict[str, Any]] = []
+    for seg in plan.get("segments") or []:
+        start = min(total_frames, wav_io_v1.frames_for(seg.get("start_sec") or 0.0, sr))
+        end = min(total_frames, wav_io_v1.frames_for(seg.get("end_sec") or 0.0, sr))
+        if end <= start:
+            continue
+        src = seg.get("audio_path")
+        layout.append({
+            "segment_id": seg.get("segment_id"),
+            "start_frame": start,
+            "frames": end - start,
+            "source": str(Path(src).expanduser().resolve()) if src else None,
+        })
+    return layout
+
+
+def _check_source(src: Path, sr: int, ch: int, bits: int) -> wav_io_v1.WavInfo:
+    info = wav_io_v1.read_wav_info(src)
+    if info.format_tag != wav_io_v1.WAVE_FORMAT_PCM or (info.sample_rate, info.channels,
+                                                        info.bits_per_sample) != (sr, ch, bits):
+        raise RuntimeError(
+            f"segment source must be PCM {sr}Hz/{ch}ch/{bits}bit: {src} "
+            f"(got tag={info.format_tag} {info.sample_rate}Hz/{info.channels}ch/{info.bits_per_sample}bit)"
+        )
+    return info
+
+
+def _copy_range(src_fd: int, src_off: int, dst_fd: int, dst_off: int, nbytes: int) -> None:
+    if hasattr(os, "copy_file_range"):
+        try:
+            while nbytes > 0:
+                n = os.copy_file_range(src_fd, dst_fd, nbytes, src_off, dst_off)
+                if n <= 0:
+                    break
+                src_off += n
+                dst_off += n
+                nbytes -= n
+            if nbytes == 0:
+                return
+        except OSError:
+            pass  # cross-device / unsupported FS -> mmap path for the remainder
+    with mmap.mmap(src_fd, 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            while nbytes > 0:
+                n = os.pwrite(dst_fd, view[src_off:src_off + min(nbytes, ZERO_CHUNK * 8)], dst_off)
+                if n <= 0:
+                    raise RuntimeError(f"short read from segment source at offset {src_off}")
+                src_off += n
+                dst_off += n
+                nbytes -= n
+        finally:
+            view.release()
+
+
+def _zero_range(dst_fd: int, dst_off: int, nbytes: int) -> None:
+    zeros = bytes(min(nbytes, ZERO_CHUNK))
+    while nbytes > 0:
+        n = os.pwrite(dst_fd, zeros[:min(nbytes, len(zeros))], dst_off)
+        dst_off += n
+        nbytes -= n
+
+
+def _place(dst_fd: int, seg: Dict[str, Any], block_align: int, sr: int, ch: int, bits: int) -> Dict[str, Any]:
+    """Write one segment's source into its window; returns the manifest entry."""
+    src = Path(seg["source"])
+    info = _check_source(src, sr, ch, bits)
+    frames = min(info.frames, seg["frames"])
+    with open(src, "rb") as f:
+        _copy_range(f.fileno(), info.data_offset, dst_fd,
+                    wav_io_v1.PCM_HEADER_BYTES + seg["start_frame"] * block_align, frames * block_align)
+    if frames < seg["frames"]:
+        _zero_range(dst_fd, wav_io_v1.PCM_HEADER_BYTES + (seg["start_frame"] + frames) * block_align,
+                    (seg["frames"] - frames) * block_align)
+    return {**seg, "source_sig": _file_sig(src), "frames_copied": frames}
+
+
+def _load_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def assemble_master(plan: Dict[str, Any], out_wav: Path, bits: int = 16) -> Dict[str, Any]:
+    """
+    Build / update master.wav from AUDIO_PLAN. Returns a report:
+    {"frames", "mode": "SILENT"|"SEGMENTS", "rebuild": bool, "written": [segment_id...], "placed": n}
+    """
+    spec = plan.get("audio_spec") or {}
+    sr = int(spec.get("sample_rate") or 48000)
+    ch = int(spec.get("channels") or 2)
+    total = float((plan.get("master_clock") or {}).get("total_duration_sec") or 0.0)
+    total_frames = wav_io_v1.frames_for(total, sr)
+    block_align = ch * bits // 8
+
+    layout = plan_layout(plan, total_frames, sr)
+    header = {"frames": total_frames, "sample_rate": sr, "channels": ch, "bits": bits}
+    windows = [(s["segment_id"], s["start_frame"], s["frames"]) for s in layout]
+    man_path = manifest_path(out_wav)
+    old = _load_manifest(man_path)
+
+    incremental = (
+        old is not None
+        and not old.get("dirty")
+        and old.get("header") == header
+        and [tuple(w) for w in old.get("windows") or []] == windows
+        and out_wav.exists()
+        and {k: v for k, v in _file_sig(out_wav).items() if k != "path"} == old.get("master")
+    )
+
+    placed: Dict[str, Dict[str, Any]] = {}
+    written: List[str] = []
+    if incremental:
+        prev = {e["segment_id"]: e for e in old.get("placed") or []}
+        todo: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = []
+        for seg in layout:
+            before = prev.get(seg["segment_id"])
+            if seg["source"]:
+                sig = _file_sig(Path(seg["source"]))
+                if before and before.get("source_sig") == sig:
+                    placed[seg["segment_id"]] = before
+                    continue
+            elif before is None:
+                continue
+            todo.append((seg, before))
+
+        if todo:
+            _atomic_write_json(man_path, {**old, "dirty": True})
+            fd = os.open(out_wav, os.O_RDWR)
+            try:
+                for seg, before in todo:
+                    if seg["source"]:
+                        placed[seg["segment_id"]] = _place(fd, seg, block_align, sr, ch, bits)
+                    else:
+                        _zero_range(fd, wav_io_v1.PCM_HEADER_BYTES + seg["start_frame"] * block_align,
+                                    seg["frames"] * block_align)
+                    written.append(seg["segment_id"])
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    else:
+        out_wav.parent.mkdir(parents=True, exist_ok=True)
+        tmp_wav = out_wav.with_name(out_wav.name + ".building")
+        wav_io_v1.write_silence(tmp_wav, total_frames, sr, ch, bits)
+        try:
+            fd = os.open(tmp_wav, os.O_RDWR)
+            try:
+                for seg in layout:
+                    if seg["source"]:
+                        placed[seg["segment_id"]] = _place(fd, seg, block_align, sr, ch, bits)
+                        written.append(seg["segment_id"])
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_wav, out_wav)
+        finally:
+            if tmp_wav.exists():
+                tmp_wav.unlink()
+
+    if incremental and not written:
+        manifest = old
+    else:
+        manifest = {
+            "header": header,
+            "windows": windows,
+            "master": {k: v for k, v in _file_sig(out_wav).items() if k != "path"},
+            "placed": list(placed.values()),
+        }
+        _atomic_write_json(man_path, manifest)
+
+    return {
+        "frames": total_frames,
+        "mode": "SEGMENTS" if placed else "SILENT",
+        "rebuild": not incremental,
+        "written": written,
+        "placed": len(placed),
+        "manifest": str(man_path),
+    }
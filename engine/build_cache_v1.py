@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Build Cache v1 (content-addressed station outputs)
+
+Fingerprint = sha256 over:
+- station name
+- sha256 of every input file (same hashing as DELIVERY_PACK)
+- parameter list (ffmpeg argv, video/audio spec)
+
+Record:
+  projects/<PROJECT_ID>/BUILD_CACHE.json
+  {"<STATION>": {"fingerprint": str, "stored_at": str, "outputs": {path: {"bytes": int, "mtime_ns": int}}}}
+
+Hit = same fingerprint AND every recorded output still exists untouched (bytes + mtime_ns).
+Any other writer of an output (e.g. another station re-rendering final.mp4) turns it into a miss.
+
+Disable with FLOWMIND_BUILD_CACHE=0.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from engine.delivery_pack_v1 import _sha256
+
+CACHE_FILE = "BUILD_CACHE.json"
+FINGERPRINT_VERSION = "v1"
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def enabled() -> bool:
+    return os.getenv("FLOWMIND_BUILD_CACHE", "1").strip() not in ("0", "false", "no", "off")
+
+
+def fingerprint(station: str, inputs: Iterable[Path], params: Iterable[Any]) -> str:
+    h = hashlib.sha256()
+    h.update(f"{FINGERPRINT_VERSION}:{station}\n".encode("utf-8"))
+    for p in inputs:
+        p = Path(p)
+        h.update(f"in:{p.resolve()}:{_sha256(p)}\n".encode("utf-8"))
+    h.update(json.dumps(list(params), ensure_ascii=False, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _output_meta(path: Path) -> Optional[Dict[str, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return {"bytes": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _load(project_dir: Path) -> Dict[str, Any]:
+    path = project_dir / CACHE_FILE
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _save(project_dir: Path, data: Dict[str, Any]) -> None:
+    project_dir.mkdir(parents=True, exist_ok=True)
+    path = project_dir / CACHE_FILE
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(project_dir))
+    try:
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def lookup(project_dir: Path, station: str, fp: str) -> bool:
+    if not enabled():
+        return False
+    rec = _load(project_dir).get(station)
+    if not isinstance(rec, dict) or rec.get("fingerprint") != fp:
+        return False
+    outputs = rec.get("outputs") or {}
+    if not outputs:
+        return False
+    for path_str, meta in outputs.items():
+        if _output_meta(Path(path_str)) != meta:
+            return False
+    return True
+
+
+def store(project_dir: Path, station: str, fp: str, outputs: Iterable[Path]) -> None:
+    if not enabled():
+        return
+    metas: Dict[str, Any] = {}
+    for p in outputs:
+        meta = _output_meta(Path(p))
+        if meta is None:
+            return  # incomplete outputs are never cached
+        metas[str(Path(p).resolve())] = meta
+    data = _load(project_dir)
+    data[station] = {"fingerprint": fp, "stored_at": _utc_now_iso(), "outputs": metas}
+    _save(project_dir, data)
+
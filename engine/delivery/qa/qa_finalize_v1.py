@@ -13,9 +13,9 @@ Strict:
 
 from __future__ import annotations
 
-import subprocess
 from pathlib import Path
 
+from engine import probe_cache_v1
 from engine.artifacts import artifacts
 
 
@@ -24,20 +24,7 @@ MIN_SIZE_BYTES = 200_000  # 200KB minimal safety threshold
 
 def ffprobe_has_video_stream(path: Path) -> bool:
     try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=codec_type",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                str(path),
-            ],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        return "video" in result.stdout.lower()
+        return bool(probe_cache_v1.stream(probe_cache_v1.probe(path), "video"))
     except Exception:
         return False
 
@@ -12,6 +12,7 @@ import sys
 import json
 from datetime import datetime, timezone
 
+from engine import state_store_v1
 from engine.artifacts import artifacts
 from engine.delivery.qa.qa_finalize_v1 import run_final_qa
 
@@ -31,23 +32,22 @@ def main():
     project_id = sys.argv[1]
     a = artifacts(project_id)
 
-    with open(a.manifest_json, "r", encoding="utf-8") as f:
-        state = json.load(f)
+    state = state_store_v1.read_json(a.manifest_json)
 
     if state.get("status") != "FINAL_READY":
         raise RuntimeError("Delivery requires FINAL_READY state.")
 
     qa_result = run_final_qa(project_id)
 
-    if qa_result["pass"]:
-        state["status"] = "QA_PASSED"
-    else:
-        state["status"] = "QA_FAILED"
+    def apply(state):
+        if qa_result["pass"]:
+            state["status"] = "QA_PASSED"
+        else:
+            state["status"] = "QA_FAILED"
 
-    state["last_update"] = now_utc()
+        state["last_update"] = now_utc()
 
-    with open(a.manifest_json, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+    state_store_v1.update_json(a.manifest_json, apply)
 
     print(json.dumps({
         "project_id": project_id,
@@ -7,6 +7,11 @@ Builds a deterministic delivery package JSON after FINAL_QA.
 Outputs:
   projects/<PROJECT_ID>/DELIVERY_PACK.json
 
+Two-tier render: the pack built for the approval gate describes the preview
+final.mp4. After APPROVE, approval_bridge_v1 renders the full tier and calls
+refresh_artifacts(), which re-hashes the outputs in place and keeps the
+approved preview's meta under artifacts.preview_video.
+
 Usage:
   python -m engine.delivery_pack_v1 FM_TEST
 """
@@ -46,6 +51,38 @@ def _file_meta(path: Path) -> Dict[str, Any]:
     }
 
 
+def _artifacts(project_dir: Path, out_dir: Path) -> Dict[str, Any]:
+    return {
+        "final_video": _file_meta(out_dir / "final.mp4"),
+        "ffprobe": _file_meta(out_dir / "ffprobe.json"),
+        "final_qa": _file_meta(project_dir / "FINAL_QA.json"),
+        "audio_plan": _file_meta(project_dir / "AUDIO_PLAN.json"),
+        "audio_render": _file_meta(project_dir / "AUDIO_RENDER.json"),
+        "assembly_marker": _file_meta(project_dir / "ASSEMBLY_FROM_AUDIO.json"),
+    }
+
+
+def refresh_artifacts(project_id: str) -> Dict[str, Any]:
+    """Re-hash an existing pack after the post-approval full render. Raises on missing files."""
+    project_dir = (Path("projects") / project_id).resolve()
+    out_dir = (Path("out") / project_id).resolve()
+    out_path = project_dir / "DELIVERY_PACK.json"
+    pack = _read_json(out_path)
+
+    old = pack.get("artifacts") or {}
+    artifacts = _artifacts(project_dir, out_dir)
+    if "preview_video" in old:
+        artifacts["preview_video"] = old["preview_video"]
+    elif (old.get("final_video") or {}).get("sha256") != artifacts["final_video"]["sha256"]:
+        artifacts["preview_video"] = old.get("final_video")
+
+    pack["artifacts"] = artifacts
+    pack.setdefault("summary", {})["render_tier"] = _read_json(project_dir / "ASSEMBLY_FROM_AUDIO.json").get("render_tier", "full")
+    pack["refreshed_at"] = _utc_now_iso()
+    out_path.write_text(json.dumps(pack, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return pack
+
+
 def main(argv: list[str]) -> int:
     if len(argv) < 2:
         print("Usage: python -m engine.delivery_pack_v1 <PROJECT_ID>", file=sys.stderr)
@@ -79,6 +116,7 @@ def main(argv: list[str]) -> int:
         return 5
 
     rep = _read_json(final_qa_json)
+    render_tier = _read_json(assembly_marker).get("render_tier", "full")
     duration = None
     for c in rep.get("checks", []):
         if c.get("name") == "duration_matches_master_wav":
@@ -90,17 +128,11 @@ def main(argv: list[str]) -> int:
         "phase": "DELIVERY_PACK",
         "summary": {
             "duration_sec": duration,
+            "render_tier": render_tier,
             "mode": "CASHFLOW_DUMMY_MOTION_BG",
             "notes": "Audio is master clock. Video is motion dummy background (no text).",
         },
-        "artifacts": {
-            "final_video": _file_meta(final_mp4),
-            "ffprobe": _file_meta(ffprobe_json),
-            "final_qa": _file_meta(final_qa_json),
-            "audio_plan": _file_meta(audio_plan),
-            "audio_render": _file_meta(audio_render),
-            "assembly_marker": _file_meta(assembly_marker),
-        },
+        "artifacts": _artifacts(project_dir, out_dir),
         "next_gate": {
             "name": "TELEGRAM_APPROVAL",
             "required": True,
@@ -1,13 +1,17 @@
 """
 FlowMind Cashflow Dispatcher
-State-Locked + Telegram-Gated + Smart Runtime Lock + Auto-Resume + CLI PROJECT_ID
+State-Locked + Telegram-Gated + Per-Project Lock + Auto-Resume + CLI PROJECT_ID
+
+Lock: projects/<PROJECT_ID>/.orch.lock via engine.lock_manager_v1 (same lock
+as fm.py), so dispatchers for different projects run side by side and a
+crashed dispatcher's lock is reclaimed automatically.
 """
 
-import os
 import time
 import sys
 import argparse
 
+from engine import lock_manager_v1
 from engine.alerts.telegram_gate import send_for_approval, wait_for_approval
 from engine.state.project_state import (
     create_project_state,
@@ -15,42 +19,6 @@ from engine.state.project_state import (
     update_project_state,
 )
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-LOCK_FILE = os.path.join(BASE_DIR, "runtime.lock")
-
-
-# ==============================
-# Smart Runtime Lock
-# ==============================
-
-def is_process_alive(pid: int) -> bool:
-    try:
-        os.kill(pid, 0)
-        return True
-    except OSError:
-        return False
-
-
-def acquire_lock():
-    if os.path.exists(LOCK_FILE):
-        with open(LOCK_FILE, "r") as f:
-            old_pid = int(f.read().strip())
-
-        if is_process_alive(old_pid):
-            print(f"⛔ Dispatcher already running (PID {old_pid})")
-            sys.exit(1)
-        else:
-            print("⚠ Stale lock detected. Cleaning...")
-            os.remove(LOCK_FILE)
-
-    with open(LOCK_FILE, "w") as f:
-        f.write(str(os.getpid()))
-
-
-def release_lock():
-    if os.path.exists(LOCK_FILE):
-        os.remove(LOCK_FILE)
-
 
 # ==============================
 # Project ID
@@ -98,14 +66,18 @@ def main():
     parser.add_argument("--project", type=str, help="Existing PROJECT_ID")
     args = parser.parse_args()
 
-    acquire_lock()
+    project_id = args.project or generate_project_id()
+
+    lock = lock_manager_v1.acquire(project_id, "engine.dispatcher")
+    if lock is None:
+        print(f"⛔ Dispatcher already running for {project_id} "
+              f"({lock_manager_v1.describe(lock_manager_v1.holder(project_id))})")
+        sys.exit(1)
 
     try:
         if args.project:
-            project_id = args.project
             print(f"FlowMind Dispatcher started for existing project {project_id}")
         else:
-            project_id = generate_project_id()
             print(f"FlowMind Dispatcher started for new project {project_id}")
 
         # ------------------------------
@@ -157,7 +129,7 @@ def main():
         run_production(project_id)
 
     finally:
-        release_lock()
+        lock.release()
 
 
 if __name__ == "__main__":
@@ -5,7 +5,9 @@ FlowMind Cashflow — Dispatcher v1 (deterministic, file-based)
 Rules:
 - Single source of truth: out/<PROJECT_ID>/PROJECT_STATE.json
 - Full file writes only (whole JSON each time)
-- State transitions logged in out/<PROJECT_ID>/state_history.log
+- State transitions journaled in out/<PROJECT_ID>/PHASE_JOURNAL.bin (engine.phase_journal_v1);
+  a record keeps the new status ("to"), the previous one is the record before it.
+  A legacy state_history.log is converted once and kept as state_history.log.migrated
 - No subprocess orchestration; direct Python calls
 - .env auto-load from repo root
 """
@@ -21,6 +23,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from engine import phase_journal_v1, state_store_v1
+
 
 # -----------------------
 # ENV AUTO-LOAD (repo/.env)
@@ -65,6 +69,10 @@ def state_path(project_id: str) -> Path:
 
 
 def history_path(project_id: str) -> Path:
+    return project_dir(project_id) / phase_journal_v1.JOURNAL_FILE
+
+
+def legacy_history_path(project_id: str) -> Path:
     return project_dir(project_id) / "state_history.log"
 
 
@@ -73,23 +81,32 @@ def final_video_path(project_id: str) -> Path:
 
 
 def write_json_full(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-    tmp.replace(path)
+    # versioned, locked, fsync'd whole-file write (engine.state_store_v1)
+    state_store_v1.save_json(path, data)
+
+
+def _migrate_history_log(project_id: str) -> None:
+    # legacy JSONL log -> phase journal (once); the log is kept next to it as *.migrated
+    legacy = legacy_history_path(project_id)
+    if not legacy.exists():
+        return
+    if not history_path(project_id).exists():
+        entries = []
+        for line in legacy.read_text(encoding="utf-8", errors="replace").splitlines():
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(rec, dict) and rec.get("to"):
+                entries.append({"at": rec.get("timestamp"), "phase": rec["to"], "reason": rec.get("reason")})
+        phase_journal_v1.append_to(history_path(project_id), entries)
+    legacy.replace(legacy.with_name(legacy.name + ".migrated"))
 
 
 def append_history(project_id: str, frm: str, to: str, reason: str) -> None:
-    hp = history_path(project_id)
-    hp.parent.mkdir(parents=True, exist_ok=True)
-    rec = {
-        "timestamp": utc_now_iso(),
-        "from": frm,
-        "to": to,
-        "reason": reason,
-    }
-    with open(hp, "a", encoding="utf-8") as f:
-        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    # "from" is the previous record's phase; reason is truncated to the record field
+    _migrate_history_log(project_id)
+    phase_journal_v1.append_to(history_path(project_id), [{"at": utc_now_iso(), "phase": to, "reason": reason}])
 
 
 # -----------------------
@@ -118,7 +135,7 @@ class ProjectState:
 def ensure_state(project_id: str) -> ProjectState:
     sp = state_path(project_id)
     if sp.exists():
-        data = json.loads(sp.read_text(encoding="utf-8"))
+        data = state_store_v1.read_json(sp)
         return ProjectState(
             project_id=data["project_id"],
             status=data.get("status", "CREATED"),
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Encode Profiles v1 (libx264 presets for every render station)
+
+Profiles:
+- draft     ultrafast, crf 28, no lookahead   (previews, Telegram approval gate)
+- standard  medium,    crf 23, lookahead 40   (= libx264 defaults, previous behaviour)
+- final     slow,      crf 18, lookahead 60   (upload master)
+
+Resolution order for a project:
+  1) env FLOWMIND_ENCODE_PROFILE
+  2) PROJECT_STATE.json "encode_profile"
+  3) PROJECT_STATE.json "mode" via MODE_PROFILES (DRAFT/PREVIEW -> draft, FINAL -> final)
+  4) default ("standard" unless the caller says otherwise)
+
+Threads: FLOWMIND_ENCODE_THREADS, else the caller's value, else 0 (x264 auto).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "draft": {"preset": "ultrafast", "crf": 28, "rc_lookahead": 0},
+    "standard": {"preset": "medium", "crf": 23, "rc_lookahead": 40},
+    "final": {"preset": "slow", "crf": 18, "rc_lookahead": 60},
+}
+DEFAULT_PROFILE = "standard"
+
+# PROJECT_STATE "mode" values that imply a render profile (LONG/SHORT/NORMAL are formats -> default)
+MODE_PROFILES: Dict[str, str] = {
+    "DRAFT": "draft",
+    "PREVIEW": "draft",
+    "FINAL": "final",
+}
+
+
+def _normalize(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    name = str(name).strip().lower()
+    return name if name in PROFILES else None
+
+
+def resolve(state: Optional[Dict[str, Any]] = None, default: str = DEFAULT_PROFILE) -> str:
+    env = _normalize(os.getenv("FLOWMIND_ENCODE_PROFILE"))
+    if env:
+        return env
+    state = state or {}
+    explicit = _normalize(state.get("encode_profile"))
+    if explicit:
+        return explicit
+    by_mode = MODE_PROFILES.get(str(state.get("mode") or "").strip().upper())
+    if by_mode:
+        return by_mode
+    return _normalize(default) or DEFAULT_PROFILE
+
+
+def for_project(project_id: str, default: str = DEFAULT_PROFILE) -> str:
+    from engine import state_store_v1
+
+    return resolve(state_store_v1.peek(state_store_v1.state_path(project_id)), default=default)
+
+
+def _threads(threads: Optional[int]) -> int:
+    env = os.getenv("FLOWMIND_ENCODE_THREADS", "").strip()
+    if env.isdigit():
+        return int(env)
+    return 0 if threads is None else max(0, int(threads))
+
+
+def video_args(profile: str, threads: Optional[int] = None) -> List[str]:
+    """ffmpeg output args for the video encoder (codec, preset, crf, lookahead, threads)."""
+    p = PROFILES[_normalize(profile) or DEFAULT_PROFILE]
+    return [
+        "-c:v", "libx264",
+        "-preset", p["preset"],
+        "-crf", str(p["crf"]),
+        "-rc-lookahead", str(p["rc_lookahead"]),
+        "-threads", str(_threads(threads)),
+    ]
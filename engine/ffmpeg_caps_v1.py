@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — FFmpeg Caps v1 (capability registry, probed once per binary)
+
+One record per ffmpeg binary:
+  version, filters, encoders, hwaccels
+probed with 4 spawns the first time and then reused:
+- in memory (per process)
+- on disk: assets/cache/_shared/ffmpeg_caps.json, keyed by the binary's
+  realpath; valid while its size + mtime_ns are unchanged (upgrade -> re-probe)
+- wrappers: a "#!" script on PATH (pyenv/conda shims, /usr/local/bin wrappers)
+  does not change when the ffmpeg behind it is upgraded, so its record is
+  keyed on a hash of `-version` output instead (one spawn per process)
+- --refresh re-probes unconditionally
+
+Presence checks (available / require) are PATH lookups, no spawn at all.
+
+Disable persistence with FLOWMIND_FFMPEG_CAPS_CACHE=0 (probes once per process).
+
+Usage:
+  python -m engine.ffmpeg_caps_v1 [--refresh]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+CACHE_FILE = Path("assets") / "cache" / "_shared" / "ffmpeg_caps.json"
+
+_MEMO: Dict[str, Dict[str, Any]] = {}
+_MEMO_LOCK = threading.Lock()
+
+
+def persist_enabled() -> bool:
+    return os.getenv("FLOWMIND_FFMPEG_CAPS_CACHE", "1").strip() not in ("0", "false", "no", "off")
+
+
+def which(tool: str) -> Optional[str]:
+    found = shutil.which(tool)
+    return os.path.realpath(found) if found else None
+
+
+def available(*tools: str) -> bool:
+    """ffmpeg + ffprobe (or the given tools) on PATH. No process spawn."""
+    return all(which(t) for t in (tools or ("ffmpeg", "ffprobe")))
+
+
+def _run(cmd: List[str]) -> str:
+    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed rc={p.returncode}\n{p.stdout}")
+    return p.stdout
+
+
+def _parse_filters(out: str) -> List[str]:
+    # " TSC name            V->V       description"
+    names = []
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) >= 3 and "->" in parts[2]:
+            names.append(parts[1])
+    return sorted(names)
+
+
+def _parse_encoders(out: str) -> List[str]:
+    # header legend, then "------", then " V....D name   description"
+    names = []
+    body = out.split("------", 1)[-1]
+    for line in body.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 6:
+            names.append(parts[1])
+    return sorted(names)
+
+
+def _parse_hwaccels(out: str) -> List[str]:
+    lines = [ln.strip() for ln in out.splitlines() if ln.strip()]
+    return [ln for ln in lines if not ln.endswith(":")]
+
+
+def _is_wrapper(real: str) -> bool:
+    try:
+        with open(real, "rb") as f:
+            return f.read(2) == b"#!"
+    except OSError:
+        return False
+
+
+def _signature(real: str) -> Dict[str, Any]:
+    if _is_wrapper(real):
+        out = _run([real, "-hide_banner", "-version"])
+        return {"wrapper": True, "version_sha": hashlib.sha256(out.encode("utf-8")).hexdigest()[:16]}
+    st = os.stat(real)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _same(record: Dict[str, Any], sig: Dict[str, Any]) -> bool:
+    return {k: record.get(k) for k in sig} == sig
+
+
+def _probe(binary: str) -> Dict[str, Any]:
+    version = _run([binary, "-hide_banner", "-version"]).splitlines()
+    return {
+        "version": version[0] if version else "",
+        "filters": _parse_filters(_run([binary, "-hide_banner", "-filters"])),
+        "encoders": _parse_encoders(_run([binary, "-hide_banner", "-encoders"])),
+        "hwaccels": _parse_hwaccels(_run([binary, "-hide_banner", "-hwaccels"])),
+    }
+
+
+def _load_all() -> Dict[str, Any]:
+    try:
+        data = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _store(real: str, record: Dict[str, Any]) -> None:
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        data = _load_all()
+        data[real] = record
+        tmp_fd, tmp_path = tempfile.mkstemp(prefix=CACHE_FILE.name + ".", suffix=".tmp", dir=str(CACHE_FILE.parent))
+        try:
+            with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+            os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+            os.replace(tmp_path, CACHE_FILE)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except OSError:
+        pass  # cache is an optimisation; a read-only tree still probes correctly
+
+
+def caps(binary: str = "ffmpeg", refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """Capability record for a binary (name on PATH or path), None if it is not installed."""
+    real = which(binary)
+    if real is None:
+        return None
+
+    with _MEMO_LOCK:
+        hit = _MEMO.get(real)
+        # a wrapper's memo is trusted for the process lifetime (no -version spawn per call)
+        if hit is not None and not refresh and (hit.get("wrapper") or _same(hit, _signature(real))):
+            return hit
+
+        sig = _signature(real)
+        record = None
+        if persist_enabled() and not refresh:
+            rec = _load_all().get(real)
+            if isinstance(rec, dict) and _same(rec, sig):
+                record = rec
+        if record is None:
+            record = {"path": real, **sig, **_probe(real)}
+            if persist_enabled():
+                _store(real, record)
+        _MEMO[real] = record
+        return record
+
+
+def has_filter(name: str, binary: str = "ffmpeg") -> bool:
+    c = caps(binary)
+    return bool(c) and name in c["filters"]
+
+
+def has_encoder(name: str, binary: str = "ffmpeg") -> bool:
+    c = caps(binary)
+    return bool(c) and name in c["encoders"]
+
+
+def hwaccels(binary: str = "ffmpeg") -> List[str]:
+    c = caps(binary)
+    return list(c["hwaccels"]) if c else []
+
+
+def version(binary: str = "ffmpeg") -> str:
+    c = caps(binary)
+    return c["version"] if c else ""
+
+
+def require(tools: Iterable[str] = ("ffmpeg", "ffprobe"), encoders: Iterable[str] = ()) -> None:
+    """Preflight: raises RuntimeError naming the first missing tool / encoder."""
+    for tool in tools:
+        if which(tool) is None:
+            raise RuntimeError(f"{tool} not found in PATH")
+    for enc in encoders:
+        if not has_encoder(enc):
+            raise RuntimeError(f"ffmpeg encoder not available: {enc}")
+
+
+def main(argv: List[str]) -> int:
+    c = caps("ffmpeg", refresh="--refresh" in argv)
+    if c is None:
+        print("[FFMPEG_CAPS FAIL] ffmpeg not found in PATH", file=sys.stderr)
+        return 2
+    print(f"[FFMPEG_CAPS] {c['version']}")
+    print(f"[FFMPEG_CAPS] path={c['path']} filters={len(c['filters'])} encoders={len(c['encoders'])} "
+          f"hwaccels={','.join(c['hwaccels']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -7,6 +7,20 @@ Goal:
 - Concatenate them into out/<PROJECT_ID>/final.mp4 with silent audio
 - No drawtext dependency (macOS builds may lack drawtext filter)
 - Concat list uses absolute paths (ffmpeg resolves relative paths to concat_list location)
+- Per-scene clips render concurrently (worker pool); concat order = timeline order
+- Concat fast path: when every clip matches the plan spec (h264/yuv420p/WxH/fps, probed
+  on the same pool through engine.probe_cache_v1) video is stream-copied and only the
+  silent audio is encoded.
+  Any mismatch (or --reencode) falls back to the scale/pad/libx264 re-encode.
+- Build cache: when ASSEMBLY_PLAN.json + ffmpeg argv match the last run and outputs
+  are untouched, outputs are reused (engine.build_cache_v1)
+- final.mp4 + ffprobe.json are staged and committed together (engine.station_txn_v1)
+
+Concurrency:
+- --jobs N | FLOWMIND_RENDER_JOBS   (default: cpu_count // clip threads)
+- FLOWMIND_FFMPEG_THREADS           (libx264 threads per clip, default 2)
+
+Encoder: engine.encode_profiles_v1 profile of the project (draft/standard/final).
 
 Outputs:
 - out/<PROJECT_ID>/concat_list.txt
@@ -20,9 +34,14 @@ import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
+
+from engine import build_cache_v1, encode_profiles_v1, ffmpeg_caps_v1, probe_cache_v1, station_txn_v1
+
+DEFAULT_CLIP_THREADS = 2
 
 
 def utc_now_iso() -> str:
@@ -64,41 +83,112 @@ def resolve_project_id_or_path(arg: str) -> Path:
 
 
 def ffmpeg_exists() -> bool:
-    from shutil import which
-    return which("ffmpeg") is not None and which("ffprobe") is not None
+    return ffmpeg_caps_v1.available("ffmpeg", "ffprobe")
 
 
-def make_dummy_clip(out_path: Path, duration_sec: float, width: int, height: int, fps: int) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+def clip_threads() -> int:
+    try:
+        return max(1, int(os.getenv("FLOWMIND_FFMPEG_THREADS", DEFAULT_CLIP_THREADS)))
+    except ValueError:
+        return DEFAULT_CLIP_THREADS
 
+
+def default_jobs(threads: int) -> int:
+    env = os.getenv("FLOWMIND_RENDER_JOBS", "").strip()
+    if env.isdigit() and int(env) > 0:
+        return int(env)
+    return max(1, (os.cpu_count() or 1) // max(1, threads))
+
+
+def dummy_clip_cmd(out_path: Path, duration_sec: float, width: int, height: int, fps: int,
+                   threads: int = DEFAULT_CLIP_THREADS,
+                   profile: str = encode_profiles_v1.DEFAULT_PROFILE) -> List[str]:
     # Solid black clip (dummy)
     # IMPORTANT: no drawtext filter — avoids missing drawtext on some mac builds
-    cmd = [
+    return [
         "ffmpeg", "-y",
         "-f", "lavfi",
         "-i", f"color=size={width}x{height}:rate={fps}:color=black",
         "-t", f"{duration_sec:.3f}",
         "-r", str(fps),
         "-vf", "setsar=1",
-        "-c:v", "libx264",
+        *encode_profiles_v1.video_args(profile, threads),
         "-pix_fmt", "yuv420p",
         "-movflags", "+faststart",
         str(out_path),
     ]
-    run(cmd)
 
 
-def ffprobe_json(video_path: Path) -> Dict[str, Any]:
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-print_format", "json",
-        "-show_streams",
-        "-show_format",
-        str(video_path),
-    ]
-    out = subprocess.check_output(cmd)
-    return json.loads(out.decode("utf-8", errors="replace"))
+def make_dummy_clip(out_path: Path, duration_sec: float, width: int, height: int, fps: int,
+                    threads: int = DEFAULT_CLIP_THREADS,
+                    profile: str = encode_profiles_v1.DEFAULT_PROFILE) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # Output captured: clips run in parallel, interleaved ffmpeg logs are unreadable
+    proc = subprocess.run(
+        dummy_clip_cmd(out_path, duration_sec, width, height, fps, threads, profile),
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stdout.strip().splitlines()[-15:])
+        raise RuntimeError(f"ffmpeg rc={proc.returncode} clip={out_path}\n{tail}")
+
+
+def render_clips(clips: List[Tuple[Path, float]], width: int, height: int, fps: int,
+                 threads: int, jobs: int,
+                 profile: str = encode_profiles_v1.DEFAULT_PROFILE) -> List[str]:
+    """Render all clips on a worker pool. Returns failure messages in timeline order."""
+    failures: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(clips)))) as pool:
+        futures = [
+            (p, pool.submit(make_dummy_clip, p, dur, width, height, fps, threads, profile))
+            for p, dur in clips
+        ]
+        for p, fut in futures:
+            try:
+                fut.result()
+            except Exception as e:
+                failures.append(f"{p.name}: {e}")
+    return failures
+
+
+def probe_clip_spec(video_path: Path) -> Dict[str, Any]:
+    return probe_cache_v1.stream(probe_cache_v1.probe(video_path), "video")
+
+
+def clip_spec_mismatches(clips: List[Path], width: int, height: int, fps: int,
+                         jobs: int) -> List[str]:
+    """
+    Probe all clips on a worker pool; return why stream copy is unsafe (empty = safe).
+
+    This is the batched probe: ffprobe reads one input per process, and the
+    multi-input alternatives (ffmpeg -i a -i b ..., lavfi movie=) only report
+    decoded streams in log text, without codec_name. One ffprobe per clip in
+    parallel costs about one probe of wall time, and probe_cache_v1 keys each
+    record on path + size + mtime, so an unchanged clip is never probed twice
+    (re-runs and FINAL_QA read the cached record).
+    """
+    expected = {
+        "codec_name": "h264",
+        "width": width,
+        "height": height,
+        "pix_fmt": "yuv420p",
+        "r_frame_rate": f"{fps}/1",
+    }
+    mismatches: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(clips)))) as pool:
+        futures = [(p, pool.submit(probe_clip_spec, p)) for p in clips]
+        for p, fut in futures:
+            try:
+                spec = fut.result()
+            except Exception as e:
+                mismatches.append(f"{p.name}: probe failed ({e})")
+                continue
+            for key, want in expected.items():
+                if spec.get(key) != want:
+                    mismatches.append(f"{p.name}: {key}={spec.get(key)!r} expected {want!r}")
+            if spec.get("sample_aspect_ratio", "1:1") not in ("1:1", "0:1", "N/A"):
+                mismatches.append(f"{p.name}: sample_aspect_ratio={spec.get('sample_aspect_ratio')!r}")
+    return mismatches
 
 
 def main(argv: List[str]) -> int:
@@ -106,12 +196,26 @@ def main(argv: List[str]) -> int:
         print("[RENDER_DUMMY FAIL] ffmpeg/ffprobe not found in PATH", file=sys.stderr)
         return 2
 
-    if len(argv) < 2:
-        print("Usage: python -m engine.ffmpeg_dummy_renderer_v1 <PROJECT_ID|PROJECT_PATH>", file=sys.stderr)
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    force_reencode = "--reencode" in argv
+    threads = clip_threads()
+    jobs = default_jobs(threads)
+    if "--jobs" in argv:
+        i = argv.index("--jobs")
+        try:
+            jobs = max(1, int(argv[i + 1]))
+        except (IndexError, ValueError):
+            print("[RENDER_DUMMY FAIL] --jobs requires an integer", file=sys.stderr)
+            return 2
+        args = [a for a in args if a != argv[i + 1]]
+
+    if len(args) < 1:
+        print("Usage: python -m engine.ffmpeg_dummy_renderer_v1 <PROJECT_ID|PROJECT_PATH> [--jobs N] [--reencode]", file=sys.stderr)
         return 2
 
-    project_dir = resolve_project_id_or_path(argv[1])
+    project_dir = resolve_project_id_or_path(args[0])
     project_id = project_dir.name
+    profile = encode_profiles_v1.for_project(project_id)
 
     assembly_plan_path = project_dir / "ASSEMBLY_PLAN.json"
     if not assembly_plan_path.exists():
@@ -132,27 +236,20 @@ def main(argv: List[str]) -> int:
     out_dir = (project_root() / "out" / project_id).resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Build dummy per-scene clips at the exact placeholder paths from ASSEMBLY_PLAN
-    abs_video_paths: List[Path] = []
+    # Dummy per-scene clips at the exact placeholder paths from ASSEMBLY_PLAN
+    clips: List[Tuple[Path, float]] = []
     for item in timeline:
         vid_rel = item.get("video_path")
         dur = float(item.get("duration_sec", 0))
         if not vid_rel or dur <= 0:
             continue
-        vid_abs = (project_root() / vid_rel).resolve()
-        make_dummy_clip(vid_abs, dur, width, height, fps)
-        abs_video_paths.append(vid_abs)
+        clips.append(((project_root() / vid_rel).resolve(), dur))
 
-    if not abs_video_paths:
+    if not clips:
         print("[RENDER_DUMMY FAIL] No valid video clips generated from timeline", file=sys.stderr)
         return 2
-
-    # Write concat list with ABSOLUTE paths (critical fix)
+    abs_video_paths: List[Path] = [p for p, _ in clips]
     concat_list_path = out_dir / "concat_list.txt"
-    with concat_list_path.open("w", encoding="utf-8") as f:
-        for p in abs_video_paths:
-            # ffmpeg concat demuxer requires: file '<path>'
-            f.write(f"file '{str(p)}'\n")
 
     total_duration = float(plan.get("total_duration_sec", 0) or 0)
     if total_duration <= 0:
@@ -161,7 +258,25 @@ def main(argv: List[str]) -> int:
 
     final_path = out_dir / "final.mp4"
 
-    # Concatenate video + add silent audio (48k stereo), enforce canonical output constraints
+    # Fast path: clips already match the canonical spec -> copy video, encode audio only
+    cmd_concat_copy = [
+        "ffmpeg", "-y",
+        "-f", "concat", "-safe", "0",
+        "-i", str(concat_list_path),
+        "-f", "lavfi",
+        "-i", "anullsrc=r=48000:cl=stereo",
+        "-t", f"{total_duration:.3f}",
+        "-map", "0:v:0",
+        "-map", "1:a:0",
+        "-c:v", "copy",
+        "-c:a", "aac",
+        "-ar", "48000",
+        "-ac", "2",
+        "-movflags", "+faststart",
+        str(final_path),
+    ]
+
+    # Fallback: concatenate video + add silent audio (48k stereo), enforce canonical output constraints
     cmd_concat = [
         "ffmpeg", "-y",
         "-f", "concat", "-safe", "0",
@@ -174,7 +289,7 @@ def main(argv: List[str]) -> int:
         "-r", str(fps),
         "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1",
-        "-c:v", "libx264",
+        *encode_profiles_v1.video_args(profile),
         "-pix_fmt", "yuv420p",
         "-c:a", "aac",
         "-ar", "48000",
@@ -182,17 +297,63 @@ def main(argv: List[str]) -> int:
         "-movflags", "+faststart",
         str(final_path),
     ]
-    run(cmd_concat)
 
-    probe = ffprobe_json(final_path)
     probe_out = out_dir / "ffprobe.json"
-    write_json(probe_out, {
-        "project_id": project_id,
-        "generated_at": utc_now_iso(),
-        "final_video": str(final_path),
-        "ffprobe": probe,
-    })
+    clip_cmds = [dummy_clip_cmd(p, dur, width, height, fps, threads, profile) for p, dur in clips]
+    fp = build_cache_v1.fingerprint("RENDER_DUMMY", [assembly_plan_path], clip_cmds + [cmd_concat_copy, cmd_concat, force_reencode])
+    cache_outputs = abs_video_paths + [concat_list_path, final_path, probe_out]
+    if build_cache_v1.lookup(project_dir, "RENDER_DUMMY", fp):
+        print(f"[RENDER_DUMMY PASS] cache hit fingerprint={fp[:12]} final={final_path}")
+        return 0
+
+    failures = render_clips(clips, width, height, fps, threads, jobs, profile)
+    if failures:
+        print(f"[RENDER_DUMMY FAIL] {len(failures)}/{len(clips)} clip(s) failed:", file=sys.stderr)
+        for msg in failures:
+            print(" - " + msg, file=sys.stderr)
+        return 2
+
+    # Write concat list with ABSOLUTE paths (critical fix)
+    with concat_list_path.open("w", encoding="utf-8") as f:
+        for p in abs_video_paths:
+            # ffmpeg concat demuxer requires: file '<path>'
+            f.write(f"file '{str(p)}'\n")
 
+    if force_reencode:
+        concat_mode = "reencode"
+        print("[RENDER_DUMMY] concat=reencode (--reencode)")
+    else:
+        mismatches = clip_spec_mismatches(abs_video_paths, width, height, fps, jobs)
+        concat_mode = "copy" if not mismatches else "reencode"
+        for msg in mismatches[:5]:
+            print(f"[RENDER_DUMMY] stream copy unsafe: {msg}")
+
+    with station_txn_v1.transaction(project_id, "RENDER_DUMMY") as txn:
+        staged_final = txn.stage(final_path)
+        if concat_mode == "copy":
+            try:
+                run(txn.staged_cmd(cmd_concat_copy))
+            except subprocess.CalledProcessError as e:
+                print(f"[RENDER_DUMMY] stream copy concat failed rc={e.returncode}; falling back to re-encode")
+                concat_mode = "reencode"
+        if concat_mode == "reencode":
+            run(txn.staged_cmd(cmd_concat))
+
+        probe = probe_cache_v1.probe_file(staged_final)
+        probe.setdefault("format", {})["filename"] = str(final_path)
+        write_json(txn.stage(probe_out), {
+            "project_id": project_id,
+            "generated_at": utc_now_iso(),
+            "final_video": str(final_path),
+            "concat_mode": concat_mode,
+            "ffprobe": probe,
+        })
+        txn.commit()  # final.mp4 + ffprobe.json published together
+    probe_cache_v1.remember(final_path, probe)
+    build_cache_v1.store(project_dir, "RENDER_DUMMY", fp, cache_outputs)
+
+    print(f"[RENDER_DUMMY PASS] clips={len(clips)} jobs={jobs} threads={threads} "
+          f"profile={profile} concat={concat_mode}")
     print(f"[RENDER_DUMMY PASS] final={final_path} ffprobe={probe_out} concat_list={concat_list_path}")
     return 0
 
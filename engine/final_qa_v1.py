@@ -3,9 +3,9 @@
 """
 FlowMind Cashflow — FINAL QA v1 (strict, minimal)
 Validates out/<PROJECT_ID>/final.mp4 against core invariants:
-- exists, size >= min_bytes
+- exists, size >= min_bytes (per render tier)
 - duration ~= expected (from AUDIO_RENDER master_wav)
-- video: 1920x1080, 30 fps (or very close), h264, yuv420p
+- video: tier frame (preview 640x360 / full 1920x1080), 30 fps (or very close), h264, yuv420p
 - audio: aac, 48kHz, 2ch
 Writes: projects/<PROJECT_ID>/FINAL_QA.json
 
@@ -16,28 +16,21 @@ Usage:
 from __future__ import annotations
 
 import json
-import subprocess
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict
+
+from engine import probe_cache_v1, render_tiers_v1, wav_io_v1
 
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def _run(cmd: list[str]) -> Tuple[int, str]:
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-    return p.returncode, p.stdout
-
-
 def _ffprobe_json(path: Path) -> Dict[str, Any]:
-    cmd = ["ffprobe", "-v", "error", "-show_streams", "-show_format", "-of", "json", str(path)]
-    rc, out = _run(cmd)
-    if rc != 0:
-        raise RuntimeError(f"ffprobe failed rc={rc}\n{out}")
-    return json.loads(out)
+    # Shared cache: final.mp4 was usually probed by the assembly station already
+    return probe_cache_v1.probe(path)
 
 
 def _read_json(path: Path) -> Dict[str, Any]:
@@ -45,15 +38,12 @@ def _read_json(path: Path) -> Dict[str, Any]:
 
 
 def _probe_duration_sec(media: Path) -> float:
-    d = _ffprobe_json(media)
-    return float(d["format"]["duration"])
+    # WAV header for the PCM master; ffprobe cache for anything else
+    return wav_io_v1.duration_sec(media)
 
 
 def _get_stream(d: Dict[str, Any], codec_type: str) -> Dict[str, Any]:
-    for s in d.get("streams", []):
-        if s.get("codec_type") == codec_type:
-            return s
-    return {}
+    return probe_cache_v1.stream(d, codec_type)
 
 
 def _approx(a: float, b: float, tol: float) -> bool:
@@ -70,12 +60,14 @@ def main(argv: list[str]) -> int:
     out_dir = (Path("out") / project_id).resolve()
     final_mp4 = out_dir / "final.mp4"
 
-    # thresholds (cashflow minimal)
-    min_bytes = 2_000_000  # 2MB – kills "dead" files like 169KB
+    # thresholds (cashflow minimal); frame + size floor follow the tier final.mp4 was rendered at
+    tier = render_tiers_v1.rendered_tier(project_id)
+    tier_spec = render_tiers_v1.spec(tier)
+    min_bytes = tier_spec["min_bytes"]  # full: 2MB – kills "dead" files like 169KB
     dur_tol = 0.25         # seconds
     fps_tol = 0.5          # fps
-    expected_w = 1920
-    expected_h = 1080
+    expected_w = tier_spec["width"]
+    expected_h = tier_spec["height"]
     expected_sr = 48000
     expected_ch = 2
 
@@ -83,6 +75,7 @@ def main(argv: list[str]) -> int:
         "project_id": project_id,
         "generated_at": _utc_now_iso(),
         "inputs": {"final_mp4": str(final_mp4)},
+        "render_tier": tier,
         "checks": [],
         "pass": False,
     }
@@ -167,7 +160,7 @@ def main(argv: list[str]) -> int:
         print("[FAIL] FINAL_QA failed. See projects/<PROJECT>/FINAL_QA.json", file=sys.stderr)
         return 10
 
-    print(f"[FINAL_QA PASS] final={final_mp4}")
+    print(f"[FINAL_QA PASS] final={final_mp4} tier={tier}")
     return 0
 
 
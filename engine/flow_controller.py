@@ -6,6 +6,7 @@ from typing import List, Dict
 
 from openai import OpenAI
 
+from engine import render_tiers_v1, thumbnail_engine_v1
 from engine.alerts.telegram_gate import (
     send_topic_options,
     wait_for_topic_choice,
@@ -92,21 +93,24 @@ def generate_topics() -> List[Dict]:
     return cleaned
 
 
-def _make_dummy_video(final_path: Path, seconds: int = 8):
+def _make_dummy_video(final_path: Path, seconds: int = 8, tier: str = render_tiers_v1.PREVIEW):
     """
-    Creates a small preview mp4 as a placeholder for the pipeline output.
+    Creates a placeholder mp4 for the pipeline output at a render tier
+    (preview 640x360 for the approval gate, full 1920x1080 after APPROVE).
     If you already have a real assembler later, swap this function only.
     """
     # Use a simple color + text. Keep it deterministic.
+    spec = render_tiers_v1.spec(tier)
     cmd = [
         FFMPEG,
         "-y",
         "-f", "lavfi",
-        "-i", f"color=c=black:s=1280x720:d={seconds}",
+        "-i", f"color=c=black:s={spec['width']}x{spec['height']}:d={seconds}",
         "-vf", "drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf:"
-               "text='FLOWMIND CASHFLOW PREVIEW':fontcolor=white:fontsize=48:x=(w-text_w)/2:y=(h-text_h)/2",
+               "text='FLOWMIND CASHFLOW PREVIEW':fontcolor=white:fontsize=h/15:x=(w-text_w)/2:y=(h-text_h)/2",
         "-r", "30",
-        "-c:v", "libx264",
+        # preview: draft profile + bitrate cap; full: FLOWMIND_ENCODE_PROFILE / standard
+        *render_tiers_v1.video_args(tier, render_tiers_v1.profile_for(tier)),
         "-pix_fmt", "yuv420p",
         "-movflags", "+faststart",
         str(final_path),
@@ -114,47 +118,28 @@ def _make_dummy_video(final_path: Path, seconds: int = 8):
     subprocess.run(cmd, check=True)
 
 
-def _make_thumbnail(path: Path, line1: str, line2: str):
+def _make_thumbnails(items: List[tuple]):
     """
-    Generates a clickbait-style thumbnail candidate (jpg).
+    Generates clickbait-style thumbnail candidates (jpg): [(path, line1, line2), ...].
+    One batch (Pillow, else a single ffmpeg run), cached by text + layout.
     """
     # Two lines, big type, high contrast, deterministic layout.
     # Keep text short to avoid Telegram truncation.
-    safe1 = line1.replace(":", "").replace("'", "")
-    safe2 = line2.replace(":", "").replace("'", "")
-
-    vf = (
-        "scale=1280:720,"
-        "drawbox=x=0:y=0:w=iw:h=ih:color=black@1:t=fill,"
-        "drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf:"
-        f"text='{safe1}':fontcolor=white:fontsize=78:x=(w-text_w)/2:y=200,"
-        "drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf:"
-        f"text='{safe2}':fontcolor=white:fontsize=64:x=(w-text_w)/2:y=330"
-    )
-
-    cmd = [
-        FFMPEG,
-        "-y",
-        "-f", "lavfi",
-        "-i", "color=c=black:s=1280x720:d=1",
-        "-vf", vf,
-        "-frames:v", "1",
-        str(path),
-    ]
-    subprocess.run(cmd, check=True)
+    res = thumbnail_engine_v1.render_batch(items)
+    print(f"🖼  thumbnails: {res['rendered']} rendered, {res['hits']} cached ({res['renderer']})")
 
 
 def produce_assets(project_id: str, topic_title: str) -> Dict:
     """
     Production stage:
-    - Generates final.mp4
+    - Generates preview.mp4 (preview tier; final.mp4 is rendered only after APPROVE)
     - Generates 3 thumbnail candidates
     """
     pdir = _ensure_dirs(project_id)
-    video_path = pdir / "final.mp4"
+    video_path = pdir / "preview.mp4"
 
     # Minimal “production” for now
-    _make_dummy_video(video_path, seconds=8)
+    _make_dummy_video(video_path, seconds=8, tier=render_tiers_v1.PREVIEW)
 
     # 3 clickbait-ish angles (text-only templates for now)
     # Later we can swap to Cloudinary/Remotion/real image generation.
@@ -169,9 +154,11 @@ def produce_assets(project_id: str, topic_title: str) -> Dict:
             num = token
             break
 
-    _make_thumbnail(t1, f"STOP LOSING {num}", "ONE HIDDEN TRICK")
-    _make_thumbnail(t2, f"{num} GONE?", "YOU DID THIS DAILY")
-    _make_thumbnail(t3, f"THE {num} TRAP", "NOBODY WARNED YOU")
+    _make_thumbnails([
+        (t1, f"STOP LOSING {num}", "ONE HIDDEN TRICK"),
+        (t2, f"{num} GONE?", "YOU DID THIS DAILY"),
+        (t3, f"THE {num} TRAP", "NOBODY WARNED YOU"),
+    ])
 
     return {
         "project_id": project_id,
@@ -218,8 +205,9 @@ def main():
 
         if action == "APPROVE":
             print("\n🚀 FINAL APPROVAL RECEIVED — STARTING PRODUCTION...\n")
-            # Here we already created the assets; in real pipeline we'd lock + finalize.
-            print(f"✅ Production Completed.")
+            final_path = _ensure_dirs(project_id) / "final.mp4"
+            _make_dummy_video(final_path, seconds=8, tier=render_tiers_v1.FULL)
+            print(f"✅ Production Completed: {final_path}")
             return
 
         if action == "REGEN_THUMBS":
@@ -229,9 +217,11 @@ def main():
             t1 = pdir / "thumb_A.jpg"
             t2 = pdir / "thumb_B.jpg"
             t3 = pdir / "thumb_C.jpg"
-            _make_thumbnail(t1, "INVISIBLE FEES", "STEAL YOUR MONEY")
-            _make_thumbnail(t2, "SUBSCRIPTION TRAP", "YOU FORGOT THIS")
-            _make_thumbnail(t3, "INSURANCE HACK", "SAVES THOUSANDS")
+            _make_thumbnails([
+                (t1, "INVISIBLE FEES", "STEAL YOUR MONEY"),
+                (t2, "SUBSCRIPTION TRAP", "YOU FORGOT THIS"),
+                (t3, "INSURANCE HACK", "SAVES THOUSANDS"),
+            ])
 
             approval_msg_id = send_final_package(
                 project_id=project_id,
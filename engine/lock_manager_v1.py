@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Lock Manager v1 (per-project orchestrator lock)
+
+One lock per project: projects/<ID>/.orch.lock, shared by every entry point
+that changes a project: fm.py, engine/dispatcher.py, dispatcher/engine.py,
+dispatcher/pipeline_v1.py, the dispatcher bridges, tools/autopilot_* and the
+tools/step_* runners.
+
+- exclusion  fcntl.flock(LOCK_EX | LOCK_NB) on the lock file, held for the
+             lifetime of the lock; the kernel drops it when the holder dies,
+             so a crashed orchestrator never blocks the project
+- holder     the file carries {"pid", "host", "owner", "acquired_at",
+             "heartbeat_at"}; a background thread refreshes heartbeat_at
+             every FLOWMIND_LOCK_HEARTBEAT_SEC (default 15)
+- stale      a file whose flock is free is reclaimed (crash, legacy "LOCKED"
+             marker); a holder on another host (shared projects/ where flock
+             is not authoritative) is only reclaimed once its heartbeat is
+             older than FLOWMIND_LOCK_STALE_SEC (default 120)
+- reentrant  a process that holds a project's lock acquires it again for
+             free (batch worker -> pipeline stage -> step runner main())
+- release    unlink while still holding the flock; a waiter that opened the
+             old inode notices the swap and retries on the new file
+
+Projects are independent: many projects progress in parallel, one writer
+per project.
+
+Usage:
+  python -m engine.lock_manager_v1 <PROJECT_ID>       (show holder)
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+LOCK_FILE = ".orch.lock"
+LOCKED_RC = 75  # EX_TEMPFAIL: project busy, retry later
+
+DEFAULT_HEARTBEAT_SEC = 15.0
+DEFAULT_STALE_SEC = 120.0
+
+_HELD: Dict[str, "ProjectLock"] = {}
+_HELD_LOCK = threading.Lock()
+_BEAT: Optional[threading.Thread] = None
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _env_sec(name: str, default: float) -> float:
+    try:
+        return max(1.0, float(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def heartbeat_sec() -> float:
+    return _env_sec("FLOWMIND_LOCK_HEARTBEAT_SEC", DEFAULT_HEARTBEAT_SEC)
+
+
+def stale_sec() -> float:
+    return _env_sec("FLOWMIND_LOCK_STALE_SEC", DEFAULT_STALE_SEC)
+
+
+def lock_path(project_id: str) -> Path:
+    return Path("projects") / project_id / LOCK_FILE
+
+
+def _read_holder(fd: int) -> Optional[Dict[str, Any]]:
+    raw = os.pread(fd, 4096, 0)
+    if not raw.strip():
+        return None
+    try:
+        info = json.loads(raw.decode("utf-8"))
+    except ValueError:
+        return {"legacy": raw.decode("utf-8", errors="replace").strip()[:40]}
+    return info if isinstance(info, dict) else None
+
+
+def _age_sec(info: Dict[str, Any]) -> Optional[float]:
+    try:
+        beat = datetime.fromisoformat(str(info["heartbeat_at"]).replace("Z", "+00:00"))
+    except (KeyError, ValueError):
+        return None
+    return (_utc_now() - beat).total_seconds()
+
+
+class ProjectLock:
+    """Held lock on one project. release() (or hold()'s exit) gives it back."""
+
+    def __init__(self, project_id: str, owner: str, fd: int, path: Path):
+        self.project_id = project_id
+        self.owner = owner
+        self.path = path
+        self._key = os.path.abspath(path)
+        self._fd = fd
+        self._io = threading.Lock()  # heartbeat thread vs release(): never touch a closed fd
+        self._depth = 1
+        self.acquired_at = _iso(_utc_now())
+        self.heartbeat()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "project_id": self.project_id,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "owner": self.owner,
+            "acquired_at": self.acquired_at,
+            "heartbeat_at": _iso(_utc_now()),
+        }
+
+    def heartbeat(self) -> None:
+        data = (json.dumps(self.info(), ensure_ascii=False) + "\n").encode("utf-8")
+        with self._io:
+            if self._fd < 0:
+                return
+            os.ftruncate(self._fd, 0)
+            os.pwrite(self._fd, data, 0)
+
+    def release(self) -> None:
+        with _HELD_LOCK:
+            self._depth -= 1
+            if self._depth > 0:
+                return
+            _HELD.pop(self._key, None)
+        with self._io:
+            try:
+                os.remove(self.path)  # while still flocked: waiters retry on a fresh inode
+            except OSError:
+                pass
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _heartbeat_loop() -> None:
+    while True:
+        time.sleep(heartbeat_sec())
+        with _HELD_LOCK:
+            held = list(_HELD.values())
+        for lock in held:
+            try:
+                lock.heartbeat()
+            except OSError:
+                pass  # released between snapshot and write
+
+
+def _start_heartbeat() -> None:
+    global _BEAT
+    with _HELD_LOCK:
+        if _BEAT is None or not _BEAT.is_alive():
+            _BEAT = threading.Thread(target=_heartbeat_loop, name="fm-lock-heartbeat", daemon=True)
+            _BEAT.start()
+
+
+def acquire(project_id: str, owner: str) -> Optional[ProjectLock]:
+    """Non-blocking. Returns the lock, or None if a live holder has the project."""
+    path = lock_path(project_id)
+    key = os.path.abspath(path)  # tools chdir into throw-away workdirs
+    with _HELD_LOCK:
+        mine = _HELD.get(key)
+        if mine is not None:
+            mine._depth += 1
+            return mine
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        try:
+            same_file = os.fstat(fd).st_ino == os.stat(path).st_ino
+        except FileNotFoundError:
+            same_file = False
+        if not same_file:
+            os.close(fd)  # released (unlinked) while we waited: retry on the new file
+            continue
+        break
+
+    prev = _read_holder(fd)
+    if prev and "pid" in prev and prev.get("host") != socket.gethostname():
+        age = _age_sec(prev)
+        if age is not None and age < stale_sec():
+            os.close(fd)
+            return None
+    if prev:
+        who = prev.get("legacy") or f"pid={prev.get('pid')} host={prev.get('host')} owner={prev.get('owner')}"
+        print(f"[LOCK] {project_id}: reclaimed stale lock ({who})")
+
+    lock = ProjectLock(project_id, owner, fd, path)
+    with _HELD_LOCK:
+        _HELD[key] = lock
+    _start_heartbeat()
+    return lock
+
+
+@contextmanager
+def hold(project_id: str, owner: str) -> Iterator[Optional[ProjectLock]]:
+    """with hold(pid, owner) as lock: ... (lock is None if the project is busy)."""
+    lock = acquire(project_id, owner)
+    try:
+        yield lock
+    finally:
+        if lock is not None:
+            lock.release()
+
+
+def holder(project_id: str) -> Optional[Dict[str, Any]]:
+    """Holder info from the lock file plus "live", or None if there is no lock file."""
+    path = lock_path(project_id)
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        info = _read_holder(fd) or {}
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            info["live"] = True
+        else:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            age = _age_sec(info)
+            info["live"] = (info.get("host") not in (None, socket.gethostname())
+                            and age is not None and age < stale_sec())
+    finally:
+        os.close(fd)
+    with _HELD_LOCK:
+        if os.path.abspath(path) in _HELD:
+            info["live"] = True
+    return info
+
+
+def describe(info: Optional[Dict[str, Any]]) -> str:
+    if not info:
+        return "free"
+    if "legacy" in info:
+        return f"stale legacy marker {info['legacy']!r}"
+    state = "held" if info.get("live") else "stale"
+    return (f"{state} by pid={info.get('pid')} host={info.get('host')} owner={info.get('owner')} "
+            f"heartbeat={info.get('heartbeat_at')}")
+
+
+def run_locked(owner: str, fn: Callable[[List[str]], int], argv: List[str]) -> int:
+    """Entry-point wrapper: fn(argv) under the lock of the project named by argv[1]."""
+    if len(argv) < 2:
+        return fn(argv)
+    project_id = Path(argv[1].rstrip("/")).name
+    with hold(project_id, owner) as lock:
+        if lock is None:
+            print(f"[LOCK] {project_id} busy: {describe(holder(project_id))}", file=sys.stderr)
+            return LOCKED_RC
+        return fn(argv)
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2:
+        print("Usage: python -m engine.lock_manager_v1 <PROJECT_ID>", file=sys.stderr)
+        return 2
+    print(f"[LOCK] {argv[1]}: {describe(holder(argv[1]))}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Motion Assembly v1 (fused VIDEO_MOTION + ASSEMBLY_FROM_AUDIO)
+
+One ffmpeg invocation:
+  color plate -> motion chain (video_motion_dummy_v1) -> H.264  ┐
+  master.wav                                          -> AAC    ┴-> final.mp4
+
+Replaces "encode motion_bg.mp4, then decode/loop/rescale/re-encode it into
+final.mp4": the motion frames are encoded exactly once, at the render tier's
+frame size (engine.render_tiers_v1), with master.wav as the clock.
+
+Same contract as assembly_from_audio_v1:
+  out/<PROJECT_ID>/final.mp4, out/<PROJECT_ID>/ffprobe.json,
+  projects/<PROJECT_ID>/ASSEMBLY_FROM_AUDIO.json ("fused": true)
+and the same build-cache station key and station transaction
+(engine.station_txn_v1: all outputs published together or not at all).
+
+With the shared motion background library (engine.motion_bg_library_v1,
+default on) the video stream is stream-copied from a pre-encoded entry for the
+same spec (tier frame size + encoder args) and only the audio is encoded:
+zero video encodes per project once the library holds the bucket.
+
+--keep-motion-bg (or FLOWMIND_KEEP_MOTION_BG=1) also writes
+assets/cache/<PROJECT_ID>/video/motion_bg.mp4 from the same invocation
+(split graph, or a second copy output with the library), as an optional cache
+artifact for the two-step path.
+
+Usage:
+  python -m engine.motion_assembly_v1 FM_TEST [--tier preview|full] [--keep-motion-bg]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from engine import (
+    build_cache_v1,
+    ffmpeg_caps_v1,
+    motion_bg_library_v1,
+    probe_cache_v1,
+    render_tiers_v1,
+    station_txn_v1,
+    video_motion_dummy_v1,
+    wav_io_v1,
+)
+
+FPS = 30
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _run(cmd: list[str]) -> Tuple[int, str]:
+    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return p.returncode, p.stdout
+
+
+def _keep_motion_bg_env() -> bool:
+    return os.getenv("FLOWMIND_KEEP_MOTION_BG", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def library_spec(tier: str, profile: str, has_noise: bool, has_zoompan: bool) -> Dict[str, Any]:
+    spec = render_tiers_v1.spec(tier)
+    w, h = spec["width"], spec["height"]
+    return motion_bg_library_v1.make_spec(
+        video_motion_dummy_v1.motion_source(w, h, FPS),
+        video_motion_dummy_v1.motion_chain(has_noise, has_zoompan, w, h, FPS),
+        FPS,
+        render_tiers_v1.video_args(tier, profile),
+    )
+
+
+def library_cmd(entry: Path, master_wav: Path, dur: float, tier: str, final_mp4: Path,
+                motion_bg: Optional[Path]) -> list[str]:
+    """Video stream-copied from a library entry, master.wav encoded to AAC."""
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i", str(entry),
+        "-i", str(master_wav),
+        "-map", "0:v",
+        "-map", "1:a",
+        "-t", f"{dur:.3f}",
+        "-c:v", "copy",
+        "-c:a", "aac",
+        *render_tiers_v1.audio_args(tier),
+        "-ar", "48000",
+        "-ac", "2",
+        "-movflags", "+faststart",
+        str(final_mp4),
+    ]
+    if motion_bg is not None:
+        cmd += ["-map", "0:v", "-t", f"{dur:.3f}", "-c", "copy", "-movflags", "+faststart", str(motion_bg)]
+    return cmd
+
+
+def build_cmd(master_wav: Path, dur: float, tier: str, profile: str, final_mp4: Path,
+              motion_bg: Optional[Path], has_noise: bool, has_zoompan: bool) -> list[str]:
+    """Motion graph rendered and encoded in the same run as the audio mux (no library)."""
+    spec = render_tiers_v1.spec(tier)
+    w, h = spec["width"], spec["height"]
+    chain = ",".join(video_motion_dummy_v1.motion_chain(has_noise, has_zoompan, w, h, FPS))
+    video_args = [*render_tiers_v1.video_args(tier, profile), "-pix_fmt", "yuv420p"]
+
+    if motion_bg is None:
+        fc = f"[0:v]{chain}[v]"
+    else:
+        fc = f"[0:v]{chain},split=2[v][vbg]"
+
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-f", "lavfi",
+        "-i", video_motion_dummy_v1.motion_source(w, h, FPS),
+        "-i", str(master_wav),
+        "-filter_complex", fc,
+        "-map", "[v]",
+        "-map", "1:a",
+        "-t", f"{dur:.3f}",
+        *video_args,
+        "-c:a", "aac",
+        *render_tiers_v1.audio_args(tier),
+        "-ar", "48000",
+        "-ac", "2",
+        "-movflags", "+faststart",
+        str(final_mp4),
+    ]
+    if motion_bg is not None:
+        cmd += [
+            "-map", "[vbg]",
+            "-t", f"{dur:.3f}",
+            *video_args,
+            "-movflags", "+faststart",
+            str(motion_bg),
+        ]
+    return cmd
+
+
+def main(argv: list[str]) -> int:
+    keep_motion_bg = "--keep-motion-bg" in argv or _keep_motion_bg_env()
+    argv = [a for a in argv if a != "--keep-motion-bg"]
+
+    tier = None
+    if "--tier" in argv:
+        i = argv.index("--tier")
+        tier = argv[i + 1] if i + 1 < len(argv) else ""
+        argv = argv[:i] + argv[i + 2:]
+        if tier not in render_tiers_v1.TIERS:
+            print(f"[FAIL] --tier must be one of: {', '.join(render_tiers_v1.TIERS)}", file=sys.stderr)
+            return 2
+
+    if len(argv) < 2:
+        print("Usage: python -m engine.motion_assembly_v1 <PROJECT_ID> [--tier preview|full] [--keep-motion-bg]",
+              file=sys.stderr)
+        return 2
+
+    project_id = argv[1]
+    project_dir = (Path("projects") / project_id).resolve()
+    if not project_dir.exists():
+        print(f"[FAIL] missing project dir: {project_dir}", file=sys.stderr)
+        return 3
+
+    audio_render = project_dir / "AUDIO_RENDER.json"
+    if not audio_render.exists():
+        print(f"[FAIL] missing AUDIO_RENDER.json: {audio_render}", file=sys.stderr)
+        return 4
+
+    ar = _read_json(audio_render)
+    master_wav = Path((ar.get("outputs") or {}).get("master_wav") or "").expanduser().resolve()
+    if not master_wav.exists():
+        print(f"[FAIL] missing master_wav: {master_wav}", file=sys.stderr)
+        return 5
+
+    try:
+        ffmpeg_caps_v1.require(("ffmpeg",), encoders=("libx264", "aac"))
+        dur = wav_io_v1.duration_sec(master_wav)
+    except Exception as e:
+        print(f"[FAIL] preflight: {e}", file=sys.stderr)
+        return 7
+
+    out_dir = (Path("out") / project_id).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    final_mp4 = out_dir / "final.mp4"
+    ffprobe_json = out_dir / "ffprobe.json"
+    motion_bg = None
+    if keep_motion_bg:
+        motion_bg = (Path("assets") / "cache" / project_id / "video" / "motion_bg.mp4").resolve()
+        motion_bg.parent.mkdir(parents=True, exist_ok=True)
+
+    tier = tier or render_tiers_v1.for_project(project_id)
+    profile = render_tiers_v1.profile_for(tier, project_id)
+    has_noise = ffmpeg_caps_v1.has_filter("noise")
+    has_zoompan = ffmpeg_caps_v1.has_filter("zoompan")
+
+    library: Optional[Dict[str, Any]] = None
+    params: list[Any] = []
+    if motion_bg_library_v1.enabled():
+        try:
+            library = motion_bg_library_v1.acquire(library_spec(tier, profile, has_noise, has_zoompan), dur)
+            st = Path(library["path"]).stat()
+        except Exception as e:
+            # the library is an optimization: render the background in this run instead
+            print(f"[WARN] motion_bg library unavailable, rendering in-graph: {e}", file=sys.stderr)
+            motion_bg_library_v1.release(library)
+            library = None
+        else:
+            params = [st.st_size, st.st_mtime_ns]  # entry re-rendered after eviction -> miss
+    if library:
+        cmd = library_cmd(Path(library["path"]), master_wav, dur, tier, final_mp4, motion_bg)
+    else:
+        cmd = build_cmd(master_wav, dur, tier, profile, final_mp4, motion_bg, has_noise, has_zoompan)
+
+    try:
+        outputs = [final_mp4, ffprobe_json] + ([motion_bg] if motion_bg is not None else [])
+        fp = build_cache_v1.fingerprint("ASSEMBLY_FROM_AUDIO", [master_wav], cmd + params)
+        cache_hit = build_cache_v1.lookup(project_dir, "ASSEMBLY_FROM_AUDIO", fp)
+
+        marker = project_dir / "ASSEMBLY_FROM_AUDIO.json"
+        with station_txn_v1.transaction(project_id, "ASSEMBLY_FROM_AUDIO") as txn:
+            if not cache_hit:
+                # encode into the staging dirs; the fingerprint keeps the published argv
+                staged_mp4 = txn.stage(final_mp4)
+                if motion_bg is not None:
+                    txn.stage(motion_bg)
+                rc, out = _run(txn.staged_cmd(cmd))
+                if rc != 0:
+                    print(f"[FAIL] ffmpeg fused motion assembly rc={rc}\n{out}", file=sys.stderr)
+                    return 8
+
+                try:
+                    probe = probe_cache_v1.probe_file(staged_mp4)
+                except Exception as e:
+                    print(f"[FAIL] ffprobe final: {e}", file=sys.stderr)
+                    return 9
+                probe.setdefault("format", {})["filename"] = str(final_mp4)
+                txn.write_text(ffprobe_json, json.dumps(probe, ensure_ascii=False, indent=4) + "\n")
+
+            marker_data = {
+                "project_id": project_id,
+                "generated_at": _utc_now_iso(),
+                "inputs": {"master_wav": str(master_wav), "video_src": "lavfi:motion",
+                           "video_src_kind": "motion_fused"},
+                "duration_sec": float(dur),
+                "fused": True,
+                "motion": {"noise": has_noise, "zoompan": has_zoompan},
+                "motion_bg_library": (
+                    {k: library[k] for k in ("path", "spec_key", "bucket_sec", "hit")} if library else None
+                ),
+                "render_tier": tier,
+                "encode_profile": profile,
+                "outputs": {
+                    "final_mp4": str(final_mp4),
+                    "ffprobe_json": str(ffprobe_json),
+                    "motion_bg": str(motion_bg) if motion_bg is not None else None,
+                },
+                "build_cache": {"fingerprint": fp, "hit": cache_hit},
+                "note": "Single pass: motion background graph + master audio clock muxed in one ffmpeg run.",
+            }
+            txn.write_text(marker, json.dumps(marker_data, ensure_ascii=False, indent=2) + "\n")
+            txn.commit()  # final.mp4, ffprobe.json, motion_bg, marker: all new or all old
+
+        if not cache_hit:
+            probe_cache_v1.remember(final_mp4, probe)  # FINAL_QA reuses this record
+            build_cache_v1.store(project_dir, "ASSEMBLY_FROM_AUDIO", fp, outputs)
+
+        if cache_hit:
+            print(f"[MOTION_ASSEMBLY PASS] cache hit fingerprint={fp[:12]} (no re-encode)")
+        print(f"[MOTION_ASSEMBLY PASS] final={final_mp4} tier={tier} profile={profile} "
+              f"duration_sec={dur:.3f} noise={has_noise} zoompan={has_zoompan}")
+        if library:
+            print(f"[MOTION_ASSEMBLY PASS] library={'hit' if library['hit'] else 'rendered'} "
+                  f"entry={library['spec_key']}/{library['bucket_sec']}s evicted={len(library['evicted'])}")
+        if motion_bg is not None:
+            print(f"[MOTION_ASSEMBLY PASS] motion_bg={motion_bg}")
+        print(f"[MOTION_ASSEMBLY PASS] ffprobe={ffprobe_json}")
+        return 0
+    finally:
+        motion_bg_library_v1.release(library)  # unpin: the entry may be evicted again
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Motion BG Library v1 (shared pre-encoded motion backgrounds)
+
+The motion background is a pure function of its spec (frame size, fps, filter
+chain, encoder args): every project used to encode the same frames again at its
+own duration. The library encodes each spec once per duration bucket and
+projects cut what they need with stream copy.
+
+Layout:
+  assets/cache/_shared/motion_bg/<spec_key>/<bucket>s.mp4
+  assets/cache/_shared/motion_bg/index.json   {"<spec_key>/<bucket>": {path, bytes, last_used, ...}}
+
+- spec_key   = sha256(spec JSON)[:16]   (source, chain, fps, encoder args minus -threads)
+- buckets    = 30/60/120/300/600s, then multiples of 600s; the smallest entry
+               >= the requested duration is used
+- encoding   = 1s keyframes (-g fps, no scenecut) and no B-frames, so a copy
+               cut at any frame is clean and every second starts on a keyframe
+- eviction   = LRU by last_used until the library is under
+               FLOWMIND_MOTION_BG_MAX_MB (default 2048); the entry just
+               acquired and entries pinned by a running station are skipped
+
+Concurrency: one flock per spec_key while an entry is rendered, one flock on
+the index for lookups and bookkeeping. acquire() returns the entry pinned
+(shared flock on the file) until release(); eviction only deletes an entry it
+can lock exclusively.
+
+Disable with FLOWMIND_MOTION_BG_LIBRARY=0.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import math
+import os
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LIB_DIR = Path("assets") / "cache" / "_shared" / "motion_bg"
+INDEX_FILE = "index.json"
+BUCKETS_SEC = (30, 60, 120, 300, 600)
+DEFAULT_MAX_MB = 2048
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def enabled() -> bool:
+    return os.getenv("FLOWMIND_MOTION_BG_LIBRARY", "1").strip() not in ("0", "false", "no", "off")
+
+
+def max_bytes() -> int:
+    try:
+        return max(0, int(os.getenv("FLOWMIND_MOTION_BG_MAX_MB", DEFAULT_MAX_MB))) * 1024 * 1024
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+def bucket_for(duration_sec: float) -> int:
+    for b in BUCKETS_SEC:
+        if duration_sec <= b:
+            return b
+    step = BUCKETS_SEC[-1]
+    return int(math.ceil(duration_sec / step)) * step
+
+
+def make_spec(source: str, chain: List[str], fps: int, video_args: List[str]) -> Dict[str, Any]:
+    return {"source": source, "chain": ",".join(chain), "fps": int(fps), "video_args": list(video_args)}
+
+
+def spec_key(spec: Dict[str, Any]) -> str:
+    # thread count changes speed, not the picture: not part of the key
+    args = list(spec["video_args"])
+    if "-threads" in args:
+        i = args.index("-threads")
+        del args[i:i + 2]
+    keyed = {**spec, "video_args": args}
+    return hashlib.sha256(json.dumps(keyed, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def render_cmd(spec: Dict[str, Any], seconds: int, out_path: Path) -> List[str]:
+    fps = str(spec["fps"])
+    return [
+        "ffmpeg",
+        "-y",
+        "-f", "lavfi",
+        "-i", spec["source"],
+        "-t", str(seconds),
+        "-filter_complex", f"[0:v]{spec['chain']}[v]",
+        "-map", "[v]",
+        *spec["video_args"],
+        "-g", fps,
+        "-keyint_min", fps,
+        "-sc_threshold", "0",
+        "-bf", "0",
+        "-pix_fmt", "yuv420p",
+        "-movflags", "+faststart",
+        "-f", "mp4",
+        str(out_path),
+    ]
+
+
+def trim_cmd(entry: Path, duration_sec: float, out_path: Path) -> List[str]:
+    """Stream-copy the first duration_sec of an entry (clean at any frame: no B-frames)."""
+    return [
+        "ffmpeg",
+        "-y",
+        "-i", str(entry),
+        "-t", f"{duration_sec:.3f}",
+        "-map", "0:v",
+        "-c", "copy",
+        "-movflags", "+faststart",
+        str(out_path),
+    ]
+
+
+@contextmanager
+def _flock(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _load_index() -> Dict[str, Any]:
+    try:
+        data = json.loads((LIB_DIR / INDEX_FILE).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_index(index: Dict[str, Any]) -> None:
+    path = LIB_DIR / INDEX_FILE
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(LIB_DIR))
+    try:
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _find(index: Dict[str, Any], key: str, duration_sec: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+    best = None
+    for name, rec in index.items():
+        if rec.get("spec_key") != key or rec.get("bucket_sec", 0) < duration_sec:
+            continue
+        try:
+            if Path(rec["path"]).stat().st_size != rec.get("bytes"):
+                continue
+        except OSError:
+            continue
+        if best is None or rec["bucket_sec"] < best[1]["bucket_sec"]:
+            best = (name, rec)
+    return best
+
+
+def _evict(index: Dict[str, Any], keep: str) -> List[str]:
+    limit = max_bytes()
+    for name in [n for n, r in index.items() if not Path(r.get("path", "")).exists()]:
+        index.pop(name)
+    total = sum(int(r.get("bytes") or 0) for r in index.values())
+    evicted: List[str] = []
+    for name, rec in sorted(index.items(), key=lambda kv: kv[1].get("last_used") or ""):
+        if total <= limit:
+            break
+        if name == keep:
+            continue
+        try:
+            with open(rec["path"], "rb") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                os.remove(rec["path"])
+        except BlockingIOError:
+            continue  # pinned: a station is reading it
+        except OSError:
+            pass
+        try:
+            os.rmdir(os.path.dirname(rec["path"]))  # only succeeds once the spec has no buckets left
+        except OSError:
+            pass
+        total -= int(rec.get("bytes") or 0)
+        index.pop(name)
+        evicted.append(name)
+    return evicted
+
+
+def _pin(path: str) -> Any:
+    f = open(path, "rb")
+    fcntl.flock(f.fileno(), fcntl.LOCK_SH)  # evictors only try LOCK_EX | LOCK_NB
+    return f
+
+
+def _acquire_hit(key: str, duration_sec: float) -> Optional[Dict[str, Any]]:
+    """Pinned existing entry (lookup, pin and last_used under the index lock), or None."""
+    with _flock(LIB_DIR / ".index.lock"):
+        index = _load_index()
+        found = _find(index, key, duration_sec)
+        if not found:
+            return None
+        name, rec = found
+        try:
+            pin = _pin(rec["path"])
+        except OSError:
+            return None
+        index[name] = {**rec, "last_used": _utc_now_iso()}
+        _save_index(index)
+    return {"path": rec["path"], "spec_key": key, "bucket_sec": rec["bucket_sec"], "hit": True, "evicted": [],
+            "pin": pin}
+
+
+def acquire(spec: Dict[str, Any], duration_sec: float) -> Dict[str, Any]:
+    """
+    Library entry covering duration_sec, rendering it if needed.
+    Returns {"path", "spec_key", "bucket_sec", "hit": bool, "evicted": [...], "pin"}.
+    The entry stays pinned (never evicted) until release(). Raises RuntimeError
+    if the render fails.
+    """
+    key = spec_key(spec)
+    hit = _acquire_hit(key, duration_sec)
+    if hit:
+        return hit
+
+    bucket = bucket_for(duration_sec)
+    with _flock(LIB_DIR / f".{key}.lock"):
+        hit = _acquire_hit(key, duration_sec)  # rendered by another process while we waited
+        if hit:
+            return hit
+
+        entry = (LIB_DIR / key / f"{bucket}s.mp4").resolve()
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(entry.name + ".building")
+        p = subprocess.run(render_cmd(spec, bucket, tmp), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if p.returncode != 0:
+            if tmp.exists():
+                tmp.unlink()
+            raise RuntimeError(f"motion_bg library render rc={p.returncode}\n{p.stdout}")
+        os.replace(tmp, entry)
+
+        name = f"{key}/{bucket}"
+        rec = {
+            "path": str(entry),
+            "spec_key": key,
+            "bucket_sec": bucket,
+            "bytes": entry.stat().st_size,
+            "created_at": _utc_now_iso(),
+            "last_used": _utc_now_iso(),
+            "spec": spec,
+        }
+        with _flock(LIB_DIR / ".index.lock"):
+            pin = _pin(str(entry))
+            index = _load_index()
+            index[name] = rec
+            evicted = _evict(index, keep=name)
+            _save_index(index)
+    return {"path": str(entry), "spec_key": key, "bucket_sec": bucket, "hit": False, "evicted": evicted, "pin": pin}
+
+
+def release(entry: Optional[Dict[str, Any]]) -> None:
+    """Unpin an entry returned by acquire() (idempotent)."""
+    pin = (entry or {}).pop("pin", None)
+    if pin is not None:
+        pin.close()
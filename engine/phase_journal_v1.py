@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Phase Journal v1 (append-only binary phase history)
+
+projects/<ID>/PHASE_JOURNAL.bin replaces the capped "phase_history" list that
+every transition used to rewrite inside PROJECT_STATE.json:
+
+  header   16 bytes   b"FMPHJ1", record size (u16)
+  record  128 bytes   at (f64 unix) | phase (24s) | reason (72s) | gate (16s) | flags (u8) | pad
+
+- append   one O_APPEND write of whole records under flock(LOCK_EX) on the
+           journal; a torn tail is cut back to the last whole record first,
+           so every record stays at its offset
+- read     the file is its own index: record i lives at 16 + i*128, so mmap
+           gives the last N entries (or a backwards scan) without parsing the rest
+- torn     a partial trailing record (crash mid-write) is ignored by every
+           reader and truncated away by the next append
+- header   written in the same write() as the first records, so a file is
+           either empty or starts with it; an empty or headerless file reads
+           as an empty journal and the next append moves it aside (.bad)
+
+Strings are UTF-8, NUL padded, truncated to the field size on a character
+boundary. Entries come back in
+the old phase_history shape: {"at", "phase", ["reason"], ["gate"], ["recovered"]}.
+
+Usage:
+  python -m engine.phase_journal_v1 <PROJECT_ID> [--last N]
+"""
+
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import struct
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+JOURNAL_FILE = "PHASE_JOURNAL.bin"
+MAGIC = b"FMPHJ1"
+HEADER = struct.Struct("<6s2xH6x")                # 16 bytes
+RECORD = struct.Struct("<d24s72s16sB7x")          # 128 bytes
+FLAG_RECOVERED = 0x01
+
+UNSAFE_PHASES = ("HALT",)
+
+PathLike = Union[str, Path]
+
+
+def journal_path(project_id: str) -> Path:
+    return Path("projects") / project_id / JOURNAL_FILE
+
+
+def _ts(at: Optional[str]) -> float:
+    if not at:
+        return datetime.now(timezone.utc).timestamp()
+    try:
+        return datetime.fromisoformat(str(at).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _field(value: Any, size: int) -> bytes:
+    raw = str(value or "").encode("utf-8")[:size]
+    return raw.decode("utf-8", errors="ignore").encode("utf-8")  # never split a character
+
+
+def _text(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8", errors="replace")
+
+
+def pack(entry: Dict[str, Any]) -> bytes:
+    flags = FLAG_RECOVERED if entry.get("recovered") else 0
+    return RECORD.pack(
+        _ts(entry.get("at")),
+        _field(entry.get("phase"), 24),
+        _field(entry.get("reason"), 72),
+        _field(entry.get("gate"), 16),
+        flags,
+    )
+
+
+def unpack(raw: bytes) -> Dict[str, Any]:
+    ts, phase, reason, gate, flags = RECORD.unpack(raw)
+    entry: Dict[str, Any] = {"at": _iso(ts), "phase": _text(phase)}
+    if reason.strip(b"\0"):
+        entry["reason"] = _text(reason)
+    if gate.strip(b"\0"):
+        entry["gate"] = _text(gate)
+    if flags & FLAG_RECOVERED:
+        entry["recovered"] = True
+    return entry
+
+
+def append_to(path: PathLike, entries: Iterable[Dict[str, Any]], sync: bool = False) -> int:
+    """Append entries to a journal file (created with its header). Returns records written."""
+    data = b"".join(pack(e) for e in entries)
+    if not data:
+        return 0
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = _open_locked(path)
+    try:
+        size = os.fstat(fd).st_size
+        if size and not _has_header(os.pread(fd, HEADER.size, 0)):
+            bad = path.with_name(path.name + ".bad")
+            os.replace(path, bad)  # still flocked: other appenders retry on the new file
+            print(f"[PHASE_JOURNAL] WARN: {path} has no header, moved to {bad.name}")
+            os.close(fd)
+            fd = _open_locked(path)
+            size = os.fstat(fd).st_size
+        whole = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size if size else 0
+        if size > whole:
+            os.ftruncate(fd, whole)  # torn record from a crash: keep the next ones aligned
+            print(f"[PHASE_JOURNAL] WARN: {path} dropped a torn record ({size - whole} bytes)")
+        if size == 0:
+            data = HEADER.pack(MAGIC, RECORD.size) + data  # header + records in one write
+        os.write(fd, data)
+        if sync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)  # drops the flock
+    return len(data) // RECORD.size
+
+
+def _open_locked(path: Path) -> int:
+    """fd of the journal with flock(LOCK_EX) held, retried if the file was moved aside meanwhile."""
+    while True:
+        fd = os.open(str(path), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+
+def _has_header(raw: bytes) -> bool:
+    if len(raw) < HEADER.size:
+        return False
+    magic, rsize = HEADER.unpack_from(raw, 0)
+    return magic == MAGIC and rsize == RECORD.size
+
+
+def append(project_id: str, phase: str, at: Optional[str] = None, **entry: Any) -> None:
+    append_to(journal_path(project_id), [{"at": at, "phase": phase, **entry}])
+
+
+class _Journal:
+    """Read-only mmap view; len() and [i] address records directly."""
+
+    def __init__(self, path: PathLike):
+        self._mm: Optional[mmap.mmap] = None
+        self.count = 0
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < HEADER.size + RECORD.size:
+                    return
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return
+        if not _has_header(self._mm[:HEADER.size]):
+            return  # headerless (crash before the first write): reads as empty
+        self.count = (size - HEADER.size) // RECORD.size
+
+    def __enter__(self) -> "_Journal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._mm is not None:
+            self._mm.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count or self._mm is None:
+            raise IndexError(i)
+        off = HEADER.size + i * RECORD.size
+        return unpack(self._mm[off:off + RECORD.size])
+
+    def backwards(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.count - 1, -1, -1):
+            yield self[i]
+
+
+def exists(project_id: str) -> bool:
+    return journal_path(project_id).exists()
+
+
+def count(project_id: str) -> int:
+    with _Journal(journal_path(project_id)) as j:
+        return len(j)
+
+
+def read(project_id: str, last: Optional[int] = None) -> List[Dict[str, Any]]:
+    """All entries, oldest first (or only the last N)."""
+    return read_from(journal_path(project_id), last)
+
+
+def read_from(path: PathLike, last: Optional[int] = None) -> List[Dict[str, Any]]:
+    with _Journal(path) as j:
+        start = 0 if last is None else max(0, len(j) - last)
+        return [j[i] for i in range(start, len(j))]
+
+
+def last_safe_phase(project_id: str) -> Optional[str]:
+    """Most recent phase that is not HALT (the one a HALT interrupted)."""
+    with _Journal(journal_path(project_id)) as j:
+        for entry in j.backwards():
+            if entry["phase"] and entry["phase"] not in UNSAFE_PHASES:
+                return entry["phase"]
+    return None
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2:
+        print("Usage: python -m engine.phase_journal_v1 <PROJECT_ID> [--last N]", file=sys.stderr)
+        return 2
+    project_id = argv[1]
+    last = int(argv[argv.index("--last") + 1]) if "--last" in argv else None
+    if not exists(project_id):
+        print(f"[PHASE_JOURNAL] no journal for {project_id}")
+        return 1
+    for e in read(project_id, last):
+        extra = " ".join(f"{k}={e[k]}" for k in ("reason", "gate", "recovered") if k in e)
+        print(f"{e['at']}  {e['phase']:<20} {extra}".rstrip())
+    print(f"[PHASE_JOURNAL] {count(project_id)} entries, last safe phase: {last_safe_phase(project_id)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
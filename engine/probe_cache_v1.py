@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Probe Cache v1 (one ffprobe per media content version)
+
+probe(path) returns the full `ffprobe -show_streams -show_format -of json`
+document, cached:
+- in memory (per process)
+- on disk: assets/cache/_shared/probe/<sha1(realpath)>.json
+
+Key = realpath + size + mtime_ns. Any rewrite of the file (new size or mtime)
+is a miss and replaces the single record kept for that path.
+
+Staged outputs (engine.station_txn_v1) are probed with probe_file() and the
+record is attached to the published path with remember() after the commit
+rename (same inode, size and mtime).
+
+Disable with FLOWMIND_PROBE_CACHE=0 (always runs ffprobe, nothing stored).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_DIR = Path("assets") / "cache" / "_shared" / "probe"
+
+_MEMO: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+_MEMO_LOCK = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.getenv("FLOWMIND_PROBE_CACHE", "1").strip() not in ("0", "false", "no", "off")
+
+
+def _key(path: Path) -> Tuple[str, int, int]:
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    return real, st.st_size, st.st_mtime_ns
+
+
+def _record_path(real: str) -> Path:
+    return CACHE_DIR / (hashlib.sha1(real.encode("utf-8")).hexdigest() + ".json")
+
+
+def _run_ffprobe(path: str) -> Dict[str, Any]:
+    cmd = ["ffprobe", "-v", "error", "-show_streams", "-show_format", "-of", "json", path]
+    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"ffprobe failed rc={p.returncode}\n{p.stdout}")
+    return json.loads(p.stdout)
+
+
+def _load_record(key: Tuple[str, int, int]) -> Optional[Dict[str, Any]]:
+    try:
+        rec = json.loads(_record_path(key[0]).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if [rec.get("path"), rec.get("size"), rec.get("mtime_ns")] != list(key):
+        return None
+    probe_doc = rec.get("probe")
+    return probe_doc if isinstance(probe_doc, dict) else None
+
+
+def _store_record(key: Tuple[str, int, int], probe_doc: Dict[str, Any]) -> None:
+    path = _record_path(key[0])
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+        try:
+            with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                json.dump({"path": key[0], "size": key[1], "mtime_ns": key[2], "probe": probe_doc}, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except OSError:
+        pass  # cache is an optimisation; a read-only tree still probes correctly
+
+
+def probe(path: Path) -> Dict[str, Any]:
+    """Full ffprobe JSON (streams + format). Raises RuntimeError on ffprobe failure."""
+    if not enabled():
+        return _run_ffprobe(os.path.realpath(path))
+
+    key = _key(Path(path))
+    with _MEMO_LOCK:
+        hit = _MEMO.get(key)
+    if hit is not None:
+        return hit
+
+    doc = _load_record(key)
+    if doc is None:
+        doc = _run_ffprobe(key[0])
+        _store_record(key, doc)
+
+    with _MEMO_LOCK:
+        _MEMO[key] = doc
+    return doc
+
+
+def probe_file(path: Path) -> Dict[str, Any]:
+    """Uncached ffprobe (e.g. a staging path that is about to be renamed)."""
+    return _run_ffprobe(os.path.realpath(path))
+
+
+def remember(path: Path, probe_doc: Dict[str, Any]) -> None:
+    """Cache a probe document for path as it is now."""
+    if not enabled():
+        return
+    key = _key(Path(path))
+    _store_record(key, probe_doc)
+    with _MEMO_LOCK:
+        _MEMO[key] = probe_doc
+
+
+def duration_sec(path: Path) -> float:
+    return float(probe(path)["format"]["duration"])
+
+
+def stream(doc: Dict[str, Any], codec_type: str) -> Dict[str, Any]:
+    """First stream of a type ("video" / "audio"), {} if none."""
+    for s in doc.get("streams", []):
+        if s.get("codec_type") == codec_type:
+            return s
+    return {}
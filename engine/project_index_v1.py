@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Project Index v1 (SQLite mirror of every PROJECT_STATE)
+
+Cross-project questions ("who is AWAITING_APPROVAL / HALT / READY_FOR_UPLOAD?")
+used to parse projects/*/PROJECT_STATE.json one file at a time. This index keeps
+one row per project folder:
+
+  key              folder under projects/ ("FM_X", "_archive/FM_X_20260101_120000")
+  project_id, phase, approval_status, halt_reason, updated_at, state_version
+  final_bytes      out/<ID>/final.mp4 size (NULL if missing)
+  out_bytes        total size of the files in out/<ID>/
+  archived         1 once the folder lives under projects/_archive/
+
+Writers:
+- engine.state_store_v1 calls record() inside its per-project lock after every
+  versioned write, one SQLite transaction per state write
+- tools/archive_project calls moved() after the folder move
+- reindex() rebuilds everything from disk (first run, manual edits, recovery)
+
+The database is a rebuildable mirror (assets/cache/_shared/project_index.sqlite,
+WAL mode): a failed index write never fails the state write, and stale rows
+are fixed by `fm.py status --reindex`.
+
+Disable with FLOWMIND_PROJECT_INDEX=0.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PROJECTS_DIR = Path("projects")
+OUT_DIR = Path("out")
+ARCHIVE_DIR = "_archive"
+DB_FILE = Path("assets") / "cache" / "_shared" / "project_index.sqlite"
+
+COLUMNS = (
+    "key", "project_id", "phase", "approval_status", "halt_reason", "updated_at",
+    "state_version", "final_bytes", "out_bytes", "archived", "indexed_at",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    key             TEXT PRIMARY KEY,
+    project_id      TEXT NOT NULL,
+    phase           TEXT,
+    approval_status TEXT,
+    halt_reason     TEXT,
+    updated_at      TEXT,
+    state_version   INTEGER,
+    final_bytes     INTEGER,
+    out_bytes       INTEGER,
+    archived        INTEGER NOT NULL DEFAULT 0,
+    indexed_at      TEXT
+);
+CREATE INDEX IF NOT EXISTS projects_phase ON projects (archived, phase);
+CREATE INDEX IF NOT EXISTS projects_project_id ON projects (project_id);
+"""
+
+_LOCAL = threading.local()
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def enabled() -> bool:
+    return os.getenv("FLOWMIND_PROJECT_INDEX", "1").strip() not in ("0", "false", "no", "off")
+
+
+def _connect() -> sqlite3.Connection:
+    # one connection per thread and cwd (tools chdir into throw-away workdirs)
+    path = os.path.abspath(DB_FILE)
+    conns: Dict[str, sqlite3.Connection] = getattr(_LOCAL, "conns", None) or {}
+    _LOCAL.conns = conns
+    conn = conns.get(path)
+    if conn is None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=10.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        conns[path] = conn
+    return conn
+
+
+def _file_size(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _out_sizes(project_id: str) -> Tuple[Optional[int], int]:
+    out_dir = OUT_DIR / project_id
+    total = 0
+    try:
+        with os.scandir(out_dir) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        pass
+    return _file_size(out_dir / "final.mp4"), total
+
+
+def _row(key: str, state: Dict[str, Any], now: str) -> Tuple[Any, ...]:
+    project_id = str(state.get("project_id") or key.rsplit("/", 1)[-1])
+    final_bytes, out_bytes = _out_sizes(project_id)
+    try:
+        state_version = int(state.get("state_version") or 0)
+    except (TypeError, ValueError):
+        state_version = 0
+    return (
+        key,
+        project_id,
+        state.get("phase"),
+        state.get("approval_status"),
+        state.get("halt_reason"),
+        state.get("updated_at"),
+        state_version,
+        final_bytes,
+        out_bytes,
+        1 if key.startswith(ARCHIVE_DIR + "/") else 0,
+        now,
+    )
+
+
+_UPSERT = f"INSERT OR REPLACE INTO projects ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def record(key: str, state: Dict[str, Any]) -> bool:
+    """Upsert one project row. Returns False (and leaves the row stale) on any DB error."""
+    if not enabled():
+        return False
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute(_UPSERT, _row(key, state, _utc_now_iso()))
+    except sqlite3.Error as e:
+        print(f"[PROJECT_INDEX] WARN: record {key} failed: {e}")
+        return False
+    return True
+
+
+def moved(old_key: str, new_key: str, state: Optional[Dict[str, Any]] = None) -> bool:
+    """Folder moved (archive): drop the old row, index the new location."""
+    if not enabled():
+        return False
+    if state is None:
+        state = _read_state(PROJECTS_DIR / new_key / "PROJECT_STATE.json") or {}
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("DELETE FROM projects WHERE key = ?", (old_key,))
+            conn.execute(_UPSERT, _row(new_key, state, _utc_now_iso()))
+    except sqlite3.Error as e:
+        print(f"[PROJECT_INDEX] WARN: move {old_key} -> {new_key} failed: {e}")
+        return False
+    return True
+
+
+def _read_state(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _state_files() -> Iterable[Tuple[str, Path]]:
+    if not PROJECTS_DIR.is_dir():
+        return
+    for d in sorted(PROJECTS_DIR.iterdir()):
+        if d.name == ARCHIVE_DIR and d.is_dir():
+            for a in sorted(d.iterdir()):
+                if (a / "PROJECT_STATE.json").is_file():
+                    yield f"{ARCHIVE_DIR}/{a.name}", a / "PROJECT_STATE.json"
+        elif (d / "PROJECT_STATE.json").is_file():
+            yield d.name, d / "PROJECT_STATE.json"
+
+
+def reindex() -> Dict[str, int]:
+    """Rebuild the whole index from projects/ (one transaction). Returns counts."""
+    now = _utc_now_iso()
+    rows = []
+    unreadable = 0
+    for key, path in _state_files():
+        state = _read_state(path)
+        if state is None:
+            unreadable += 1
+            state = {}
+        rows.append(_row(key, state, now))
+    conn = _connect()
+    with conn:
+        conn.execute("DELETE FROM projects")
+        conn.executemany(_UPSERT, rows)
+    return {"indexed": len(rows), "unreadable": unreadable}
+
+
+def query(phases: Optional[Iterable[str]] = None, include_archived: bool = False) -> List[Dict[str, Any]]:
+    sql = f"SELECT {', '.join(COLUMNS)} FROM projects"
+    where: List[str] = []
+    args: List[Any] = []
+    if not include_archived:
+        where.append("archived = 0")
+    phases = [p.strip().upper() for p in (phases or []) if p.strip()]
+    if phases:
+        where.append(f"phase IN ({', '.join('?' * len(phases))})")
+        args.extend(phases)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY updated_at DESC, key"
+    return [dict(zip(COLUMNS, r)) for r in _connect().execute(sql, args)]
+
+
+def counts(include_archived: bool = True) -> Dict[str, int]:
+    sql = "SELECT COALESCE(phase, '?'), COUNT(*) FROM projects"
+    if not include_archived:
+        sql += " WHERE archived = 0"
+    sql += " GROUP BY phase ORDER BY phase"
+    return {phase: n for phase, n in _connect().execute(sql)}
+
+
+def is_empty() -> bool:
+    return _connect().execute("SELECT 1 FROM projects LIMIT 1").fetchone() is None
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Render Tiers v1 (preview before approval, full after)
+
+Tiers:
+- preview   640x360,   draft profile, capped bitrate   (Telegram approval gate)
+- full      1920x1080, project encode profile          (upload master, rendered on APPROVED)
+
+Resolution order for a project:
+  1) env FLOWMIND_RENDER_TIER
+  2) PROJECT_STATE.json "render_tier"
+  3) DEFAULT_TIER ("preview": two-tier flow; set "full" to render 1080p up front)
+
+The tier a final.mp4 was rendered at is recorded in ASSEMBLY_FROM_AUDIO.json
+("render_tier"); FINAL_QA and the approval bridge read it from there.
+Markers written before tiers existed are treated as "full".
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from engine import encode_profiles_v1
+
+PREVIEW = "preview"
+FULL = "full"
+
+TIERS: Dict[str, Dict[str, Any]] = {
+    PREVIEW: {
+        "width": 640,
+        "height": 360,
+        "profile": "draft",
+        "maxrate": "600k",
+        "bufsize": "1200k",
+        "audio_bitrate": "64k",
+        "min_bytes": 32_000,
+    },
+    FULL: {
+        "width": 1920,
+        "height": 1080,
+        "profile": None,  # project profile (encode_profiles_v1.for_project)
+        "maxrate": None,
+        "bufsize": None,
+        "audio_bitrate": None,
+        "min_bytes": 2_000_000,
+    },
+}
+DEFAULT_TIER = PREVIEW
+
+
+def _normalize(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    name = str(name).strip().lower()
+    return name if name in TIERS else None
+
+
+def resolve(state: Optional[Dict[str, Any]] = None, default: str = DEFAULT_TIER) -> str:
+    env = _normalize(os.getenv("FLOWMIND_RENDER_TIER"))
+    if env:
+        return env
+    explicit = _normalize((state or {}).get("render_tier"))
+    if explicit:
+        return explicit
+    return _normalize(default) or DEFAULT_TIER
+
+
+def for_project(project_id: str, default: str = DEFAULT_TIER) -> str:
+    from engine import state_store_v1
+
+    return resolve(state_store_v1.peek(state_store_v1.state_path(project_id)), default=default)
+
+
+def rendered_tier(project_id: str) -> str:
+    """Tier of the current final.mp4, from the ASSEMBLY_FROM_AUDIO marker."""
+    path = Path("projects") / project_id / "ASSEMBLY_FROM_AUDIO.json"
+    try:
+        marker = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return FULL
+    return _normalize(marker.get("render_tier")) or FULL
+
+
+def spec(tier: str) -> Dict[str, Any]:
+    return TIERS[_normalize(tier) or DEFAULT_TIER]
+
+
+def profile_for(tier: str, project_id: Optional[str] = None) -> str:
+    fixed = spec(tier)["profile"]
+    if fixed:
+        return fixed
+    if project_id:
+        return encode_profiles_v1.for_project(project_id)
+    return encode_profiles_v1.resolve()
+
+
+def scale_filter(tier: str) -> str:
+    """Letterbox into the tier frame (same timeline, only the raster changes)."""
+    w, h = spec(tier)["width"], spec(tier)["height"]
+    return (
+        f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+        f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2"
+    )
+
+
+def video_args(tier: str, profile: str, threads: Optional[int] = None) -> List[str]:
+    """Encoder args: the profile's x264 settings, plus a VBV cap for bitrate-limited tiers."""
+    s = spec(tier)
+    args = encode_profiles_v1.video_args(profile, threads)
+    if s["maxrate"]:
+        args += ["-maxrate", s["maxrate"], "-bufsize", s["bufsize"]]
+    return args
+
+
+def audio_args(tier: str) -> List[str]:
+    s = spec(tier)
+    return ["-b:a", s["audio_bitrate"]] if s["audio_bitrate"] else []
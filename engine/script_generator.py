@@ -133,12 +133,12 @@ def _write_outputs(project_id: str, payload: dict):
         f.write(payload["script_text"].strip() + "\n")
 
 
-def main():
-    if len(sys.argv) < 2:
+def main(argv) -> int:
+    if len(argv) < 2:
         print("Usage: python -m engine.script_generator <PROJECT_ID>")
-        sys.exit(1)
+        return 1
 
-    project_id = sys.argv[1]
+    project_id = argv[1]
 
     print("[SCRIPT] Generating script...")
     payload = generate_script(project_id)
@@ -149,12 +149,12 @@ def main():
         validate_script(script_text)
     except ScriptValidationError as e:
         print(f"[SCRIPT FAIL] {e}")
-        sys.exit(1)
+        return 1
 
     _write_outputs(project_id, payload)
     print("[SCRIPT PASS] Written: projects/{}/SCRIPT.json + SCRIPT.txt".format(project_id))
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main(sys.argv))
@@ -4,9 +4,10 @@ PROJECT STATE LOCK ENGINE
 """
 
 import os
-import json
 from datetime import datetime
 
+from engine import state_store_v1
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 STATE_DIR = os.path.join(BASE_DIR, "state_data")
 
@@ -32,10 +33,7 @@ def create_project_state(project_id: str):
         "production_completed": False
     }
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-
-    return data
+    return state_store_v1.save_json(path, data)
 
 
 def load_project_state(project_id: str):
@@ -43,15 +41,12 @@ def load_project_state(project_id: str):
     if not os.path.exists(path):
         raise Exception("PROJECT_NOT_FOUND")
 
-    with open(path, "r") as f:
-        return json.load(f)
+    return state_store_v1.read_json(path)
 
 
 def update_project_state(project_id: str, updates: dict):
-    data = load_project_state(project_id)
-    data.update(updates)
-
-    with open(_state_path(project_id), "w") as f:
-        json.dump(data, f, indent=2)
+    path = _state_path(project_id)
+    if not os.path.exists(path):
+        raise Exception("PROJECT_NOT_FOUND")
 
-    return data
+    return state_store_v1.update_json(path, lambda data: data.update(updates))
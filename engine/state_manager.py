@@ -5,10 +5,13 @@ FlowMind Cashflow
 State Manager (Deterministic Phase Control)
 
 Single source of truth: projects/<PROJECT_ID>/PROJECT_STATE.json
+Reads and writes go through engine.state_store_v1 (atomic, versioned, cached).
 """
 
 import os
-import json
+from pathlib import Path
+
+from engine import state_store_v1
 
 
 BASE_DIR = "projects"
@@ -22,33 +25,31 @@ def _ensure_project(project_id: str):
     project_path = os.path.join(BASE_DIR, project_id)
     os.makedirs(project_path, exist_ok=True)
 
-    state_file = _state_path(project_id)
-
-    if not os.path.exists(state_file):
-        default_state = {
-            "project_id": project_id,
-            "phase": "TOPIC"
-        }
-        with open(state_file, "w") as f:
-            json.dump(default_state, f, indent=2)
+    if not os.path.exists(_state_path(project_id)):
+        state_store_v1.update(project_id, lambda state: state.setdefault("phase", "TOPIC"), create=True)
 
 
 def get_phase(project_id: str) -> str:
     _ensure_project(project_id)
 
-    with open(_state_path(project_id), "r") as f:
-        data = json.load(f)
-
-    return data.get("phase", "TOPIC")
+    return state_store_v1.phase(project_id) or "TOPIC"
 
 
 def set_phase(project_id: str, new_phase: str):
     _ensure_project(project_id)
 
-    with open(_state_path(project_id), "r") as f:
-        data = json.load(f)
+    def apply(state):
+        state["phase"] = new_phase
+
+    state_store_v1.update(project_id, apply, create=True)
+
+
+def load_state(project_path: Path) -> dict:
+    path = Path(project_path) / "PROJECT_STATE.json"
+    if not path.exists():
+        raise FileNotFoundError(str(path))
+    return state_store_v1.read_json(path)
 
-    data["phase"] = new_phase
 
-    with open(_state_path(project_id), "w") as f:
-        json.dump(data, f, indent=2)
+def save_state(project_path: Path, state: dict):
+    state_store_v1.save_json(Path(project_path) / "PROJECT_STATE.json", state)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — State Store v1 (single writer for PROJECT_STATE and friends)
+
+Every state document (projects/<ID>/PROJECT_STATE.json, out/<ID>/PROJECT_STATE.json,
+state_data/<ID>.json, listener offsets) goes through here:
+
+- writes   mkstemp in the same dir -> fsync(file) -> os.replace -> fsync(dir)
+           a crash leaves the old or the new document, never half of one
+- versions "state_version" is bumped on every save()/update(); a writer that
+           read version N and saves with expected_version=N gets StateConflict
+           if anyone else wrote in between (compare-and-swap)
+- updates  update(fn) = flock + fresh read + fn(state) + versioned write,
+           so two ticks changing the same project serialize instead of one
+           silently overwriting the other
+- history  transition() appends to projects/<ID>/PHASE_JOURNAL.bin
+           (engine.phase_journal_v1) after the state write; PROJECT_STATE
+           keeps only the current phase. A legacy "phase_history" list is
+           moved into the journal on the next write.
+- index    every versioned write of projects/<ID>/PROJECT_STATE.json is
+           mirrored into engine.project_index_v1 (SQLite) under the same lock
+- reads    parsed documents are cached per process, keyed by
+           (st_ino, st_size, st_mtime_ns); os.replace gives every write a new
+           inode, so a changed file is never served from the cache
+
+read_json()/load() return private copies; peek()/phase() return the shared
+cached snapshot for read-only hot paths (do not mutate it).
+
+Disable fsync (tmpfs, benchmarks) with FLOWMIND_STATE_FSYNC=0.
+"""
+
+from __future__ import annotations
+
+import copy
+import fcntl
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+STATE_FILE = "PROJECT_STATE.json"
+VERSION_KEY = "state_version"
+PENDING_KEY = "_phase_journal_pending"   # transition() -> journal, never written to the document
+
+PathLike = Union[str, Path]
+Mutator = Callable[[Dict[str, Any]], Optional[bool]]
+
+_CACHE: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+_CACHE_LOCK = threading.Lock()
+_THREAD_LOCKS: Dict[str, threading.Lock] = {}
+
+
+class StateConflict(RuntimeError):
+    """save(expected_version=N) found a different version on disk."""
+
+    def __init__(self, path: PathLike, expected: int, found: int):
+        super().__init__(f"state conflict on {path}: expected version {expected}, found {found}")
+        self.path = str(path)
+        self.expected = expected
+        self.found = found
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def fsync_enabled() -> bool:
+    return os.getenv("FLOWMIND_STATE_FSYNC", "1").strip() not in ("0", "false", "no", "off")
+
+
+def state_path(project_id: str) -> Path:
+    return Path("projects") / project_id / STATE_FILE
+
+
+def version(state: Dict[str, Any]) -> int:
+    try:
+        return int(state.get(VERSION_KEY) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# -----------------------
+# raw documents
+# -----------------------
+def write_json(path: PathLike, data: Dict[str, Any]) -> None:
+    """Atomic, durable whole-file write (no version bump)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sync = fsync_enabled()
+    try:
+        mode = os.stat(path).st_mode & 0o777  # keep e.g. project_ctl's read-only lock
+    except OSError:
+        mode = 0o644
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        os.fchmod(tmp_fd, mode)
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    if sync:
+        dfd = os.open(str(path.parent), os.O_RDONLY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+
+
+def _signature(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def peek(path: PathLike) -> Dict[str, Any]:
+    """Shared cached snapshot ({} if missing/unreadable). Read-only."""
+    key = os.path.abspath(path)
+    try:
+        sig = _signature(os.stat(key))
+    except OSError:
+        with _CACHE_LOCK:
+            _CACHE.pop(key, None)
+        return {}
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    try:
+        with open(key, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    with _CACHE_LOCK:
+        _CACHE[key] = (sig, data)
+    return data
+
+
+def read_json(path: PathLike) -> Dict[str, Any]:
+    """Private copy of the document ({} if missing/unreadable)."""
+    return copy.deepcopy(peek(path))
+
+
+@contextmanager
+def locked(path: PathLike) -> Iterator[None]:
+    """Exclusive writer lock for one document (threads + processes)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = path.with_name(f".{path.name}.lock")
+    key = os.path.abspath(lock_path)
+    with _CACHE_LOCK:
+        tlock = _THREAD_LOCKS.setdefault(key, threading.Lock())
+    with tlock:  # flock is per open file description: serialize this process's threads first
+        with open(lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _project_key(path: PathLike) -> Optional[str]:
+    p = Path(os.path.abspath(path))
+    if p.name == STATE_FILE and p.parent.parent == Path(os.path.abspath("projects")):
+        return p.parent.name
+    return None
+
+
+def _migrate_history(key: Optional[str], state: Dict[str, Any]) -> None:
+    # legacy capped list -> phase journal (once), then it leaves the state document
+    if key is None or not isinstance(state.get("phase_history"), list):
+        return
+    from engine import phase_journal_v1
+    jpath = Path("projects") / key / phase_journal_v1.JOURNAL_FILE
+    if not jpath.exists():
+        phase_journal_v1.append_to(jpath, state["phase_history"], sync=fsync_enabled())
+    state.pop("phase_history")
+
+
+def _commit(path: PathLike, key: Optional[str], doc: Dict[str, Any]) -> None:
+    """Write the document, then its journal entries, then the index row (caller holds the lock)."""
+    entries = doc.pop(PENDING_KEY, None) or []
+    write_json(path, doc)
+    if key is None:
+        return
+    from engine import phase_journal_v1, project_index_v1
+    if entries:
+        phase_journal_v1.append_to(Path("projects") / key / phase_journal_v1.JOURNAL_FILE, entries,
+                                   sync=fsync_enabled())
+    project_index_v1.record(key, doc)
+
+
+def save_json(path: PathLike, data: Dict[str, Any], expected_version: Optional[int] = None) -> Dict[str, Any]:
+    """Versioned write. Returns the document as written (with the new state_version)."""
+    key = _project_key(path)
+    with locked(path):
+        current = version(peek(path))
+        if expected_version is not None and current != expected_version:
+            raise StateConflict(path, expected_version, current)
+        doc = {**data, VERSION_KEY: current + 1}
+        _migrate_history(key, doc)
+        _commit(path, key, doc)
+    return doc
+
+
+def update_json(path: PathLike, fn: Mutator, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Locked read-modify-write: fn(state) mutates a fresh copy in place.
+    fn returning False skips the write (precondition no longer holds).
+    A missing document starts from `default` (or is left alone if default is None).
+    Returns the resulting state.
+    """
+    key = _project_key(path)
+    with locked(path):
+        state = read_json(path)
+        if not state:
+            if default is None:
+                return {}
+            state = copy.deepcopy(default)
+        _migrate_history(key, state)
+        if fn(state) is False:
+            state.pop(PENDING_KEY, None)
+            return state
+        state[VERSION_KEY] = version(state) + 1
+        _commit(path, key, state)
+    return state
+
+
+# -----------------------
+# PROJECT_STATE
+# -----------------------
+def exists(project_id: str) -> bool:
+    return state_path(project_id).exists()
+
+
+def load(project_id: str) -> Dict[str, Any]:
+    return read_json(state_path(project_id))
+
+
+def phase(project_id: str) -> Optional[str]:
+    return peek(state_path(project_id)).get("phase")
+
+
+def save(project_id: str, state: Dict[str, Any], expected_version: Optional[int] = None) -> Dict[str, Any]:
+    return save_json(state_path(project_id), state, expected_version)
+
+
+def update(project_id: str, fn: Mutator, create: bool = False) -> Dict[str, Any]:
+    return update_json(state_path(project_id), fn, {"project_id": project_id} if create else None)
+
+
+def transition(state: Dict[str, Any], new_phase: str, now: Optional[str] = None, **entry: Any) -> Dict[str, Any]:
+    """Set phase + updated_at and queue a phase journal entry (extra keys go into the entry)."""
+    now = now or _utc_now_iso()
+    state["phase"] = new_phase
+    state["updated_at"] = now
+    state.setdefault(PENDING_KEY, []).append({"at": now, "phase": new_phase, **entry})
+    return state
+
+
+def halt(state: Dict[str, Any], reason: str, now: Optional[str] = None) -> Dict[str, Any]:
+    state["halted"] = True
+    state["halt_reason"] = reason
+    return transition(state, "HALT", now=now, reason=reason)
+
+
+def clear_halt(state: Dict[str, Any]) -> Dict[str, Any]:
+    state.pop("halted", None)
+    state.pop("halt_reason", None)
+    return state
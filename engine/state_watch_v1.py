@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — State Watch v1 (event-driven loop wake-ups)
+
+StateWatcher(project_id).wait(timeout) blocks until one of:
+- "state"   projects/<ID>/PROJECT_STATE.json changed (inotify on Linux,
+            stat polling elsewhere — same semantics, just slower)
+- "event"   notify() was called (Telegram poller event, station completion)
+- "timeout" nothing happened
+
+Backoff gives the idle timeout: 0.5s after activity, doubling up to 30s.
+Latency of a real change never depends on the backoff — only idle ticks do.
+
+watch_loop(project_id, tick) drives fm.py --watch and autopilot_loop.py --watch.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEAD = struct.Struct("iIII")
+
+STAT_POLL_SEC = 0.5
+
+
+class Backoff:
+    def __init__(self, start: float = 0.5, maximum: float = 30.0):
+        self.start = start
+        self.maximum = maximum
+        self.current = start
+
+    def reset(self) -> None:
+        self.current = self.start
+
+    def next(self) -> float:
+        value = self.current
+        self.current = min(self.maximum, self.current * 2)
+        return value
+
+
+def _inotify_libc():
+    if os.name != "posix":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class StateWatcher:
+    def __init__(self, project_id: str, filename: str = "PROJECT_STATE.json"):
+        self.path = Path("projects") / project_id / filename
+        self._rfd, self._wfd = os.pipe()
+        os.set_blocking(self._rfd, False)
+        os.set_blocking(self._wfd, False)
+        self._ifd: Optional[int] = None
+        self._last_stat = self._stat()
+
+        libc = _inotify_libc()
+        if libc is not None and self.path.parent.is_dir():
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+                if libc.inotify_add_watch(fd, str(self.path.parent).encode(), mask) >= 0:
+                    self._ifd = fd
+                else:
+                    os.close(fd)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._ifd is not None else "stat"
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def notify(self) -> None:
+        """Wake a waiter from any thread (self-pipe)."""
+        try:
+            os.write(self._wfd, b"!")
+        except (BlockingIOError, OSError):
+            pass  # pipe full = wake-up already pending
+
+    def _drain_pipe(self) -> bool:
+        woke = False
+        while True:
+            try:
+                if not os.read(self._rfd, 512):
+                    return woke
+                woke = True
+            except BlockingIOError:
+                return woke
+
+    def _drain_inotify(self) -> bool:
+        hit = False
+        while True:
+            try:
+                buf = os.read(self._ifd, 4096)  # type: ignore[arg-type]
+            except BlockingIOError:
+                return hit
+            i = 0
+            while i + _EVENT_HEAD.size <= len(buf):
+                _, _, _, name_len = _EVENT_HEAD.unpack_from(buf, i)
+                name = buf[i + _EVENT_HEAD.size:i + _EVENT_HEAD.size + name_len].rstrip(b"\0")
+                if name.decode(errors="replace") == self.path.name:
+                    hit = True
+                i += _EVENT_HEAD.size + name_len
+
+    def _stat_changed(self) -> bool:
+        now = self._stat()
+        if now != self._last_stat:
+            self._last_stat = now
+            return True
+        return False
+
+    def wait(self, timeout: float) -> str:
+        deadline = time.monotonic() + max(0.0, timeout)
+        fds: List[int] = [self._rfd] + ([self._ifd] if self._ifd is not None else [])
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._last_stat = self._stat()
+                return "timeout"
+            slice_sec = remaining if self._ifd is not None else min(remaining, STAT_POLL_SEC)
+            ready, _, _ = select.select(fds, [], [], slice_sec)
+            if self._rfd in ready and self._drain_pipe():
+                self._last_stat = self._stat()
+                return "event"
+            if self._ifd is not None:
+                if self._ifd in ready and self._drain_inotify():
+                    self._last_stat = self._stat()
+                    return "state"
+            elif self._stat_changed():
+                return "state"
+
+    def close(self) -> None:
+        for fd in (self._rfd, self._wfd, self._ifd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._ifd = None
+
+
+def _phase(path: Path) -> Optional[str]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("phase")
+    except Exception:
+        return None
+
+
+def watch_loop(project_id: str, tick: Callable[[], Optional[str]], max_idle: float = 30.0) -> None:
+    """
+    Run tick() until it returns "STOP".
+    - phase moved during the tick (station completed) -> tick again immediately
+    - otherwise sleep until state change / poller event / idle backoff
+    """
+    watcher = StateWatcher(project_id)
+    backoff = Backoff(maximum=max_idle)
+
+    from engine.telegram_poller_v1 import active_poller
+
+    def on_event(ev) -> None:
+        if ev["project_id"] == project_id.upper():
+            watcher.notify()
+
+    poller = active_poller()
+    if poller is not None:
+        poller.subscribe(on_event)
+
+    print(f"[WATCH] project={project_id} mode={watcher.mode} max_idle={max_idle:.0f}s")
+    try:
+        while True:
+            before = _phase(watcher.path)
+            if tick() == "STOP":
+                return
+            if _phase(watcher.path) != before:
+                backoff.reset()
+                continue
+            timeout = backoff.next()
+            reason = watcher.wait(timeout)
+            if reason != "timeout":
+                backoff.reset()
+                print(f"[WATCH] wake: {reason}")
+    finally:
+        if poller is not None:
+            poller.unsubscribe(on_event)
+        watcher.close()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Station Transactions v1 (write-ahead intent log for multi-file outputs)
+
+A station that writes several files (final.mp4 + ffprobe.json + its marker)
+used to write them one after another in place: a crash in between left a new
+final.mp4 next to the old ffprobe.json, or a half-written marker. With a
+transaction every output is produced next to its target and published in one
+commit:
+
+  stage    txn.stage(target) -> <target dir>/.txn-<txid>/<name>
+           (same directory = same filesystem, so publishing is a rename)
+  log      projects/<ID>/.txn/<txid>.json  {"state": "STAGING", "outputs": [...]}
+  commit   fsync staged files -> log state COMMITTING (durable) -> os.replace
+           every output in stage order (marker last) -> fsync dirs -> drop log
+  recover  a log left behind by a dead process is resolved:
+             COMMITTING  roll forward: publish what is still staged (the encode
+                         is never redone)
+             STAGING     roll back: delete the staged files, the previous
+                         outputs are untouched and still consistent
+           a COMMITTING log whose staged output is gone cannot be rolled either
+           way (some outputs may already be new): nothing is deleted, the log
+           is kept as UNRECOVERABLE and the project is HALTed so the station
+           runs again; its next successful commit drops the log
+
+transaction() recovers the project before it starts a new one; the recover
+bridge does the same before resuming a HALTed project.
+
+Usage:
+  python -m engine.station_txn_v1 <PROJECT_ID>      (recover + report)
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Union
+
+from engine import state_store_v1
+
+TXN_DIR = ".txn"
+STAGE_PREFIX = ".txn-"
+
+STAGING = "STAGING"
+COMMITTING = "COMMITTING"
+UNRECOVERABLE = "UNRECOVERABLE"
+
+PathLike = Union[str, Path]
+
+_ACTIVE: Set[str] = set()   # txids open in this process (recover() leaves them alone)
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def log_dir(project_id: str) -> Path:
+    return Path("projects") / project_id / TXN_DIR
+
+
+def _fsync_path(path: Path, directory: bool = False) -> None:
+    if not state_store_v1.fsync_enabled():
+        return
+    fd = os.open(str(path), os.O_RDONLY | (os.O_DIRECTORY if directory else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Transaction:
+    """Staged outputs of one station run. Use through transaction()."""
+
+    def __init__(self, project_id: str, station: str):
+        self.project_id = project_id
+        self.station = station
+        self.txid = f"{station.lower()}-{os.getpid()}-{time.time_ns()}"
+        self.log_path = log_dir(project_id) / f"{self.txid}.json"
+        self.outputs: List[Dict[str, str]] = []
+        self.started_at = _utc_now_iso()
+        self.committed = False
+        self.publishing = False
+
+    def _log(self, state: str) -> None:
+        state_store_v1.write_json(self.log_path, {
+            "txid": self.txid,
+            "project_id": self.project_id,
+            "station": self.station,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "started_at": self.started_at,
+            "state": state,
+            "outputs": self.outputs,
+        })
+
+    def begin(self) -> "Transaction":
+        with _ACTIVE_LOCK:
+            _ACTIVE.add(self.txid)
+        self._log(STAGING)
+        return self
+
+    def close(self) -> None:
+        with _ACTIVE_LOCK:
+            _ACTIVE.discard(self.txid)
+
+    def stage(self, target: PathLike) -> Path:
+        """Staging path for target (idempotent). Write the output there."""
+        target = Path(target).resolve()
+        for o in self.outputs:
+            if o["target"] == str(target):
+                return Path(o["staged"])
+        staged = target.parent / f"{STAGE_PREFIX}{self.txid}" / target.name
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        self.outputs.append({"target": str(target), "staged": str(staged)})
+        self._log(STAGING)  # log before the file exists: rollback always knows where to look
+        return staged
+
+    def write_text(self, target: PathLike, text: str) -> Path:
+        staged = self.stage(target)
+        staged.write_text(text, encoding="utf-8")
+        return staged
+
+    def staged_cmd(self, cmd: List[str]) -> List[str]:
+        """argv with every staged target replaced by its staging path."""
+        swap = {o["target"]: o["staged"] for o in self.outputs}
+        return [swap.get(a, a) for a in cmd]
+
+    def commit(self) -> None:
+        missing = [o["staged"] for o in self.outputs if not os.path.exists(o["staged"])]
+        if missing:
+            raise RuntimeError(f"txn {self.txid}: staged output missing: {', '.join(missing)}")
+        for o in self.outputs:
+            _fsync_path(Path(o["staged"]))
+            o["ino"] = os.stat(o["staged"]).st_ino  # survives the rename: recover() knows what is published
+        self._log(COMMITTING)  # point of no return: recover() rolls forward from here
+        self.publishing = True
+        _publish(self.outputs)  # on error the log + staged files stay for recover()
+        _finish(self.log_path, self.outputs)
+        self.committed = True
+        _supersede(self.project_id, self.station)
+
+    def rollback(self) -> None:
+        if self.publishing:
+            return  # past COMMITTING: only rolling forward keeps the outputs consistent
+        _discard(self.outputs)
+        _finish(self.log_path, self.outputs)
+
+
+def _publish(outputs: List[Dict[str, str]]) -> Dict[str, int]:
+    moved = already = 0
+    for o in outputs:
+        if os.path.exists(o["staged"]):
+            os.replace(o["staged"], o["target"])
+            moved += 1
+        elif _published(o):
+            already += 1  # published before the crash
+        else:
+            raise RuntimeError(f"txn output lost: {o['target']} (staged {o['staged']} missing)")
+    for d in sorted({str(Path(o["target"]).parent) for o in outputs}):
+        _fsync_path(Path(d), directory=True)
+    return {"moved": moved, "already": already}
+
+
+def _published(o: Dict[str, Any]) -> bool:
+    try:
+        ino = os.stat(o["target"]).st_ino
+    except OSError:
+        return False
+    return "ino" not in o or ino == o["ino"]  # an old output with the staged file lost is not
+
+
+def _discard(outputs: List[Dict[str, str]]) -> None:
+    for o in outputs:
+        try:
+            os.remove(o["staged"])
+        except OSError:
+            pass
+
+
+def _finish(log_path: Path, outputs: List[Dict[str, str]]) -> None:
+    for d in {str(Path(o["staged"]).parent) for o in outputs}:
+        shutil.rmtree(d, ignore_errors=True)
+    try:
+        os.remove(log_path)
+        os.rmdir(log_path.parent)  # only if no other transaction is in flight
+    except OSError:
+        pass
+
+
+def _supersede(project_id: str, station: str) -> None:
+    # a fresh commit of the station replaced every output an UNRECOVERABLE log left mixed
+    for doc in pending(project_id):
+        if doc.get("state") == UNRECOVERABLE and doc.get("station") == station:
+            outputs = doc.get("outputs") or []
+            _discard(outputs)
+            _finish(Path(doc["_path"]), outputs)
+
+
+def _halt(project_id: str, reason: str) -> None:
+    if state_store_v1.exists(project_id):
+        state_store_v1.update(project_id, lambda state: state_store_v1.halt(state, reason))
+
+
+@contextmanager
+def transaction(project_id: str, station: str) -> Iterator[Transaction]:
+    """
+    Staged multi-file write; rolled back unless txn.commit() ran. A commit
+    that fails after COMMITTING keeps its log and staged files: the next
+    transaction()/recover() on the project rolls it forward.
+    """
+    recover(project_id)
+    txn = Transaction(project_id, station).begin()
+    try:
+        yield txn
+    finally:
+        if not txn.committed:
+            txn.rollback()
+        txn.close()
+
+
+def pending(project_id: str) -> List[Dict[str, Any]]:
+    d = log_dir(project_id)
+    if not d.is_dir():
+        return []
+    logs = []
+    for p in sorted(d.glob("*.json")):
+        doc = state_store_v1.read_json(p)
+        if doc:
+            doc["_path"] = str(p)
+            logs.append(doc)
+    return logs
+
+
+def recover(project_id: str) -> List[Dict[str, Any]]:
+    """Resolve intent logs of dead writers. Returns one result per log handled."""
+    results: List[Dict[str, Any]] = []
+    host = socket.gethostname()
+    for doc in pending(project_id):
+        log_path = Path(doc.pop("_path"))
+        outputs = doc.get("outputs") or []
+        pid = int(doc.get("pid") or 0)
+        with _ACTIVE_LOCK:
+            active = doc.get("txid") in _ACTIVE
+        if active or (doc.get("host") == host and pid and pid != os.getpid() and _pid_alive(pid)):
+            continue  # writer still running
+        if doc.get("state") == UNRECOVERABLE:
+            continue  # already reported + HALTed, waits for the station to run again
+        result = {"txid": doc.get("txid"), "station": doc.get("station"), "state": doc.get("state")}
+        if doc.get("state") == COMMITTING:
+            try:
+                result.update(action="ROLL_FORWARD", **_publish(outputs))
+            except RuntimeError as e:
+                # a staged output is gone and earlier ones may be published: neither
+                # direction restores a consistent set, so keep everything and HALT
+                state_store_v1.write_json(log_path, {**doc, "state": UNRECOVERABLE, "error": str(e)})
+                _halt(project_id, f"{doc.get('station')} txn {doc.get('txid')} unrecoverable: {e}")
+                result.update(action="HALT", error=str(e))
+                results.append(result)
+                continue
+            except OSError as e:
+                # ENOSPC & co: keep log + staged files, the next recover() retries
+                result.update(action="RETRY", error=str(e))
+                results.append(result)
+                continue
+        else:
+            _discard(outputs)
+            result["action"] = "ROLL_BACK"
+        _finish(log_path, outputs)
+        results.append(result)
+    return results
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2:
+        print("Usage: python -m engine.station_txn_v1 <PROJECT_ID>", file=sys.stderr)
+        return 2
+    results = recover(argv[1])
+    for r in results:
+        extra = f" error={r['error']}" if "error" in r else ""
+        print(f"[STATION_TXN] {r['txid']} station={r['station']} state={r['state']} -> {r['action']}{extra}")
+    print(f"[STATION_TXN] {argv[1]}: {len(results)} transaction(s) recovered, {len(pending(argv[1]))} in flight")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
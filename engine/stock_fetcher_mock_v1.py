@@ -7,7 +7,7 @@ Input:
 - argv[1] = PROJECT_ID
 
 Reads/Writes:
-- projects/<PROJECT_ID>/ASSET_MANIFEST.json  (in-place update, deterministic)
+- projects/<PROJECT_ID>/ASSET_MANIFEST.json  (atomic rewrite, deterministic)
 
 Behavior:
 - Does NOT download anything.
@@ -27,6 +27,8 @@ import json
 import hashlib
 from datetime import datetime
 
+from engine import state_store_v1
+
 BASE_DIR = "projects"
 
 
@@ -105,8 +107,8 @@ def main(argv) -> int:
         "pending_remaining": len([x for x in items if x.get("status") == "PENDING"]),
     }
 
-    with open(mp, "w", encoding="utf-8") as f:
-        json.dump(man, f, indent=2, ensure_ascii=False)
+    # temp file + rename: a crash never leaves a truncated manifest
+    state_store_v1.write_json(mp, man)
 
     print(f"[STOCK_MOCK PASS] found_now={changed} updated: {mp}")
     return 0
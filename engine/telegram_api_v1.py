@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Telegram API v1 (Bot API endpoint resolution)
+
+Every approval-path module builds its Bot API URLs here:
+  <TELEGRAM_API_BASE>/bot<TOKEN>/<method>
+
+TELEGRAM_API_BASE defaults to https://api.telegram.org. Point it at a local
+Bot API server (or tools/fake_telegram_api.py for offline load tests):
+  TELEGRAM_API_BASE=http://127.0.0.1:8081
+"""
+
+from __future__ import annotations
+
+import os
+
+DEFAULT_API_BASE = "https://api.telegram.org"
+
+
+def api_base() -> str:
+    return (os.getenv("TELEGRAM_API_BASE") or DEFAULT_API_BASE).strip().rstrip("/")
+
+
+def bot_url(token: str, method: str = "") -> str:
+    url = f"{api_base()}/bot{token}"
+    return f"{url}/{method}" if method else url
@@ -18,6 +18,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
+from engine import telegram_api_v1
+
 
 def _try_load_dotenv() -> None:
     # best-effort; do not crash if missing
@@ -61,7 +63,7 @@ def _send_telegram(text: str) -> Tuple[bool, str]:
     if not token or not chat_id:
         return False, "Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID in env (.env not loaded?)"
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    url = telegram_api_v1.bot_url(token, "sendMessage")
     data = urllib.parse.urlencode(
         {
             "chat_id": chat_id,
@@ -88,6 +90,9 @@ def build_message(project_id: str, pack: Dict[str, Any]) -> str:
     qa = art.get("final_qa") or {}
 
     dur = (pack.get("summary") or {}).get("duration_sec")
+    tier = (pack.get("summary") or {}).get("render_tier") or "full"
+    if tier == "preview":
+        tier += " 640x360 (1080p рендериться після APPROVE)"
     size = int(fv.get("bytes") or 0)
     sha = _short_hash(str(fv.get("sha256") or ""))
     qa_sha = _short_hash(str(qa.get("sha256") or ""))
@@ -97,6 +102,7 @@ def build_message(project_id: str, pack: Dict[str, Any]) -> str:
         f"<b>project</b>: {project_id}\n"
         f"<b>duration</b>: {dur}s\n"
         f"<b>final.mp4</b>: {_fmt_bytes(size)} | sha256:{sha}\n"
+        f"<b>render</b>: {tier}\n"
         f"<b>FINAL_QA</b>: sha256:{qa_sha}\n\n"
         f"Відповідь одним словом у чат:\n"
         f"✅ <b>APPROVE {project_id}</b>  або  ❌ <b>REJECT {project_id}</b>\n\n"
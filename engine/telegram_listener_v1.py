@@ -25,6 +25,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Tuple
 
+from engine import state_store_v1, telegram_api_v1
+
 
 STATE_FILE = Path("telegram_listener_state.json")
 
@@ -46,7 +48,7 @@ def _get_updates(offset: int | None) -> Tuple[bool, Dict[str, Any]]:
     if not token:
         return False, {"error": "No TELEGRAM_BOT_TOKEN"}
 
-    url = f"https://api.telegram.org/bot{token}/getUpdates"
+    url = telegram_api_v1.bot_url(token, "getUpdates")
     params = {"timeout": 5}
     if offset:
         params["offset"] = offset
@@ -63,35 +65,16 @@ def _get_updates(offset: int | None) -> Tuple[bool, Dict[str, Any]]:
 
 
 def _load_listener_state() -> Dict[str, Any]:
-    if STATE_FILE.exists():
-        return json.loads(STATE_FILE.read_text())
-    return {"last_update_id": None}
-
-
-def _save_listener_state(data: Dict[str, Any]):
-    STATE_FILE.write_text(json.dumps(data, indent=2))
+    return state_store_v1.read_json(STATE_FILE) or {"last_update_id": None}
 
 
 def _update_project_state(project_id: str, new_phase: str):
-    state_path = Path("projects") / project_id / "PROJECT_STATE.json"
-    if not state_path.exists():
-        return
-
-    state = json.loads(state_path.read_text())
-    now = _utc_now_iso()
+    def apply(state):
+        state["approval_status"] = new_phase
+        state_store_v1.clear_halt(state)
+        state_store_v1.transition(state, new_phase)
 
-    state["phase"] = new_phase
-    state["approval_status"] = new_phase
-    state["updated_at"] = now
-
-    hist = state.get("phase_history", [])
-    hist.append({"at": now, "phase": new_phase})
-    state["phase_history"] = hist[-50:]
-
-    state.pop("halted", None)
-    state.pop("halt_reason", None)
-
-    state_path.write_text(json.dumps(state, indent=2))
+    state_store_v1.update(project_id, apply)
 
 
 def _parse_command(text: str) -> Tuple[str | None, str | None]:
@@ -122,6 +105,7 @@ def main():
         print("[LISTENER] No new messages")
         return
 
+    next_offset = offset
     for upd in results:
         update_id = upd["update_id"]
         message = upd.get("message", {})
@@ -132,9 +116,13 @@ def main():
             print(f"[LISTENER] {phase} detected for {project_id}")
             _update_project_state(project_id, phase)
 
-        listener_state["last_update_id"] = update_id + 1
+        next_offset = update_id + 1
+
+    def advance(state):
+        # merge: a poller in another process may have written offset/pending meanwhile
+        state["last_update_id"] = max(next_offset, int(state.get("last_update_id") or 0))
 
-    _save_listener_state(listener_state)
+    state_store_v1.update_json(STATE_FILE, advance, {"last_update_id": None})
     print("[LISTENER] Done.")
 
 
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Telegram Poller v1 (shared long-poll, per-project fan-out)
+
+One daemon thread per process:
+- advances the shared getUpdates offset in telegram_listener_state.json
+- keeps ONE persistent HTTP session (requests.Session, keep-alive)
+- long-polls (timeout=FLOWMIND_TG_POLL_TIMEOUT, default 25s)
+- parses APPROVE/REJECT <PROJECT_ID> (same grammar as telegram_listener_v1)
+- fans events out to per-project in-process queues for the projects this
+  process ticks (every project listen_once() was called for); events for any
+  other project are applied right away, like telegram_listener_v1 does, so a
+  second orchestrator's approval never waits on this process
+
+Ticks call listen_once(project_id): a local queue read + state apply.
+Without an active poller listen_once() falls back to telegram_listener_v1.main().
+
+Durability: parsed events are kept in the listener state file ("pending",
+tagged with the owning pid/host) together with the offset, and only removed
+(ack) once they are applied, so a crash never loses an approval. The file is shared by every poller/listener
+process: offset and pending are merged under state_store_v1.update_json, and
+a starting poller applies pending events whose owner process is gone.
+
+Usage (standalone daemon, applies events as they arrive):
+  python -m engine.telegram_poller_v1
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from engine import state_store_v1, telegram_api_v1
+from engine import telegram_listener_v1 as listener
+
+DEFAULT_POLL_TIMEOUT = 25
+MAX_BACKOFF_SEC = 30.0
+
+_ACTIVE: Optional["TelegramPoller"] = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _poll_timeout() -> int:
+    try:
+        return max(0, int(os.getenv("FLOWMIND_TG_POLL_TIMEOUT", DEFAULT_POLL_TIMEOUT)))
+    except ValueError:
+        return DEFAULT_POLL_TIMEOUT
+
+
+def _owner_alive(ev: Dict[str, Any]) -> bool:
+    if ev.get("host") != socket.gethostname() or not ev.get("pid"):
+        return False
+    try:
+        os.kill(int(ev["pid"]), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+def apply_events(events: List[Dict[str, Any]]) -> int:
+    for ev in events:
+        listener._update_project_state(ev["project_id"], ev["phase"])
+        print(f"[POLLER] {ev['phase']} applied for {ev['project_id']} (update {ev['update_id']})")
+    return len(events)
+
+
+class TelegramPoller:
+    def __init__(self, poll_timeout: Optional[int] = None):
+        self.poll_timeout = _poll_timeout() if poll_timeout is None else poll_timeout
+        self._queues: Dict[str, "queue.Queue[Dict[str, Any]]"] = {}
+        self._lock = threading.Lock()           # queues + pending + state file
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._session = None
+        self._consumers: set = set()           # projects ticked in this process
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+
+    # -----------------------
+    # lifecycle
+    # -----------------------
+    def start(self) -> "TelegramPoller":
+        if self._thread is not None:
+            return self
+        listener._load_env()
+        import requests
+
+        self._session = requests.Session()
+        # approvals parsed by a process that died before applying them
+        orphans = [ev for ev in listener._load_listener_state().get("pending") or [] if not _owner_alive(ev)]
+        apply_events(orphans)
+        self._save_state(None, removed=[ev["update_id"] for ev in orphans])
+        self._thread = threading.Thread(target=self._run, name="fm-telegram-poller", daemon=True)
+        self._thread.start()
+        print(f"[POLLER] started long_poll={self.poll_timeout}s recovered={len(orphans)}")
+        return self
+
+    def stop(self, apply_pending: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            # An in-flight long-poll may not return before its timeout; the thread is a daemon.
+            self._thread.join(timeout=2.0)
+        if apply_pending:
+            with self._lock:
+                project_ids = list(self._queues)
+            for pid in project_ids:
+                self.apply_queued(pid)
+        if self._session is not None:
+            self._session.close()
+        print("[POLLER] stopped")
+
+    # -----------------------
+    # consumer side
+    # -----------------------
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """callback(event) runs on the poller thread right after an event is queued."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _queue(self, project_id: str) -> "queue.Queue[Dict[str, Any]]":
+        q = self._queues.get(project_id)
+        if q is None:
+            q = self._queues[project_id] = queue.Queue()
+        return q
+
+    def drain(self, project_id: str) -> List[Dict[str, Any]]:
+        """
+        Take every queued event for one project (non-blocking). They stay in the
+        persisted pending list until ack(): a crash before that keeps them.
+        """
+        with self._lock:
+            project_id = project_id.upper()
+            self._consumers.add(project_id)
+            return self._take(self._queue(project_id))
+
+    def ack(self, update_ids: Sequence[int]) -> None:
+        """Drop applied events from the persisted pending list."""
+        if update_ids:
+            with self._lock:
+                self._save_state(None, removed=update_ids)
+
+    def apply_queued(self, project_id: str) -> int:
+        """drain() + apply + ack(); events not applied (exception) go back to the queue."""
+        events = self.drain(project_id)
+        applied = 0
+        try:
+            for ev in events:
+                apply_events([ev])
+                applied += 1
+        finally:
+            self.ack([ev["update_id"] for ev in events[:applied]])
+            if applied < len(events):
+                with self._lock:
+                    q = self._queue(project_id.upper())
+                    for ev in events[applied:] + self._take(q):  # keep arrival order
+                        q.put(ev)
+        return applied
+
+    @staticmethod
+    def _take(q: "queue.Queue[Dict[str, Any]]") -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        while True:
+            try:
+                events.append(q.get_nowait())
+            except queue.Empty:
+                return events
+
+    # -----------------------
+    # producer side
+    # -----------------------
+    def _save_state(self, offset: Optional[int], added: Sequence[Dict[str, Any]] = (),
+                    removed: Sequence[int] = ()) -> None:
+        """Merge into the shared listener state: other processes' pending events are kept."""
+        gone = set(removed)
+
+        def apply(state: Dict[str, Any]) -> Optional[bool]:
+            if offset is None and not added and not gone:
+                return False
+            if offset is not None:
+                state["last_update_id"] = max(offset, int(state.get("last_update_id") or 0))
+            pending = [ev for ev in state.get("pending") or [] if ev.get("update_id") not in gone]
+            known = {ev.get("update_id") for ev in pending}
+            pending.extend(ev for ev in added if ev["update_id"] not in known)
+            state["pending"] = pending
+            return None
+
+        state_store_v1.update_json(listener.STATE_FILE, apply, {"last_update_id": None})
+
+    def _fetch(self, offset: Optional[int]) -> Tuple[bool, Dict[str, Any]]:
+        token = os.getenv("TELEGRAM_BOT_TOKEN")
+        if not token:
+            return False, {"error": "No TELEGRAM_BOT_TOKEN"}
+        params: Dict[str, Any] = {"timeout": self.poll_timeout}
+        if offset:
+            params["offset"] = offset
+        try:
+            resp = self._session.post(
+                telegram_api_v1.bot_url(token, "getUpdates"),
+                data=params,
+                timeout=self.poll_timeout + 10,
+            )
+            return True, resp.json()
+        except Exception as e:
+            return False, {"error": str(e)}
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            # Re-read: a plain listener run in another process may have advanced it
+            offset = listener._load_listener_state().get("last_update_id")
+            ok, data = self._fetch(offset)
+            if not ok or not data.get("ok"):
+                print(f"[POLLER] getUpdates failed: {data.get('error') or data.get('description')}")
+                self._stop.wait(backoff)
+                backoff = min(MAX_BACKOFF_SEC, backoff * 2)
+                continue
+            backoff = 1.0
+
+            results = data.get("result", [])
+            if not results:
+                continue
+
+            queued: List[Dict[str, Any]] = []
+            foreign: List[Dict[str, Any]] = []
+            with self._lock:
+                next_offset = offset
+                for upd in results:
+                    update_id = upd["update_id"]
+                    text = (upd.get("message") or {}).get("text", "")
+                    phase, project_id = listener._parse_command(text)
+                    if phase and project_id:
+                        ev = {
+                            "update_id": update_id,
+                            "project_id": project_id,
+                            "phase": phase,
+                            "received_at": listener._utc_now_iso(),
+                            "pid": os.getpid(),
+                            "host": socket.gethostname(),
+                        }
+                        if project_id in self._consumers:
+                            print(f"[POLLER] {phase} queued for {project_id}")
+                            queued.append(ev)
+                        else:
+                            foreign.append(ev)
+                    next_offset = update_id + 1
+                # offset + pending in one write; every event stays pending until applied
+                self._save_state(next_offset, added=queued + foreign)
+                for ev in queued:
+                    self._queue(ev["project_id"]).put(ev)
+
+            # not ticked here: apply now, as the plain listener would
+            for ev in foreign:
+                try:
+                    apply_events([ev])
+                except Exception as e:
+                    print(f"[POLLER] {ev['phase']} for {ev['project_id']} not applied (kept pending): {e}")
+                    continue
+                self.ack([ev["update_id"]])
+
+            for ev in queued:
+                for callback in list(self._subscribers):
+                    try:
+                        callback(ev)
+                    except Exception as e:
+                        print(f"[POLLER] subscriber error: {e}")
+
+
+# -----------------------
+# process-wide accessor
+# -----------------------
+def start_poller(poll_timeout: Optional[int] = None) -> TelegramPoller:
+    global _ACTIVE
+    with _ACTIVE_LOCK:
+        if _ACTIVE is None:
+            _ACTIVE = TelegramPoller(poll_timeout).start()
+        return _ACTIVE
+
+
+def active_poller() -> Optional[TelegramPoller]:
+    return _ACTIVE
+
+
+def stop_poller(apply_pending: bool = True) -> None:
+    global _ACTIVE
+    with _ACTIVE_LOCK:
+        poller, _ACTIVE = _ACTIVE, None
+    if poller is not None:
+        poller.stop(apply_pending=apply_pending)
+
+
+def listen_once(project_id: str) -> None:
+    """Tick entry point: queue read when a poller runs in this process, else one plain poll."""
+    poller = active_poller()
+    if poller is None:
+        listener.main()
+        return
+    if not poller.apply_queued(project_id):
+        print("[LISTENER] No new messages")
+
+
+def main(argv: List[str]) -> int:
+    poller = start_poller()
+    try:
+        while True:
+            time.sleep(1)
+            with poller._lock:
+                project_ids = list(poller._queues)
+            for pid in project_ids:
+                poller.apply_queued(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_poller()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Thumbnail Engine v1 (batched, cached text thumbnails)
+
+render_batch([(out_path, line1, line2), ...]) renders every candidate at once:
+- cache: assets/cache/_shared/thumbs/<key>.jpg, key = sha256(text + layout + renderer)
+  -> a hook that was rendered before (REGEN_THUMBS, re-runs) is a file copy
+- misses, Pillow installed: drawn in-process (no ffmpeg at all)
+- misses, no Pillow: ONE ffmpeg run, lavfi color plate -> split=N -> drawtext
+  per branch -> N single-frame outputs
+
+Layout (LAYOUT) matches the previous per-thumbnail ffmpeg call:
+1280x720 black, two centered white lines (DejaVuSans-Bold 78px @ y=200, 64px @ y=330).
+
+Disable the cache with FLOWMIND_THUMB_CACHE=0.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+CACHE_DIR = Path("assets") / "cache" / "_shared" / "thumbs"
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+FFMPEG = (os.getenv("FFMPEG_BIN_PATH") or "ffmpeg").strip()
+
+LAYOUT: Dict[str, Any] = {
+    "size": [1280, 720],
+    "bg": "black",
+    "fg": "white",
+    "font": FONT,
+    "lines": [{"fontsize": 78, "y": 200}, {"fontsize": 64, "y": 330}],
+}
+
+Item = Tuple[Path, str, str]
+
+
+def cache_enabled() -> bool:
+    return os.getenv("FLOWMIND_THUMB_CACHE", "1").strip() not in ("0", "false", "no", "off")
+
+
+def renderer() -> str:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return "ffmpeg"
+    return "pillow"
+
+
+def _safe(text: str) -> str:
+    # drawtext quoting: keep text short and free of filter metacharacters
+    return text.replace(":", "").replace("'", "").replace("\\", "").replace("%", "")
+
+
+def cache_key(lines: Sequence[str], layout: Dict[str, Any], engine: str) -> str:
+    doc = {"lines": [_safe(t) for t in lines], "layout": layout, "renderer": engine}
+    return hashlib.sha256(json.dumps(doc, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def _render_pillow(jobs: List[Tuple[Path, Sequence[str]]], layout: Dict[str, Any]) -> None:
+    from PIL import Image, ImageDraw, ImageFont
+
+    w, h = layout["size"]
+    fonts = [ImageFont.truetype(layout["font"], ln["fontsize"]) for ln in layout["lines"]]
+    for out, lines in jobs:
+        img = Image.new("RGB", (w, h), layout["bg"])
+        draw = ImageDraw.Draw(img)
+        for text, font, ln in zip(lines, fonts, layout["lines"]):
+            text = _safe(text)
+            left, _, right, _ = draw.textbbox((0, 0), text, font=font)
+            draw.text(((w - (right - left)) / 2, ln["y"]), text, font=font, fill=layout["fg"])
+        img.save(out, "JPEG", quality=90)
+
+
+def ffmpeg_batch_cmd(jobs: List[Tuple[Path, Sequence[str]]], layout: Dict[str, Any]) -> List[str]:
+    w, h = layout["size"]
+    n = len(jobs)
+    graph = [f"[0:v]split={n}" + "".join(f"[s{i}]" for i in range(n)) if n > 1 else "[0:v]null[s0]"]
+    for i, (_, lines) in enumerate(jobs):
+        draws = [
+            f"drawtext=fontfile={layout['font']}:text='{_safe(text)}':fontcolor={layout['fg']}:"
+            f"fontsize={ln['fontsize']}:x=(w-text_w)/2:y={ln['y']}"
+            for text, ln in zip(lines, layout["lines"])
+        ]
+        graph.append(f"[s{i}]{','.join(draws)}[t{i}]")
+
+    cmd = [FFMPEG, "-y", "-f", "lavfi", "-i", f"color=c={layout['bg']}:s={w}x{h}:d=1",
+           "-filter_complex", ";".join(graph)]
+    for i, (out, _) in enumerate(jobs):
+        cmd += ["-map", f"[t{i}]", "-frames:v", "1", str(out)]
+    return cmd
+
+
+def _place(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=dst.name + ".", suffix=".tmp", dir=str(dst.parent))
+    os.close(tmp_fd)
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def render_batch(items: Sequence[Item], layout: Dict[str, Any] = LAYOUT) -> Dict[str, Any]:
+    """
+    Render (out_path, line1, line2) thumbnails. Returns
+    {"renderer", "hits": n, "rendered": n, "paths": [...]}.
+    Raises subprocess.CalledProcessError if the ffmpeg batch fails.
+    """
+    engine = renderer()
+    use_cache = cache_enabled()
+    jobs: List[Tuple[Path, Sequence[str]]] = []
+    targets: List[Tuple[Path, Path]] = []  # (rendered file, requested out_path)
+    building: Dict[Path, Path] = {}        # per-process temp render -> cache entry
+    hits = 0
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    for out, line1, line2 in items:
+        out = Path(out)
+        lines = (line1, line2)
+        if not use_cache:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            jobs.append((out, lines))
+            continue
+        cached = CACHE_DIR / f"{cache_key(lines, layout, engine)}.jpg"
+        if cached.exists():
+            _place(cached, out)
+            hits += 1
+            continue
+        if all(c != cached for c, _ in targets):  # same hook twice in one batch -> render once
+            # unique name: two processes rendering the same hook never share a file
+            tmp_fd, tmp_path = tempfile.mkstemp(prefix=cached.stem + ".", suffix=".building.jpg",
+                                                dir=str(CACHE_DIR))
+            os.close(tmp_fd)
+            building[Path(tmp_path)] = cached
+            jobs.append((Path(tmp_path), lines))
+        targets.append((cached, out))
+
+    try:
+        if jobs:
+            if engine == "pillow":
+                _render_pillow(jobs, layout)
+            else:
+                subprocess.run(ffmpeg_batch_cmd(jobs, layout), check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            for tmp, cached in building.items():
+                os.chmod(tmp, 0o644)  # mkstemp creates 0600
+                os.replace(tmp, cached)
+    finally:
+        for tmp in building:
+            if tmp.exists():
+                tmp.unlink()
+
+    for cached, out in targets:
+        _place(cached, out)
+
+    return {
+        "renderer": engine,
+        "hits": hits,
+        "rendered": len(jobs),
+        "paths": [str(Path(out)) for out, _, _ in items],
+    }
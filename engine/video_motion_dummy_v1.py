@@ -10,6 +10,13 @@ Generates a motion background video of exact duration based on master.wav:
 Output:
   assets/cache/<PROJECT_ID>/video/motion_bg.mp4
 
+The filter graph (motion_source / motion_chain) is shared with
+engine.motion_assembly_v1, which renders it straight into final.mp4.
+
+With the shared library (engine.motion_bg_library_v1, default on) the
+background is cut from a pre-encoded entry by stream copy; only a missing
+spec/duration bucket is encoded, once for every project.
+
 Usage:
   python -m engine.video_motion_dummy_v1 FM_TEST
 """
@@ -20,7 +27,9 @@ import json
 import subprocess
 import sys
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple
+
+from engine import encode_profiles_v1, ffmpeg_caps_v1, motion_bg_library_v1, wav_io_v1
 
 
 def _run(cmd: list[str]) -> Tuple[int, str]:
@@ -29,19 +38,49 @@ def _run(cmd: list[str]) -> Tuple[int, str]:
 
 
 def _probe_duration_sec(media: Path) -> float:
-    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", str(media)]
-    rc, out = _run(cmd)
-    if rc != 0:
-        raise RuntimeError(f"ffprobe failed rc={rc}\n{out}")
-    data = json.loads(out)
-    return float(data["format"]["duration"])
+    return wav_io_v1.duration_sec(media)
 
 
 def _has_filter(name: str) -> bool:
-    rc, out = _run(["ffmpeg", "-hide_banner", "-filters"])
-    if rc != 0:
-        return False
-    return name in out
+    # one `ffmpeg -filters` per ffmpeg build, shared by every station (engine.ffmpeg_caps_v1)
+    return ffmpeg_caps_v1.has_filter(name)
+
+
+def motion_source(width: int = 1920, height: int = 1080, fps: int = 30) -> str:
+    """lavfi input spec for the base color plate."""
+    return f"color=c=0x101018:s={width}x{height}:r={fps}"
+
+
+def motion_chain(has_noise: bool, has_zoompan: bool,
+                 width: int = 1920, height: int = 1080, fps: int = 30) -> List[str]:
+    """Filters applied to the color plate (join with ',')."""
+    # Base: slight vignette-ish darkening via eq; then optional noise; then motion via zoompan.
+    chain = []
+    chain.append("format=yuv420p,setsar=1")
+    chain.append("eq=contrast=1.05:brightness=-0.02:saturation=1.15")
+
+    if has_noise:
+        chain.append("noise=alls=12:allf=t+u")
+
+    if has_zoompan:
+        # gentle zoom + sinusoidal pan (30px at 1080p, scaled with the frame)
+        amp = max(1, round(30 * width / 1920))
+        chain.append(
+            "zoompan="
+            "z='min(1.10,1+0.0007*on)':"
+            f"x='iw/2-(iw/zoom/2)+{amp}*sin(on/70)':"
+            f"y='ih/2-(ih/zoom/2)+{amp}*cos(on/65)':"
+            f"d=1:fps={fps}:s={width}x{height}"
+        )
+    else:
+        # fallback: tiny blur to avoid perfectly static blocks; still larger than 169KB usually with noise
+        chain.append("boxblur=2:1")
+
+    chain.append(f"fps={fps}")
+    chain.append(f"scale={width}:{height}")
+    chain.append("format=yuv420p")
+    chain.append("setsar=1")
+    return chain
 
 
 def main(argv: list[str]) -> int:
@@ -62,8 +101,7 @@ def main(argv: list[str]) -> int:
         print(f"[FAIL] missing master_wav: {master_wav}", file=sys.stderr)
         return 4
 
-    rc, _ = _run(["ffmpeg", "-version"])
-    if rc != 0:
+    if not ffmpeg_caps_v1.available("ffmpeg"):
         print("[FAIL] ffmpeg not found in PATH", file=sys.stderr)
         return 5
 
@@ -79,34 +117,31 @@ def main(argv: list[str]) -> int:
     has_noise = _has_filter("noise")
     has_zoompan = _has_filter("zoompan")
 
-    # Build filter_complex from [0:v]
-    # Base: slight vignette-ish darkening via eq; then optional noise; then motion via zoompan.
-    chain = []
-    chain.append("format=yuv420p,setsar=1")
-    chain.append("eq=contrast=1.05:brightness=-0.02:saturation=1.15")
-
-    if has_noise:
-        chain.append("noise=alls=12:allf=t+u")
-
-    if has_zoompan:
-        # gentle zoom + sinusoidal pan, 30fps, 1920x1080
-        chain.append(
-            "zoompan="
-            "z='min(1.10,1+0.0007*on)':"
-            "x='iw/2-(iw/zoom/2)+30*sin(on/70)':"
-            "y='ih/2-(ih/zoom/2)+30*cos(on/65)':"
-            "d=1:fps=30:s=1920x1080"
+    video_args = encode_profiles_v1.video_args(encode_profiles_v1.for_project(project_id))
+
+    if motion_bg_library_v1.enabled():
+        spec = motion_bg_library_v1.make_spec(motion_source(), motion_chain(has_noise, has_zoompan), 30, video_args)
+        try:
+            entry = motion_bg_library_v1.acquire(spec, dur)
+        except Exception as e:
+            print(f"[FAIL] motion_bg library: {e}", file=sys.stderr)
+            return 7
+        try:
+            rc2, out2 = _run(motion_bg_library_v1.trim_cmd(Path(entry["path"]), dur, out_path))
+        finally:
+            motion_bg_library_v1.release(entry)
+        if rc2 != 0:
+            print(f"[FAIL] ffmpeg motion_bg trim rc={rc2}\n{out2}", file=sys.stderr)
+            return 7
+        print(
+            f"[VIDEO_MOTION_DUMMY PASS] out={out_path} duration_sec={dur:.3f} "
+            f"library={'hit' if entry['hit'] else 'rendered'} entry={entry['spec_key']}/{entry['bucket_sec']}s "
+            f"evicted={len(entry['evicted'])}"
         )
-    else:
-        # fallback: tiny blur to avoid perfectly static blocks; still larger than 169KB usually with noise
-        chain.append("boxblur=2:1")
+        return 0
 
-    chain.append("fps=30")
-    chain.append("scale=1920:1080")
-    chain.append("format=yuv420p")
-    chain.append("setsar=1")
-
-    fc = f"[0:v]{','.join(chain)}[v]"
+    # Build filter_complex from [0:v]
+    fc = f"[0:v]{','.join(motion_chain(has_noise, has_zoompan))}[v]"
 
     cmd = [
         "ffmpeg",
@@ -114,15 +149,14 @@ def main(argv: list[str]) -> int:
         "-f",
         "lavfi",
         "-i",
-        "color=c=0x101018:s=1920x1080:r=30",
+        motion_source(),
         "-t",
         f"{dur:.3f}",
         "-filter_complex",
         fc,
         "-map",
         "[v]",
-        "-c:v",
-        "libx264",
+        *video_args,
         "-pix_fmt",
         "yuv420p",
         "-movflags",
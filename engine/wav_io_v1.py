@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — WAV IO v1 (RIFF/WAVE header reader, master clock)
+
+read_wav_info(path) walks the RIFF chunks (fmt, LIST, data, ...) and returns
+exact frame counts without spawning ffprobe:
+- frames        = data_bytes // block_align   (sample-accurate master clock)
+- duration_us   = frames * 1_000_000 // sample_rate
+- duration_sec  = frames / sample_rate
+
+PCM / IEEE float (incl. WAVE_FORMAT_EXTENSIBLE) are read natively.
+Anything else (compressed WAV, non-RIFF) falls back to the shared ffprobe
+cache in duration_sec().
+
+write_silence(path, frames, sr, ch) writes a canonical 44-byte PCM header and
+extends the file with ftruncate (sparse zeros): no ffmpeg, byte-identical
+output for identical (frames, sr, ch), atomic replace.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+PCM_HEADER_BYTES = 44
+_RIFF_MAX_DATA = 0xFFFFFFFF - 36
+
+_NATIVE_FORMATS = (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT)
+
+PathLike = Union[str, Path]
+
+
+class WavFormatError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    path: str
+    format_tag: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    block_align: int
+    data_offset: int
+    data_bytes: int
+
+    @property
+    def is_pcm(self) -> bool:
+        return self.format_tag in _NATIVE_FORMATS
+
+    @property
+    def frames(self) -> int:
+        return self.data_bytes // self.block_align
+
+    @property
+    def duration_us(self) -> int:
+        return self.frames * 1_000_000 // self.sample_rate
+
+    @property
+    def duration_sec(self) -> float:
+        return self.frames / self.sample_rate
+
+
+def read_wav_info(path: PathLike) -> WavInfo:
+    path = str(path)
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if len(head) < 12 or head[0:4] != b"RIFF" or head[8:12] != b"WAVE":
+            raise WavFormatError(f"not a RIFF/WAVE file: {path}")
+
+        fmt = None
+        pos = 12
+        while pos + 8 <= file_size:
+            f.seek(pos)
+            chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+            body = pos + 8
+
+            if chunk_id == b"fmt ":
+                raw = f.read(min(chunk_size, 40))
+                if len(raw) < 16:
+                    raise WavFormatError(f"short fmt chunk: {path}")
+                tag, ch, sr, _, align, bits = struct.unpack("<HHIIHH", raw[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE and len(raw) >= 26:
+                    tag = struct.unpack("<H", raw[24:26])[0]  # first 2 bytes of SubFormat GUID
+                fmt = (tag, ch, sr, bits, align)
+
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise WavFormatError(f"data chunk before fmt chunk: {path}")
+                # 0xFFFFFFFF / oversized = writer could not seek back (streamed); trust the file size
+                data_bytes = min(chunk_size, file_size - body)
+                tag, ch, sr, bits, align = fmt
+                if ch <= 0 or sr <= 0 or align <= 0:
+                    raise WavFormatError(f"invalid fmt (ch={ch} sr={sr} align={align}): {path}")
+                return WavInfo(path, tag, ch, sr, bits, align, body, data_bytes)
+
+            pos = body + chunk_size + (chunk_size & 1)  # chunks are word-aligned
+
+    raise WavFormatError(f"no data chunk: {path}")
+
+
+def duration_sec(path: PathLike) -> float:
+    """Exact duration for PCM/float WAV; ffprobe (shared cache) for anything else."""
+    try:
+        info = read_wav_info(path)
+        if info.is_pcm:
+            return info.duration_sec
+    except (OSError, WavFormatError, struct.error):
+        if not os.path.isfile(str(path)):
+            raise
+    from engine import probe_cache_v1
+
+    return probe_cache_v1.duration_sec(Path(path))
+
+
+def frames_for(duration_sec: float, sample_rate: int) -> int:
+    """Sample-exact frame count for a clock duration (nearest frame)."""
+    return int(round(float(duration_sec) * int(sample_rate)))
+
+
+def pcm_header(frames: int, sample_rate: int, channels: int, bits_per_sample: int = 16) -> bytes:
+    block_align = channels * bits_per_sample // 8
+    data_bytes = frames * block_align
+    if data_bytes > _RIFF_MAX_DATA:
+        raise WavFormatError(f"PCM data too large for RIFF: {data_bytes} bytes")
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_bytes, b"WAVE",
+        b"fmt ", 16, WAVE_FORMAT_PCM, channels, sample_rate,
+        sample_rate * block_align, block_align, bits_per_sample,
+        b"data", data_bytes,
+    )
+
+
+def write_silence(path: PathLike, frames: int, sample_rate: int, channels: int,
+                  bits_per_sample: int = 16) -> WavInfo:
+    """Zero-filled PCM WAV of exactly `frames` frames (sparse where the FS supports it)."""
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    header = pcm_header(frames, sample_rate, channels, bits_per_sample)
+    data_bytes = frames * channels * bits_per_sample // 8
+
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=out.name + ".", suffix=".tmp", dir=str(out.parent))
+    try:
+        with os.fdopen(tmp_fd, "wb") as f:
+            f.write(header)
+            f.truncate(PCM_HEADER_BYTES + data_bytes)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; media is shared with other tools
+        os.replace(tmp_path, out)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return read_wav_info(out)
@@ -4,6 +4,18 @@
 """
 FlowMind Cashflow — Production Orchestrator v5
 LOCK + RECOVER + PROJECT_ID VALIDATION
+
+Lock: projects/<ID>/.orch.lock (engine.lock_manager_v1) — flock + PID, host
+and heartbeat; a crashed orchestrator's lock is reclaimed on the next start.
+
+--loop   tick every 5s
+--watch  event-driven loop: wake on PROJECT_STATE.json change or Telegram
+         event, idle backoff 0.5s -> 30s (engine.state_watch_v1)
+
+status <PROJECT_ID>                       one project from its PROJECT_STATE
+status --all [--phase A,B] [--archived] [--json]
+                                          every project from the SQLite index
+status --reindex                          rebuild the index from projects/
 """
 
 import sys
@@ -11,6 +23,8 @@ import json
 import time
 from pathlib import Path
 
+from engine import state_store_v1
+
 
 PROJECTS_DIR = Path("projects")
 
@@ -21,7 +35,7 @@ def load_state(project_id):
     if not path.exists():
         raise RuntimeError("PROJECT_STATE not found")
 
-    state = json.loads(path.read_text())
+    state = state_store_v1.peek(path)
 
     # 🔒 PROJECT ID VALIDATION
     file_project_id = state.get("project_id")
@@ -34,20 +48,23 @@ def load_state(project_id):
     return path, state
 
 
-def create_lock(project_id):
-    lock_path = PROJECTS_DIR / project_id / ".orch.lock"
+def create_lock(project_id, owner="fm"):
+    # flock + PID/host/heartbeat; a crashed holder is reclaimed (engine.lock_manager_v1)
+    from engine import lock_manager_v1
 
-    if lock_path.exists():
-        print("[LOCK] Another orchestrator is running.")
+    lock = lock_manager_v1.acquire(project_id, owner)
+
+    if lock is None:
+        print(f"[LOCK] Another orchestrator is running: "
+              f"{lock_manager_v1.describe(lock_manager_v1.holder(project_id))}")
         return None
 
-    lock_path.write_text("LOCKED")
-    return lock_path
+    return lock
 
 
-def release_lock(lock_path):
-    if lock_path and lock_path.exists():
-        lock_path.unlink()
+def release_lock(lock):
+    if lock is not None:
+        lock.release()
 
 
 def run_audio_plan(project_id):
@@ -99,25 +116,98 @@ def orchestrate_once(project_id):
     print("[ORCH] Unknown phase.")
 
 
+def _opt(argv, name, default=None):
+    if name in argv:
+        i = argv.index(name)
+        if i + 1 < len(argv):
+            return argv[i + 1]
+    return default
+
+
+def _mb(n):
+    return "-" if n is None else f"{n / (1024 * 1024):.1f}"
+
+
+def cmd_status(argv):
+    from engine import project_index_v1
+
+    if "--reindex" in argv:
+        t0 = time.monotonic()
+        res = project_index_v1.reindex()
+        print(f"[STATUS] reindexed {res['indexed']} projects "
+              f"({res['unreadable']} unreadable) in {time.monotonic() - t0:.2f}s")
+        return 0
+
+    if "--all" in argv:
+        t0 = time.monotonic()
+        if project_index_v1.is_empty():
+            project_index_v1.reindex()
+        phases = (_opt(argv, "--phase") or "").split(",")
+        rows = project_index_v1.query(phases, include_archived="--archived" in argv)
+        by_phase = project_index_v1.counts()
+        elapsed_ms = (time.monotonic() - t0) * 1000.0
+
+        if "--json" in argv:
+            print(json.dumps({"projects": rows, "counts": by_phase}, ensure_ascii=False, indent=2))
+            return 0
+
+        print(f"{'PROJECT':<32} {'PHASE':<20} {'APPROVAL':<10} {'HALT_REASON':<24} {'UPDATED':<28} {'FINAL_MB':>8}")
+        for r in rows:
+            print(f"{r['key']:<32} {r['phase'] or '?':<20} {r['approval_status'] or '-':<10} "
+                  f"{r['halt_reason'] or '-':<24} {r['updated_at'] or '-':<28} {_mb(r['final_bytes']):>8}")
+        summary = " ".join(f"{k}={v}" for k, v in by_phase.items())
+        print(f"[STATUS] {len(rows)} shown | {summary} | {elapsed_ms:.1f}ms")
+        return 0
+
+    if not argv:
+        print("Usage: python fm.py status <PROJECT_ID> | --all [--phase A,B] [--archived] [--json] | --reindex")
+        return 1
+
+    project_id = Path(argv[0].rstrip("/")).name
+    state = state_store_v1.peek(state_store_v1.state_path(project_id))
+    if not state:
+        print(f"[STATUS] {project_id}: PROJECT_STATE not found")
+        return 1
+    for k in ("project_id", "phase", "approval_status", "halt_reason", "updated_at", "state_version"):
+        print(f"{k:<16} {state.get(k) if state.get(k) is not None else '-'}")
+
+    from engine import lock_manager_v1
+    print(f"{'lock':<16} {lock_manager_v1.describe(lock_manager_v1.holder(project_id))}")
+
+    from engine import phase_journal_v1
+    for e in phase_journal_v1.read(project_id, last=5):
+        extra = " ".join(f"{k}={e[k]}" for k in ("reason", "gate", "recovered") if k in e)
+        print(f"  {e['at']}  {e['phase']:<20} {extra}".rstrip())
+    return 0
+
+
 def main():
 
     if len(sys.argv) < 2:
-        print("Usage: python fm.py <PROJECT_ID> [--loop|--recover]")
+        print("Usage: python fm.py <PROJECT_ID> [--loop|--watch|--recover]")
+        print("       python fm.py status <PROJECT_ID> | --all [--phase A,B] [--archived] [--json] | --reindex")
         sys.exit(1)
 
+    if sys.argv[1] == "status":
+        sys.exit(cmd_status(sys.argv[2:]))
+
     project_id = sys.argv[1]
-    loop_mode = "--loop" in sys.argv
+    watch_mode = "--watch" in sys.argv
+    loop_mode = "--loop" in sys.argv or watch_mode
     recover_mode = "--recover" in sys.argv
 
-    if recover_mode:
-        run_recover(project_id)
-        return
-
-    lock_path = create_lock(project_id)
+    lock = create_lock(project_id, "fm --recover" if recover_mode else "fm")
 
-    if lock_path is None:
+    if lock is None:
         sys.exit(1)
 
+    if recover_mode:
+        try:
+            run_recover(project_id)
+        finally:
+            release_lock(lock)
+        return
+
     try:
 
         if not loop_mode:
@@ -126,17 +216,28 @@ def main():
 
         print(f"[ORCH] LOOP START project={project_id}")
 
-        while True:
-            result = orchestrate_once(project_id)
-
-            if result == "STOP":
+        from engine.telegram_poller_v1 import start_poller, stop_poller
+        start_poller()
+        try:
+            if watch_mode:
+                from engine.state_watch_v1 import watch_loop
+                watch_loop(project_id, lambda: orchestrate_once(project_id))
                 print("[ORCH] LOOP END")
-                break
+                return
+
+            while True:
+                result = orchestrate_once(project_id)
+
+                if result == "STOP":
+                    print("[ORCH] LOOP END")
+                    break
 
-            time.sleep(5)
+                time.sleep(5)
+        finally:
+            stop_poller()
 
     finally:
-        release_lock(lock_path)
+        release_lock(lock)
 
 
 if __name__ == "__main__":
@@ -4,22 +4,14 @@ Minimal Assembly Engine (Deterministic)
 """
 
 import sys
-import json
 import subprocess
 from pathlib import Path
 
+from engine import encode_profiles_v1
+from engine.state_manager import load_state, save_state
 
-def load_state(project_path: Path):
-    with open(project_path / "PROJECT_STATE.json", "r") as f:
-        return json.load(f)
 
-
-def save_state(project_path: Path, state: dict):
-    with open(project_path / "PROJECT_STATE.json", "w") as f:
-        json.dump(state, f, indent=2)
-
-
-def create_dummy_video(output_path: Path):
+def create_dummy_video(output_path: Path, profile: str = encode_profiles_v1.DEFAULT_PROFILE):
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     cmd = [
@@ -28,6 +20,7 @@ def create_dummy_video(output_path: Path):
         "-f", "lavfi",
         "-i", "color=c=black:s=1920x1080:d=65",
         "-vf", "format=yuv420p",
+        *encode_profiles_v1.video_args(profile),
         str(output_path)
     ]
 
@@ -40,7 +33,7 @@ def run(project_path: Path):
     project_id = state["project_id"]
     output_path = project_path / f"out/{project_id}/final.mp4"
 
-    create_dummy_video(output_path)
+    create_dummy_video(output_path, encode_profiles_v1.resolve(state))
 
     state["video_path"] = f"out/{project_id}/final.mp4"
     save_state(project_path, state)
@@ -4,40 +4,22 @@ QA Engine (Minimal Deterministic Gate)
 """
 
 import sys
-import json
-import subprocess
 from pathlib import Path
 
+from engine import probe_cache_v1
+from engine.state_manager import load_state, save_state
+
 
 class QAError(Exception):
     pass
 
 
-def load_state(project_path: Path):
-    with open(project_path / "PROJECT_STATE.json", "r") as f:
-        return json.load(f)
-
-
-def save_state(project_path: Path, state: dict):
-    with open(project_path / "PROJECT_STATE.json", "w") as f:
-        json.dump(state, f, indent=2)
-
-
 def get_video_duration(video_path: Path):
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(video_path)
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
+    try:
+        return probe_cache_v1.duration_sec(video_path)
+    except RuntimeError:
         raise QAError("ffprobe failed")
 
-    return float(result.stdout.strip())
-
 
 def run(project_path: Path):
     state = load_state(project_path)
@@ -4,10 +4,11 @@ S1 — Deterministic Topic Engine
 Money Mistakes Mode
 """
 
-import json
 import random
 from pathlib import Path
 
+from engine.state_manager import load_state, save_state
+
 
 TEMPLATES = [
     {
@@ -31,16 +32,6 @@ TEMPLATES = [
 ]
 
 
-def load_state(project_path: Path):
-    with open(project_path / "PROJECT_STATE.json", "r") as f:
-        return json.load(f)
-
-
-def save_state(project_path: Path, state: dict):
-    with open(project_path / "PROJECT_STATE.json", "w") as f:
-        json.dump(state, f, indent=2)
-
-
 def run(project_path: Path):
     state = load_state(project_path)
 
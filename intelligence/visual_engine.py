@@ -14,15 +14,7 @@ from pathlib import Path
 import json
 import sys
 
-
-def load_state(project_path: Path) -> dict:
-    with open(project_path / "PROJECT_STATE.json", "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_state(project_path: Path, state: dict) -> None:
-    with open(project_path / "PROJECT_STATE.json", "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+from engine.state_manager import load_state, save_state
 
 
 def _load_scene_plan(scene_plan_path: Path):
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+THIS_FILE = Path(__file__).resolve()
+REPO_ROOT = THIS_FILE.parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Empty cwd: projects/ and out/ are cwd-relative."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "projects").mkdir()
+    return tmp_path
@@ -0,0 +1,23 @@
+import json
+
+from engine import dispatcher_v1, phase_journal_v1
+
+
+def test_legacy_history_log_is_converted_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(dispatcher_v1, "project_dir", lambda pid: tmp_path / "out" / pid)
+    legacy = dispatcher_v1.legacy_history_path("FM_T")
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text("".join(json.dumps(r) + "\n" for r in [
+        {"timestamp": "2026-01-01T00:00:00+00:00", "from": "CREATED", "to": "SCRIPT", "reason": "début"},
+        {"timestamp": "2026-01-01T00:01:00+00:00", "from": "SCRIPT", "to": "AUDIO", "reason": "ok"},
+    ]), encoding="utf-8")
+
+    dispatcher_v1.append_history("FM_T", "AUDIO", "ASSEMBLY", "next")
+    dispatcher_v1.append_history("FM_T", "ASSEMBLY", "QA", "next")
+
+    entries = phase_journal_v1.read_from(dispatcher_v1.history_path("FM_T"))
+    assert [e["phase"] for e in entries] == ["SCRIPT", "AUDIO", "ASSEMBLY", "QA"]
+    assert entries[0]["reason"] == "début"
+    assert entries[0]["at"] == "2026-01-01T00:00:00Z"
+    assert not legacy.exists()
+    assert legacy.with_name("state_history.log.migrated").exists()
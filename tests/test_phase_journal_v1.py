@@ -0,0 +1,42 @@
+from engine import phase_journal_v1 as pj
+
+
+def test_append_after_torn_record_stays_aligned(workdir):
+    pj.append("FM_T", "A")
+    pj.append("FM_T", "B")
+    with open(pj.journal_path("FM_T"), "ab") as f:
+        f.write(b"\xab" * 50)  # crash mid-write
+
+    assert [e["phase"] for e in pj.read("FM_T")] == ["A", "B"]
+
+    pj.append("FM_T", "C", reason="render done")
+    pj.append("FM_T", "HALT", reason="qa failed")
+
+    entries = pj.read("FM_T")
+    assert [e["phase"] for e in entries] == ["A", "B", "C", "HALT"]
+    assert entries[2]["reason"] == "render done"
+    assert pj.last_safe_phase("FM_T") == "C"
+    size = pj.journal_path("FM_T").stat().st_size
+    assert size == pj.HEADER.size + 4 * pj.RECORD.size
+
+
+def test_empty_and_headerless_files_read_as_empty(workdir):
+    path = pj.journal_path("FM_T")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"")
+    assert pj.read("FM_T") == []
+
+    pj.append("FM_T", "A")
+    assert [e["phase"] for e in pj.read("FM_T")] == ["A"]
+
+    path.write_bytes(b"\0" * 300)
+    assert pj.read("FM_T") == [] and pj.last_safe_phase("FM_T") is None
+    pj.append("FM_T", "B")
+    assert [e["phase"] for e in pj.read("FM_T")] == ["B"]
+    assert path.with_name(path.name + ".bad").stat().st_size == 300
+
+
+def test_utf8_fields_truncate_on_character_boundary(workdir):
+    pj.append("FM_T", "QA", reason="é" * 100)
+    (entry,) = pj.read("FM_T")
+    assert entry["reason"] == "é" * 36
@@ -0,0 +1,82 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from engine import phase_journal_v1, state_store_v1, station_txn_v1
+
+
+def _crash_mid_publish(monkeypatch, project_id, targets):
+    """commit() dies after publishing the first output; the second staged file is then lost."""
+    def crash(outputs):
+        os.replace(outputs[0]["staged"], outputs[0]["target"])
+        raise OSError("killed")
+
+    txn = station_txn_v1.Transaction(project_id, "ASSEMBLY_FROM_AUDIO").begin()
+    for t in targets:
+        txn.write_text(t, "new\n")
+    with monkeypatch.context() as m:
+        m.setattr(station_txn_v1, "_publish", crash)
+        with pytest.raises(OSError):
+            txn.commit()
+    txn.close()  # the writer is gone
+    staged = [Path(o["staged"]) for o in txn.outputs]
+    staged[1].unlink()
+    return staged
+
+
+def test_lost_staged_output_after_partial_publish_halts_and_keeps_everything(workdir, monkeypatch):
+    state_store_v1.update("FM_T", lambda s: state_store_v1.transition(s, "ASSEMBLY"), create=True)
+    out = workdir / "out" / "FM_T"
+    out.mkdir(parents=True)
+    targets = [out / "final.mp4", out / "ffprobe.json", workdir / "projects" / "FM_T" / "ASSEMBLY_FROM_AUDIO.json"]
+    for t in targets:
+        t.write_text("old\n")
+    staged = _crash_mid_publish(monkeypatch, "FM_T", targets)
+
+    (result,) = station_txn_v1.recover("FM_T")
+
+    assert result["action"] == "HALT"
+    assert [t.read_text() for t in targets] == ["new\n", "old\n", "old\n"]
+    assert staged[2].exists()
+    (log,) = station_txn_v1.pending("FM_T")
+    assert log["state"] == station_txn_v1.UNRECOVERABLE
+    assert state_store_v1.read_json(state_store_v1.state_path("FM_T"))["phase"] == "HALT"
+    assert phase_journal_v1.last_safe_phase("FM_T") == "ASSEMBLY"
+    assert station_txn_v1.recover("FM_T") == []
+
+    with station_txn_v1.transaction("FM_T", "ASSEMBLY_FROM_AUDIO") as txn:
+        for t in targets:
+            txn.write_text(t, "rerun\n")
+        txn.commit()
+
+    assert [t.read_text() for t in targets] == ["rerun\n"] * 3
+    assert station_txn_v1.pending("FM_T") == []
+    assert not staged[2].parent.exists()
+
+
+def test_crash_mid_publish_rolls_forward(workdir, monkeypatch):
+    out = workdir / "out" / "FM_T"
+    out.mkdir(parents=True)
+    targets = [out / "final.mp4", out / "ffprobe.json"]
+    for t in targets:
+        t.write_text("old\n")
+
+    def crash(outputs):
+        os.replace(outputs[0]["staged"], outputs[0]["target"])
+        raise OSError("killed")
+
+    txn = station_txn_v1.Transaction("FM_T", "ASSEMBLY_FROM_AUDIO").begin()
+    for t in targets:
+        txn.write_text(t, "new\n")
+    with monkeypatch.context() as m:
+        m.setattr(station_txn_v1, "_publish", crash)
+        with pytest.raises(OSError):
+            txn.commit()
+    txn.close()
+
+    (result,) = station_txn_v1.recover("FM_T")
+
+    assert (result["action"], result["moved"], result["already"]) == ("ROLL_FORWARD", 1, 1)
+    assert [t.read_text() for t in targets] == ["new\n", "new\n"]
+    assert station_txn_v1.pending("FM_T") == []
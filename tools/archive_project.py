@@ -58,6 +58,10 @@ def run(project_path: Path) -> None:
     shutil.move(str(project_path), str(dest))
     print(f"[ARCHIVE] Project moved to {dest}")
 
+    if project_path.parent == Path("projects").resolve():
+        from engine import project_index_v1
+        project_index_v1.moved(project_path.name, f"{adir.name}/{dest.name}")
+
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
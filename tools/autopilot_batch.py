@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Autopilot Batch v1 (multi-project orchestrator)
+
+Discovers every project under projects/ and drives them concurrently through
+the declarative stage graph (dispatcher.pipeline_v1).
+
+Scheduling:
+- one job = ONE stage of ONE project (never a whole pipeline pass)
+- heavy stages (ffmpeg-bound) run on a small bounded pool, light stages
+  (JSON stations, gates) on a separate larger pool
+- projects are visited round-robin; after each stage a project goes to the
+  back of the queue, so a long render only ever occupies one heavy slot
+- a project is only scheduled while it holds projects/<ID>/.orch.lock
+  (engine.lock_manager_v1, same lock as fm.py and the step runners);
+  projects locked by another live process are retried on the next round
+- gate stages that ended WAITING (approval) cool down for --idle seconds
+- one shared Telegram poller (engine.telegram_poller_v1) feeds every
+  project's approval gate from a local queue
+
+Stops when every project is ARCHIVED / HALT / FAILED / BLOCKED, or — with
+--loop — keeps polling waiting projects forever (Ctrl+C to stop).
+
+Usage:
+  python tools/autopilot_batch.py [--heavy N] [--light N] [--idle SEC] [--loop] [--only ID,ID]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+THIS_FILE = Path(__file__).resolve()
+REPO_ROOT = THIS_FILE.parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+PROJECTS_DIR = Path("projects")
+
+DEFAULT_LIGHT = 8
+DEFAULT_IDLE_SEC = 10
+
+# Final per-project outcomes of a batch run
+DONE = "DONE"          # ARCHIVED / nothing left
+HALTED = "HALT"
+FAILED = "FAILED"
+BLOCKED = "BLOCKED"
+
+# Fallback listener (no poller) owns one global offset; never poll it from two workers.
+_LISTEN_LOCK = threading.Lock()
+
+
+def default_heavy() -> int:
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
+def discover_projects() -> List[str]:
+    if not PROJECTS_DIR.exists():
+        return []
+    out: List[str] = []
+    for p in sorted(PROJECTS_DIR.iterdir()):
+        if not p.is_dir() or p.name.startswith(("_", ".")):
+            continue
+        if (p / "PROJECT_STATE.json").exists():
+            out.append(p.name)
+    return out
+
+
+def group_by_phase(project_ids: List[str]) -> Dict[str, List[str]]:
+    from dispatcher.pipeline_v1 import current_phase
+
+    groups: Dict[str, List[str]] = {}
+    for pid in project_ids:
+        groups.setdefault(current_phase(pid) or "UNKNOWN", []).append(pid)
+    return groups
+
+
+def _run_job(stage, project_id: str, lock) -> str:
+    from dispatcher.pipeline_v1 import run_stage
+    from fm import release_lock
+
+    try:
+        if stage.name == "APPROVAL_LISTEN":
+            with _LISTEN_LOCK:
+                return run_stage(stage, project_id)
+        return run_stage(stage, project_id)
+    finally:
+        release_lock(lock)
+
+
+def run_batch(project_ids: List[str], heavy: int, light: int, idle_sec: float, loop: bool) -> Dict[str, str]:
+    from dispatcher.pipeline_v1 import BLOCKED as ST_BLOCKED
+    from dispatcher.pipeline_v1 import FAILED as ST_FAILED
+    from dispatcher.pipeline_v1 import WAITING as ST_WAITING
+    from dispatcher.pipeline_v1 import current_phase, next_stage
+    from fm import create_lock
+
+    queue: Deque[str] = deque(project_ids)
+    outcome: Dict[str, str] = {}
+    cooldown: Dict[str, float] = {}
+    in_flight: Dict[Future, Tuple[str, str, bool]] = {}
+    heavy_busy = 0
+
+    heavy_pool = ThreadPoolExecutor(max_workers=heavy, thread_name_prefix="fm-heavy")
+    light_pool = ThreadPoolExecutor(max_workers=light, thread_name_prefix="fm-light")
+    try:
+        while queue or in_flight:
+            now = time.monotonic()
+
+            # One round-robin sweep: every queued project gets at most one new stage
+            for _ in range(len(queue)):
+                pid = queue.popleft()
+                if cooldown.get(pid, 0) > now:
+                    queue.append(pid)
+                    continue
+
+                stage, st = next_stage(pid)
+                if stage is None:
+                    outcome[pid] = HALTED if current_phase(pid) == "HALT" else DONE
+                    continue
+                if st == ST_BLOCKED:
+                    print(f"[BATCH] {pid} BLOCKED at {stage.name}")
+                    outcome[pid] = BLOCKED
+                    continue
+                if stage.heavy and heavy_busy >= heavy:
+                    queue.append(pid)  # keep its place; light work of others proceeds
+                    continue
+
+                lock = create_lock(pid, f"autopilot_batch {stage.name}")
+                if lock is None:
+                    cooldown[pid] = now + idle_sec
+                    queue.append(pid)
+                    continue
+
+                pool = heavy_pool if stage.heavy else light_pool
+                fut = pool.submit(_run_job, stage, pid, lock)
+                in_flight[fut] = (pid, stage.name, stage.heavy)
+                if stage.heavy:
+                    heavy_busy += 1
+
+            if not in_flight:
+                if not queue:
+                    break
+                if not loop and all(cooldown.get(pid, 0) > now for pid in queue):
+                    # Only waiting/locked projects left and no --loop: leave them for the next run
+                    for pid in queue:
+                        outcome.setdefault(pid, ST_WAITING)
+                    break
+                time.sleep(min(1.0, idle_sec))
+                continue
+
+            finished, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                pid, stage_name, was_heavy = in_flight.pop(fut)
+                if was_heavy:
+                    heavy_busy -= 1
+                try:
+                    st = fut.result()
+                except Exception as e:
+                    print(f"[BATCH] {pid} {stage_name} crashed: {e}", file=sys.stderr)
+                    st = ST_FAILED
+
+                if st == ST_FAILED:
+                    print(f"[BATCH] {pid} FAILED at {stage_name}")
+                    outcome[pid] = FAILED
+                    continue
+                if st == ST_WAITING:
+                    cooldown[pid] = time.monotonic() + idle_sec
+                outcome.pop(pid, None)
+                queue.append(pid)
+    finally:
+        heavy_pool.shutdown(wait=True)
+        light_pool.shutdown(wait=True)
+
+    return outcome
+
+
+def _int_opt(argv: List[str], name: str, default: int) -> Optional[int]:
+    if name not in argv:
+        return default
+    i = argv.index(name)
+    try:
+        return max(1, int(argv[i + 1]))
+    except (IndexError, ValueError):
+        print(f"[BATCH] {name} requires an integer", file=sys.stderr)
+        return None
+
+
+def main(argv: List[str]) -> int:
+    heavy = _int_opt(argv, "--heavy", default_heavy())
+    light = _int_opt(argv, "--light", DEFAULT_LIGHT)
+    idle = _int_opt(argv, "--idle", DEFAULT_IDLE_SEC)
+    if heavy is None or light is None or idle is None:
+        print("Usage: python tools/autopilot_batch.py [--heavy N] [--light N] [--idle SEC] [--loop] [--only ID,ID]",
+              file=sys.stderr)
+        return 2
+
+    project_ids = discover_projects()
+    if "--only" in argv:
+        i = argv.index("--only")
+        wanted = set(argv[i + 1].split(",")) if i + 1 < len(argv) else set()
+        project_ids = [pid for pid in project_ids if pid in wanted]
+    if not project_ids:
+        print("[BATCH] no projects found under projects/")
+        return 0
+
+    # Split CPU between concurrent heavy stations unless the operator pinned it
+    if not os.getenv("FLOWMIND_RENDER_JOBS"):
+        from engine.ffmpeg_dummy_renderer_v1 import clip_threads
+        per_station = max(1, (os.cpu_count() or 1) // (clip_threads() * heavy))
+        os.environ["FLOWMIND_RENDER_JOBS"] = str(per_station)
+
+    print(f"[BATCH] start projects={len(project_ids)} heavy={heavy} light={light} idle={idle}s")
+    for phase, pids in sorted(group_by_phase(project_ids).items()):
+        print(f"[BATCH]   {phase:<20} {len(pids):>3}  {', '.join(pids)}")
+
+    from engine.telegram_poller_v1 import start_poller, stop_poller
+
+    t0 = time.monotonic()
+    start_poller()
+    try:
+        outcome = run_batch(project_ids, heavy, light, float(idle), "--loop" in argv)
+    finally:
+        stop_poller()
+
+    from dispatcher.pipeline_v1 import current_phase
+
+    print(f"[BATCH] done in {time.monotonic() - t0:.1f}s")
+    for pid in project_ids:
+        print(f"[BATCH]   {pid:<24} {outcome.get(pid, DONE):<8} phase={current_phase(pid)}")
+    return 1 if any(v in (FAILED, BLOCKED) for v in outcome.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -4,9 +4,17 @@
 FlowMind Cashflow — Autopilot Loop v1
 
 Runs Autopilot Tick every N seconds.
+Starts the shared Telegram poller (engine.telegram_poller_v1), so each tick
+reads approvals from a local queue instead of doing its own getUpdates.
+
+With --watch the fixed interval becomes the idle ceiling: ticks run on
+PROJECT_STATE.json changes and Telegram events (engine.state_watch_v1).
+
+Holds the project lock (engine.lock_manager_v1) for the whole loop.
 
 Usage:
   python tools/autopilot_loop.py FM_TEST 10
+  python tools/autopilot_loop.py FM_TEST 30 --watch
 """
 
 from __future__ import annotations
@@ -22,19 +30,41 @@ if str(REPO_ROOT) not in sys.path:
 
 
 def main(argv: list[str]) -> int:
+    watch = "--watch" in argv
+    argv = [a for a in argv if a != "--watch"]
     if len(argv) not in (2, 3):
-        print("Usage: python tools/autopilot_loop.py <PROJECT_ID> [interval_sec]", file=sys.stderr)
+        print("Usage: python tools/autopilot_loop.py <PROJECT_ID> [interval_sec] [--watch]", file=sys.stderr)
         return 2
 
     project_id = argv[1]
     interval = int(argv[2]) if len(argv) == 3 else 10
 
+    from engine import lock_manager_v1
+    from engine.telegram_poller_v1 import start_poller, stop_poller
     from tools.autopilot_tick import main as tick_main  # type: ignore
 
+    lock = lock_manager_v1.acquire(project_id, "autopilot_loop")
+    if lock is None:
+        print(f"[AUTOPILOT] {project_id} busy: {lock_manager_v1.describe(lock_manager_v1.holder(project_id))}",
+              file=sys.stderr)
+        return lock_manager_v1.LOCKED_RC
+
     print(f"[AUTOPILOT] loop start project={project_id} interval={interval}s (Ctrl+C to stop)")
-    while True:
-        tick_main(["tools.autopilot_tick", project_id])
-        time.sleep(interval)
+    start_poller()
+    try:
+        if watch:
+            from engine.state_watch_v1 import watch_loop
+            def tick() -> None:
+                tick_main(["tools.autopilot_tick", project_id])
+
+            watch_loop(project_id, tick, max_idle=float(interval))
+            return 0
+        while True:
+            tick_main(["tools.autopilot_tick", project_id])
+            time.sleep(interval)
+    finally:
+        stop_poller()
+        lock.release()
 
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@
 """
 FlowMind Cashflow — Autopilot Tick v3 (STRICT FULL PIPE)
 
-1) Telegram Listener
+1) Telegram Listener (queue read when a shared poller runs in-process)
 2) Approval Bridge
 3) Finalize Bridge
 
@@ -34,8 +34,8 @@ def main(argv):
 
     # LISTENER
     try:
-        import engine.telegram_listener_v1 as listener
-        listener.main()
+        from engine.telegram_poller_v1 import listen_once
+        listen_once(project_id)
     except Exception as e:
         print("[AUTOPILOT] listener error:", e)
 
@@ -58,4 +58,6 @@ def main(argv):
 
 
 if __name__ == "__main__":
-    sys.exit(main(sys.argv))
+    # standalone run: take the project lock (fm.py / autopilot_loop already hold it)
+    from engine import lock_manager_v1
+    sys.exit(lock_manager_v1.run_locked("autopilot_tick", main, sys.argv))
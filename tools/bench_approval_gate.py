@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Approval Gate Benchmark (offline, fake Bot API)
+
+Measures, for N simulated projects sitting in AWAITING_APPROVAL:
+1) gate send latency   telegram_gate_v1 sendMessage round trip per project
+2) APPROVE -> READY_FOR_UPLOAD latency
+   from the moment "APPROVE <PROJECT_ID>" becomes visible in getUpdates
+   to the tick that observes PROJECT_STATE.phase == READY_FOR_UPLOAD
+
+Tick = listener step + approval bridge per project (autopilot_tick order).
+Listener modes:
+  poller    shared long-poll thread + per-project queues (engine.telegram_poller_v1)
+  listener  one plain telegram_listener_v1.main() getUpdates per tick
+
+Runs in a throw-away workdir (projects/, telegram_listener_state.json) against
+tools/fake_telegram_api.py; nothing touches api.telegram.org or the real tree.
+
+Usage:
+  python tools/bench_approval_gate.py [--projects 300] [--mode poller|listener]
+      [--rate 0 (approvals/sec, 0 = burst)] [--latency-ms 0] [--timeout 120] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+THIS_FILE = Path(__file__).resolve()
+REPO_ROOT = THIS_FILE.parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools.fake_telegram_api import FakeBotAPI  # noqa: E402
+
+
+def _opt(argv: List[str], name: str, default: str) -> str:
+    if name in argv:
+        i = argv.index(name)
+        if i + 1 < len(argv):
+            return argv[i + 1]
+    return default
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _summary(values: List[float]) -> Dict[str, Any]:
+    ms = [v * 1000.0 for v in values]
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 2) if ms else None,
+        "p50_ms": round(_pct(ms, 0.50), 2),
+        "p95_ms": round(_pct(ms, 0.95), 2),
+        "p99_ms": round(_pct(ms, 0.99), 2),
+        "max_ms": round(max(ms), 2) if ms else None,
+    }
+
+
+def _make_projects(n: int) -> List[str]:
+    ids = [f"FM_BENCH_{i:04d}" for i in range(n)]
+    for pid in ids:
+        pdir = Path("projects") / pid
+        pdir.mkdir(parents=True, exist_ok=True)
+        (pdir / "PROJECT_STATE.json").write_text(json.dumps({
+            "project_id": pid,
+            "phase": "AWAITING_APPROVAL",
+            "approval_gate": "DELIVERY_PACK",
+        }, indent=2))
+    return ids
+
+
+def _phase(pid: str) -> str:
+    try:
+        return json.loads((Path("projects") / pid / "PROJECT_STATE.json").read_text()).get("phase") or ""
+    except Exception:
+        return ""
+
+
+def run_bench(n: int, mode: str, rate: float, latency_ms: float, timeout: float) -> Dict[str, Any]:
+    from dispatcher.approval_bridge_v1 import run as approval_run
+    from engine import telegram_gate_v1, telegram_listener_v1, telegram_poller_v1
+
+    api = FakeBotAPI(latency_ms=latency_ms).start()
+    os.environ["TELEGRAM_API_BASE"] = api.base_url
+    os.environ["TELEGRAM_BOT_TOKEN"] = "bench"
+    os.environ["TELEGRAM_CHAT_ID"] = "1"
+    os.environ.setdefault("FLOWMIND_TG_POLL_TIMEOUT", "5")
+
+    ids = _make_projects(n)
+    quiet = io.StringIO()
+
+    # 1) gate sends
+    send_lat: List[float] = []
+    for pid in ids:
+        msg = telegram_gate_v1.build_message(pid, {"summary": {"duration_sec": 60.0, "render_tier": "full"}})
+        t0 = time.monotonic()
+        ok, info = telegram_gate_v1._send_telegram(msg)
+        send_lat.append(time.monotonic() - t0)
+        if not ok:
+            raise RuntimeError(f"gate send failed for {pid}: {info}")
+
+    # 2) approvals
+    update_of: Dict[str, int] = {}
+
+    def inject() -> None:
+        for pid in ids:
+            update_of[pid] = api.inject_message(f"APPROVE {pid}")
+            if rate > 0:
+                time.sleep(1.0 / rate)
+
+    if mode == "poller":
+        with contextlib.redirect_stdout(quiet):
+            telegram_poller_v1.start_poller()
+
+    injector = threading.Thread(target=inject, name="bench-inject", daemon=True)
+    t_start = time.monotonic()
+    injector.start()
+
+    ready_at: Dict[str, float] = {}
+    ticks = 0
+    deadline = t_start + timeout
+    with contextlib.redirect_stdout(quiet):
+        while len(ready_at) < n and time.monotonic() < deadline:
+            ticks += 1
+            if mode == "listener":
+                telegram_listener_v1.main()
+            for pid in ids:
+                if pid in ready_at:
+                    continue
+                if mode == "poller":
+                    telegram_poller_v1.listen_once(pid)
+                approval_run(pid)
+                if _phase(pid) == "READY_FOR_UPLOAD":
+                    ready_at[pid] = time.monotonic()
+            if mode == "poller" and len(ready_at) < n and not injector.is_alive():
+                time.sleep(0.005)  # queue fed by the poller thread; avoid a hot spin
+        wall = time.monotonic() - t_start
+        if mode == "poller":
+            telegram_poller_v1.stop_poller(apply_pending=False)
+    injector.join(timeout=1.0)
+
+    e2e = [ready_at[pid] - api.injected_at[update_of[pid]] for pid in ready_at if pid in update_of]
+    stats = api.stats()
+    api.stop()
+    return {
+        "projects": n,
+        "mode": mode,
+        "rate_per_sec": rate,
+        "api_latency_ms": latency_ms,
+        "completed": len(ready_at),
+        "timed_out": n - len(ready_at),
+        "wall_sec": round(wall, 3),
+        "ticks": ticks,
+        "throughput_per_sec": round(len(ready_at) / wall, 2) if wall > 0 else None,
+        "gate_send": _summary(send_lat),
+        "approve_to_ready": _summary(e2e),
+        "api_calls": stats["calls"],
+    }
+
+
+def main(argv: List[str]) -> int:
+    mode = _opt(argv, "--mode", "poller")
+    if mode not in ("poller", "listener"):
+        print("[BENCH] --mode must be poller or listener", file=sys.stderr)
+        return 2
+    n = int(_opt(argv, "--projects", "300"))
+    rate = float(_opt(argv, "--rate", "0"))
+    latency_ms = float(_opt(argv, "--latency-ms", "0"))
+    timeout = float(_opt(argv, "--timeout", "120"))
+    json_out = _opt(argv, "--json", "")
+    if json_out:
+        json_out = str(Path(json_out).resolve())
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="fm_bench_gate_") as work:
+        os.chdir(work)
+        try:
+            report = run_bench(n, mode, rate, latency_ms, timeout)
+        finally:
+            os.chdir(cwd)
+
+    g, e = report["gate_send"], report["approve_to_ready"]
+    print(f"[BENCH] projects={n} mode={mode} rate={rate or 'burst'} api_latency={latency_ms}ms")
+    print(f"[BENCH] gate sendMessage      p50={g['p50_ms']}ms p95={g['p95_ms']}ms p99={g['p99_ms']}ms max={g['max_ms']}ms")
+    print(f"[BENCH] APPROVE->READY        p50={e['p50_ms']}ms p95={e['p95_ms']}ms p99={e['p99_ms']}ms max={e['max_ms']}ms")
+    print(f"[BENCH] completed={report['completed']}/{n} wall={report['wall_sec']}s ticks={report['ticks']} "
+          f"throughput={report['throughput_per_sec']}/s api_calls={report['api_calls']}")
+    if json_out:
+        Path(json_out).write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"[BENCH] report={json_out}")
+    return 0 if report["timed_out"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
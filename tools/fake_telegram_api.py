@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FlowMind Cashflow — Fake Telegram Bot API (offline stand-in for load / latency tests)
+
+Serves the Bot API subset the approval path uses, for any token:
+  getUpdates            long-poll (timeout, offset), like the real API
+  sendMessage           recorded; --auto-approve replies "APPROVE <PROJECT_ID>"
+                        to every DELIVERY_PACK gate message after --approve-delay
+  sendPhoto / sendVideo / sendMediaGroup / answerCallbackQuery   recorded, ok
+
+Control endpoints (scripting traffic):
+  POST /_fake/message   {"text": "APPROVE FM_X"}                     -> queued message update
+  POST /_fake/callback  {"data": "FINAL::APPROVE::FM_X", "message_id": 12}
+  GET  /_fake/stats     counters per method + queued / delivered updates
+  GET  /_fake/sent      every recorded send
+
+Point the pipeline at it:
+  python tools/fake_telegram_api.py --port 8081 --auto-approve
+  TELEGRAM_API_BASE=http://127.0.0.1:8081 TELEGRAM_BOT_TOKEN=fake TELEGRAM_CHAT_ID=1 ./tools/fm batch --loop
+
+Usage:
+  python tools/fake_telegram_api.py [--port 8081] [--latency-ms 0] [--auto-approve] [--approve-delay 0.5]
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+GATE_RE = re.compile(r"APPROVE\s+([A-Z0-9_\-]+)")
+
+
+class FakeBotAPI:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 auto_approve: bool = False, approve_delay: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        self.auto_approve = auto_approve
+        self.approve_delay = approve_delay
+        self._cond = threading.Condition()
+        self._updates: List[Dict[str, Any]] = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self.sent: List[Dict[str, Any]] = []
+        self.calls: Counter = Counter()
+        self.delivered = 0
+        self.injected_at: Dict[int, float] = {}   # update_id -> monotonic time it became visible
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # -----------------------
+    # lifecycle
+    # -----------------------
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBotAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-tg-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        with self._cond:
+            self._cond.notify_all()
+
+    # -----------------------
+    # scripted traffic
+    # -----------------------
+    def inject_message(self, text: str) -> int:
+        return self._push({"message": {"message_id": self._message_id(), "date": int(time.time()),
+                                       "chat": {"id": 1}, "text": text}})
+
+    def inject_callback(self, data: str, message_id: int) -> int:
+        return self._push({"callback_query": {"id": str(self._message_id()), "data": data,
+                                              "message": {"message_id": message_id, "chat": {"id": 1}}}})
+
+    def _message_id(self) -> int:
+        with self._cond:
+            mid = self._next_message_id
+            self._next_message_id += 1
+            return mid
+
+    def _push(self, body: Dict[str, Any]) -> int:
+        with self._cond:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            self._updates.append({"update_id": update_id, **body})
+            self.injected_at[update_id] = time.monotonic()
+            self._cond.notify_all()
+            return update_id
+
+    def _schedule_approve(self, project_id: str) -> None:
+        timer = threading.Timer(self.approve_delay, self.inject_message, args=(f"APPROVE {project_id}",))
+        timer.daemon = True
+        timer.start()
+
+    # -----------------------
+    # Bot API
+    # -----------------------
+    def get_updates(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        timeout = float(params.get("timeout") or 0)
+        limit = int(params.get("limit") or 100)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # offset confirms everything below it, like the real API
+            self._updates = [u for u in self._updates if u["update_id"] >= offset]
+            while not self._updates and time.monotonic() < deadline:
+                self._cond.wait(deadline - time.monotonic())
+            batch = self._updates[:limit]
+            self.delivered += len(batch)
+            return batch
+
+    def call(self, method: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        self.calls[method] += 1
+        if method == "getUpdates":
+            return 200, {"ok": True, "result": self.get_updates(params)}
+        if self.latency:
+            time.sleep(self.latency)
+        if method in ("sendMessage", "sendPhoto", "sendVideo"):
+            mid = self._message_id()
+            with self._cond:
+                self.sent.append({"method": method, "message_id": mid, "at": time.time(),
+                                  "text": params.get("text") or params.get("caption") or ""})
+            if self.auto_approve and method == "sendMessage":
+                m = GATE_RE.search(str(params.get("text") or ""))
+                if m:
+                    self._schedule_approve(m.group(1))
+            return 200, {"ok": True, "result": {"message_id": mid, "chat": {"id": 1}, "date": int(time.time())}}
+        if method == "sendMediaGroup":
+            media = json.loads(params.get("media") or "[]")
+            result = [{"message_id": self._message_id()} for _ in media]
+            with self._cond:
+                self.sent.append({"method": method, "message_ids": [r["message_id"] for r in result], "at": time.time()})
+            return 200, {"ok": True, "result": result}
+        if method == "answerCallbackQuery":
+            return 200, {"ok": True, "result": True}
+        return 404, {"ok": False, "error_code": 404, "description": f"Not Found: method {method}"}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"calls": dict(self.calls), "queued": len(self._updates), "delivered": self.delivered,
+                    "sent": len(self.sent), "next_update_id": self._next_update_id}
+
+    # -----------------------
+    # HTTP
+    # -----------------------
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, like the real endpoint
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _params(self) -> Dict[str, Any]:
+                parsed = urllib.parse.urlsplit(self.path)
+                params: Dict[str, Any] = dict(urllib.parse.parse_qsl(parsed.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                ctype = self.headers.get("Content-Type") or ""
+                if body and ctype.startswith("application/json"):
+                    params.update(json.loads(body.decode("utf-8")))
+                elif body and ctype.startswith("application/x-www-form-urlencoded"):
+                    params.update(urllib.parse.parse_qsl(body.decode("utf-8")))
+                elif body and ctype.startswith("multipart/form-data"):
+                    params.update(_multipart_fields(body, ctype))
+                return params
+
+            def _reply(self, code: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload, separators=(",", ":")).encode("utf-8")  # compact, like the real API
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _route(self) -> None:
+                path = urllib.parse.urlsplit(self.path).path
+                params = self._params()
+                if path == "/_fake/message":
+                    self._reply(200, {"ok": True, "update_id": api.inject_message(str(params.get("text") or ""))})
+                elif path == "/_fake/callback":
+                    uid = api.inject_callback(str(params.get("data") or ""), int(params.get("message_id") or 0))
+                    self._reply(200, {"ok": True, "update_id": uid})
+                elif path == "/_fake/stats":
+                    self._reply(200, api.stats())
+                elif path == "/_fake/sent":
+                    with api._cond:
+                        self._reply(200, {"sent": list(api.sent)})
+                elif path.startswith("/bot") and path.count("/") == 2:
+                    self._reply(*api.call(path.rsplit("/", 1)[1], params))
+                else:
+                    self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+
+            do_GET = _route
+            do_POST = _route
+
+        return Handler
+
+
+def _multipart_fields(body: bytes, ctype: str) -> Dict[str, str]:
+    """Text fields of a multipart body (uploaded files are only counted, not kept)."""
+    m = re.search(r'boundary="?([^";]+)"?', ctype)
+    if not m:
+        return {}
+    fields: Dict[str, str] = {}
+    for part in body.split(b"--" + m.group(1).encode("latin-1")):
+        head, _, value = part.partition(b"\r\n\r\n")
+        name = re.search(rb'name="([^"]+)"', head)
+        if name and b"filename=" not in head:
+            fields[name.group(1).decode("utf-8")] = value.rstrip(b"\r\n").decode("utf-8", errors="replace")
+    return fields
+
+
+def main(argv: List[str]) -> int:
+    def opt(name: str, default: str) -> str:
+        if name in argv:
+            i = argv.index(name)
+            if i + 1 < len(argv):
+                return argv[i + 1]
+        return default
+
+    api = FakeBotAPI(
+        port=int(opt("--port", "8081")),
+        latency_ms=float(opt("--latency-ms", "0")),
+        auto_approve="--auto-approve" in argv,
+        approve_delay=float(opt("--approve-delay", "0.5")),
+    ).start()
+    print(f"[FAKE_TG] serving Bot API on {api.base_url} (TELEGRAM_API_BASE={api.base_url})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -8,11 +8,18 @@ Supports:
 """
 
 from __future__ import annotations
-import json
 import os
 import sys
 from datetime import datetime, timezone
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+THIS_FILE = Path(__file__).resolve()
+REPO_ROOT = THIS_FILE.parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from engine import state_store_v1  # noqa: E402
 
 STATE_FILE = "PROJECT_STATE.json"
 AUDIT_FILE = "phase_history.log"
@@ -33,16 +40,13 @@ def _audit_path(project_id: str) -> str:
 def _read_state(path: str) -> Dict[str, Any]:
     if not os.path.isfile(path):
         raise RuntimeError("PROJECT_STATE.json not found.")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return state_store_v1.read_json(path)
 
 
-def _write_state(path: str, state: Dict[str, Any]) -> None:
-    os.chmod(path, 0o644)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
-        f.write("\n")
+def _update_state(path: str, fn: Callable[[Dict[str, Any]], Any]) -> Dict[str, Any]:
+    state = state_store_v1.update_json(path, fn)
     os.chmod(path, 0o444)
+    return state
 
 
 def _write_audit(project_id: str, message: str) -> None:
@@ -77,13 +81,14 @@ def cmd_unlock(project_id: str) -> None:
 
     print("[UNLOCK] Clearing hard_stop and halt counters...")
 
-    state.pop("hard_stop", None)
-    state.pop("halted", None)
-    state.pop("halt_phase", None)
-    state.pop("resume_from", None)
-    state["halt_count"] = 0
+    def apply(state: Dict[str, Any]) -> None:
+        state.pop("hard_stop", None)
+        state.pop("halted", None)
+        state.pop("halt_phase", None)
+        state.pop("resume_from", None)
+        state["halt_count"] = 0
 
-    _write_state(path, state)
+    _update_state(path, apply)
     _write_audit(project_id, "MANUAL_UNLOCK")
 
     print("[UNLOCK] System unlocked.")
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
-import json
 import sys
 from pathlib import Path
 
+THIS_FILE = Path(__file__).resolve()
+REPO_ROOT = THIS_FILE.parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from engine import state_store_v1  # noqa: E402
+
 if len(sys.argv) != 3:
     print("Usage: python3 tools/set_project_mode.py <PROJECT_ID> <MODE>")
     sys.exit(1)
@@ -20,15 +26,11 @@ if not state_path.exists():
     print("PROJECT_STATE.json not found.")
     sys.exit(1)
 
-with open(state_path, "r") as f:
-    data = json.load(f)
+data = state_store_v1.read_json(state_path)
 
 if "mode" in data:
     print(f"[INFO] Previous mode: {data['mode']}")
 
-data["mode"] = mode
-
-with open(state_path, "w") as f:
-    json.dump(data, f, indent=2)
+state_store_v1.update_json(state_path, lambda state: state.update(mode=mode))
 
 print(f"[OK] Mode set to {mode} for {project_id}")
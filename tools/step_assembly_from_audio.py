@@ -3,18 +3,17 @@
 """
 FlowMind Cashflow — Step Runner: ASSEMBLY_FROM_AUDIO
 Runs engine.assembly_from_audio_v1 and updates PROJECT_STATE phase.
+--fused runs engine.motion_assembly_v1 instead (motion background + audio mux
+in one ffmpeg pass, no motion_bg.mp4 needed); same marker, same phase.
 
 Usage:
-  python tools/step_assembly_from_audio.py FM_TEST
+  python tools/step_assembly_from_audio.py FM_TEST [--fused]
 """
 
 from __future__ import annotations
 
 import json
-import os
 import sys
-import tempfile
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
@@ -24,34 +23,16 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
 def _read_json(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
-    try:
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write("\n")
-        os.replace(tmp_path, path)
-    finally:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
-
-
 def main(argv: list[str]) -> int:
+    fused = "--fused" in argv
+    argv = [a for a in argv if a != "--fused"]
     if len(argv) < 2:
-        print("Usage: python tools/step_assembly_from_audio.py <PROJECT_ID>", file=sys.stderr)
+        print("Usage: python tools/step_assembly_from_audio.py <PROJECT_ID> [--fused]", file=sys.stderr)
         return 2
 
     project_id = argv[1]
@@ -67,8 +48,12 @@ def main(argv: list[str]) -> int:
         return 4
 
     try:
-        from engine.assembly_from_audio_v1 import main as asm_main  # type: ignore
-        rc = int(asm_main(["engine.assembly_from_audio_v1", project_id]))
+        if fused:
+            from engine.motion_assembly_v1 import main as asm_main  # type: ignore
+            rc = int(asm_main(["engine.motion_assembly_v1", project_id]))
+        else:
+            from engine.assembly_from_audio_v1 import main as asm_main  # type: ignore
+            rc = int(asm_main(["engine.assembly_from_audio_v1", project_id]))
     except Exception as e:
         print(f"[FAIL] assembly_from_audio crashed: {e}", file=sys.stderr)
         return 5
@@ -88,27 +73,14 @@ def main(argv: list[str]) -> int:
         print(f"[FAIL] final.mp4 not found: {final_mp4}", file=sys.stderr)
         return 7
 
+    from engine import state_store_v1  # type: ignore
+
+    def apply(state: Dict[str, Any]) -> None:
+        state["project_id"] = project_id
+        state_store_v1.transition(state, "ASSEMBLY_FROM_AUDIO")
+
+    state_store_v1.update(project_id, apply, create=True)
     state_path = project_dir / "PROJECT_STATE.json"
-    state: Dict[str, Any] = {"project_id": project_id}
-    if state_path.exists():
-        try:
-            state = _read_json(state_path)
-        except Exception:
-            state = {"project_id": project_id}
-
-    state["project_id"] = project_id
-    state["phase"] = "ASSEMBLY_FROM_AUDIO"
-    state["updated_at"] = _utc_now_iso()
-
-    hist = state.get("phase_history")
-    if not isinstance(hist, list):
-        hist = []
-    hist.append({"at": state["updated_at"], "phase": "ASSEMBLY_FROM_AUDIO"})
-    if len(hist) > 50:
-        hist = hist[-50:]
-    state["phase_history"] = hist
-
-    _atomic_write_json(state_path, state)
 
     print(f"[PASS] ASSEMBLY_FROM_AUDIO final_mp4={final_mp4}")
     print(f"[STATE] phase set to ASSEMBLY_FROM_AUDIO in: {state_path}")
@@ -116,4 +88,6 @@ def main(argv: list[str]) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv))
+    # standalone run: take the project lock (in-pipeline calls already hold it)
+    from engine import lock_manager_v1
+    raise SystemExit(lock_manager_v1.run_locked("step_assembly_from_audio", main, sys.argv))
@@ -11,11 +11,7 @@ Usage:
 
 from __future__ import annotations
 
-import json
-import os
 import sys
-import tempfile
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
@@ -27,31 +23,6 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
-def _read_json(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
-    try:
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write("\n")
-        os.replace(tmp_path, path)
-    finally:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
-
-
 def _resolve_project_dir(arg: str) -> Path:
     p = Path(arg).expanduser()
     if p.is_dir() and (p / "ASSEMBLY_PLAN.json").exists():
@@ -69,21 +40,6 @@ def _find_state_file(project_dir: Path) -> Path:
     return a  # create canonical if none exists
 
 
-def _update_state_phase(state: Dict[str, Any], phase: str) -> Dict[str, Any]:
-    state = dict(state) if isinstance(state, dict) else {}
-    state["phase"] = phase
-    state["updated_at"] = _utc_now_iso()
-
-    hist = state.get("phase_history")
-    if not isinstance(hist, list):
-        hist = []
-    hist.append({"at": state["updated_at"], "phase": phase})
-    if len(hist) > 50:
-        hist = hist[-50:]
-    state["phase_history"] = hist
-    return state
-
-
 def _preflight(project_dir: Path) -> Tuple[Path, Path]:
     assembly = project_dir / "ASSEMBLY_PLAN.json"
     script = project_dir / "SCRIPT.json"
@@ -134,17 +90,14 @@ def main(argv: list[str]) -> int:
         print(f"[FAIL] AUDIO_PLAN.json not found after run: {out_path}", file=sys.stderr)
         return 5
 
-    state_path = _find_state_file(project_dir)
-    state: Dict[str, Any] = {}
-    if state_path.exists():
-        try:
-            state = _read_json(state_path)
-        except Exception:
-            state = {"project_id": project_id}
+    from engine import state_store_v1  # type: ignore
+
+    def apply(state: Dict[str, Any]) -> None:
+        state["project_id"] = project_id
+        state_store_v1.transition(state, "AUDIO_PLAN")
 
-    state["project_id"] = project_id
-    state = _update_state_phase(state, "AUDIO_PLAN")
-    _atomic_write_json(state_path, state)
+    state_path = _find_state_file(project_dir)
+    state_store_v1.update_json(state_path, apply, default={"project_id": project_id})
 
     print(f"[PASS] AUDIO_PLAN ready: {out_path}")
     print(f"[STATE] phase set to AUDIO_PLAN in: {state_path}")
@@ -152,4 +105,6 @@ def main(argv: list[str]) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv))
+    # standalone run: take the project lock (in-pipeline calls already hold it)
+    from engine import lock_manager_v1
+    raise SystemExit(lock_manager_v1.run_locked("step_audio_plan", main, sys.argv))
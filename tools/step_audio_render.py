@@ -11,10 +11,7 @@ Usage:
 from __future__ import annotations
 
 import json
-import os
 import sys
-import tempfile
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
@@ -25,31 +22,11 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
 def _read_json(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
-    try:
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write("\n")
-        os.replace(tmp_path, path)
-    finally:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
-
-
 def main(argv: list[str]) -> int:
     if len(argv) < 2:
         print("Usage: python tools/step_audio_render.py <PROJECT_ID>", file=sys.stderr)
@@ -92,27 +69,14 @@ def main(argv: list[str]) -> int:
         return 7
 
     # update state
+    from engine import state_store_v1  # type: ignore
+
+    def apply(state: Dict[str, Any]) -> None:
+        state["project_id"] = project_id
+        state_store_v1.transition(state, "AUDIO_RENDER")
+
+    state_store_v1.update(project_id, apply, create=True)
     state_path = project_dir / "PROJECT_STATE.json"
-    state: Dict[str, Any] = {"project_id": project_id}
-    if state_path.exists():
-        try:
-            state = _read_json(state_path)
-        except Exception:
-            state = {"project_id": project_id}
-
-    state["project_id"] = project_id
-    state["phase"] = "AUDIO_RENDER"
-    state["updated_at"] = _utc_now_iso()
-
-    hist = state.get("phase_history")
-    if not isinstance(hist, list):
-        hist = []
-    hist.append({"at": state["updated_at"], "phase": "AUDIO_RENDER"})
-    if len(hist) > 50:
-        hist = hist[-50:]
-    state["phase_history"] = hist
-
-    _atomic_write_json(state_path, state)
 
     print(f"[PASS] AUDIO_RENDER master_wav={master_wav}")
     print(f"[STATE] phase set to AUDIO_RENDER in: {state_path}")
@@ -120,4 +84,6 @@ def main(argv: list[str]) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv))
+    # standalone run: take the project lock (in-pipeline calls already hold it)
+    from engine import lock_manager_v1
+    raise SystemExit(lock_manager_v1.run_locked("step_audio_render", main, sys.argv))
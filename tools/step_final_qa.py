@@ -11,10 +11,7 @@ Usage:
 from __future__ import annotations
 
 import json
-import os
 import sys
-import tempfile
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
@@ -24,31 +21,11 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
 def _read_json(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
-    try:
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write("\n")
-        os.replace(tmp_path, path)
-    finally:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
-
-
 def main(argv: list[str]) -> int:
     if len(argv) < 2:
         print("Usage: python tools/step_final_qa.py <PROJECT_ID>", file=sys.stderr)
@@ -61,12 +38,6 @@ def main(argv: list[str]) -> int:
         return 3
 
     state_path = project_dir / "PROJECT_STATE.json"
-    state: Dict[str, Any] = {"project_id": project_id}
-    if state_path.exists():
-        try:
-            state = _read_json(state_path)
-        except Exception:
-            state = {"project_id": project_id}
 
     try:
         from engine.final_qa_v1 import main as qa_main  # type: ignore
@@ -85,33 +56,28 @@ def main(argv: list[str]) -> int:
         except Exception:
             passed = False
 
-    now = _utc_now_iso()
-    state["project_id"] = project_id
-    state["updated_at"] = now
+    from engine import state_store_v1  # type: ignore
+
+    def apply(state: Dict[str, Any]) -> None:
+        state["project_id"] = project_id
+        state["qa_passed"] = rc == 0 and passed
+        if state["qa_passed"]:
+            state_store_v1.transition(state, "FINAL_QA")
+        else:
+            state_store_v1.halt(state, "FINAL_QA_FAILED")
 
-    hist = state.get("phase_history")
-    if not isinstance(hist, list):
-        hist = []
+    state_store_v1.update(project_id, apply, create=True)
 
     if rc == 0 and passed:
-        state["phase"] = "FINAL_QA"
-        state["qa_passed"] = True
-        hist.append({"at": now, "phase": "FINAL_QA"})
-        _atomic_write_json(state_path, state)
         print(f"[PASS] FINAL_QA phase set in: {state_path}")
         return 0
 
     # FAIL -> HALT with reason
-    state["phase"] = "HALT"
-    state["halted"] = True
-    state["halt_reason"] = "FINAL_QA_FAILED"
-    state["qa_passed"] = False
-    hist.append({"at": now, "phase": "HALT", "reason": "FINAL_QA_FAILED"})
-    state["phase_history"] = hist
-    _atomic_write_json(state_path, state)
     print(f"[FAIL] FINAL_QA -> HALT. See: {report_path}")
     return 10
 
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv))
+    # standalone run: take the project lock (in-pipeline calls already hold it)
+    from engine import lock_manager_v1
+    raise SystemExit(lock_manager_v1.run_locked("step_final_qa", main, sys.argv))
@@ -9,11 +9,8 @@ Loads .env then runs engine.telegram_gate_v1 and updates PROJECT_STATE:
 
 from __future__ import annotations
 
-import json
 import os
 import sys
-import tempfile
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
@@ -33,31 +30,6 @@ def _try_load_dotenv() -> None:
         pass
 
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
-def _read_json(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
-    try:
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write("\n")
-        os.replace(tmp_path, path)
-    finally:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
-
-
 def main(argv: list[str]) -> int:
     if len(argv) < 2:
         print("Usage: python tools/step_telegram_gate.py <PROJECT_ID>", file=sys.stderr)
@@ -71,13 +43,10 @@ def main(argv: list[str]) -> int:
         print(f"[FAIL] missing project dir: {project_dir}", file=sys.stderr)
         return 3
 
+    from engine import state_store_v1  # type: ignore
+
     state_path = project_dir / "PROJECT_STATE.json"
-    state: Dict[str, Any] = {"project_id": project_id}
-    if state_path.exists():
-        try:
-            state = _read_json(state_path)
-        except Exception:
-            state = {"project_id": project_id}
+    state: Dict[str, Any] = state_store_v1.load(project_id) or {"project_id": project_id}
 
     # allow retry from HALT if reason is TELEGRAM_SEND_FAILED and previous phase was DELIVERY_PACK
     phase = state.get("phase")
@@ -100,40 +69,25 @@ def main(argv: list[str]) -> int:
         print(f"[FAIL] TELEGRAM_GATE crashed: {e}", file=sys.stderr)
         rc = 99
 
-    now = _utc_now_iso()
-    hist = state.get("phase_history")
-    if not isinstance(hist, list):
-        hist = []
-
     if rc == 0:
-        state["phase"] = "AWAITING_APPROVAL"
-        state["approval_gate"] = "DELIVERY_PACK"
-        state["approval_status"] = "PENDING"
-        state["updated_at"] = now
-        # clear halt flags
-        state.pop("halted", None)
-        state.pop("halt_reason", None)
-        hist.append({"at": now, "phase": "AWAITING_APPROVAL", "gate": "DELIVERY_PACK"})
-        if len(hist) > 50:
-            hist = hist[-50:]
-        state["phase_history"] = hist
-        _atomic_write_json(state_path, state)
+        def apply(state: Dict[str, Any]) -> None:
+            state["approval_gate"] = "DELIVERY_PACK"
+            state["approval_status"] = "PENDING"
+            # clear halt flags
+            state_store_v1.clear_halt(state)
+            state_store_v1.transition(state, "AWAITING_APPROVAL", gate="DELIVERY_PACK")
+
+        state_store_v1.update(project_id, apply, create=True)
         print(f"[PASS] TELEGRAM_GATE sent. phase=AWAITING_APPROVAL in: {state_path}")
         return 0
 
     # FAIL -> HALT
-    state["phase"] = "HALT"
-    state["halted"] = True
-    state["halt_reason"] = "TELEGRAM_SEND_FAILED"
-    state["updated_at"] = now
-    hist.append({"at": now, "phase": "HALT", "reason": "TELEGRAM_SEND_FAILED"})
-    if len(hist) > 50:
-        hist = hist[-50:]
-    state["phase_history"] = hist
-    _atomic_write_json(state_path, state)
+    state_store_v1.update(project_id, lambda state: state_store_v1.halt(state, "TELEGRAM_SEND_FAILED"), create=True)
     print("[FAIL] TELEGRAM_GATE failed -> HALT (TELEGRAM_SEND_FAILED)", file=sys.stderr)
     return 10
 
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv))
+    # standalone run: take the project lock (in-pipeline calls already hold it)
+    from engine import lock_manager_v1
+    raise SystemExit(lock_manager_v1.run_locked("step_telegram_gate", main, sys.argv))